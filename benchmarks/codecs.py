@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+"""
+Comparaison des sérialiseurs de TaskManager (sauvegarde et chargement)
+
+Usage : python3 -m benchmarks.codecs [nombre_de_tâches]
+"""
+import os
+import sys
+import tempfile
+import time
+from src.task_manager.codec import get_codec, orjson
+from src.task_manager.manager import TaskManager
+from src.task_manager.task import Priority
+
+def make_manager(count):
+    manager = TaskManager()
+    priorities = list(Priority)
+    manager.add_tasks({"title": f"Tâche {i}", "description": "Description", "priority": priorities[i % 4]}
+                      for i in range(count))
+    for i, task in enumerate(manager.tasks):
+        if i % 3 == 0:
+            task.mark_completed()
+    return manager
+
+def measure(codec, tasks, path):
+    start = time.perf_counter()
+    codec.dump(tasks, path)
+    saved = time.perf_counter() - start
+    start = time.perf_counter()
+    codec.load(path)
+    loaded = time.perf_counter() - start
+    return saved, loaded, os.path.getsize(path)
+
+def main(count=100_000):
+    tasks = make_manager(count).tasks
+    names = ["readable", "json"] + (["orjson"] if orjson is not None else [])
+    results = {}
+    print(f"Tâches : {count}")
+    print(f"{'codec':<10}{'save (s)':>10}{'load (s)':>10}{'taille (Mo)':>13}")
+    with tempfile.TemporaryDirectory() as directory:
+        for name in names:
+            saved, loaded, size = measure(get_codec(name), tasks, os.path.join(directory, f"{name}.json"))
+            results[name] = {"save": saved, "load": loaded, "size": size}
+            print(f"{name:<10}{saved:>10.3f}{loaded:>10.3f}{size / 1e6:>13.1f}")
+    return results
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+"""
+Mesure de l'empreinte mémoire par tâche (ancienne représentation vs Task slottée)
+
+Usage : python3 -m benchmarks.memory [nombre_de_tâches]
+"""
+import sys
+import tracemalloc
+import uuid
+from datetime import datetime
+from src.task_manager.task import Task, Priority, Status
+
+class LegacyTask:
+    """Représentation d'origine : instance avec __dict__ et id uuid4 en chaîne"""
+
+    def __init__(self, title, description="", priority=Priority.MEDIUM):
+        self.id = str(uuid.uuid4())
+        self.title = title
+        self.description = description
+        self.priority = priority
+        self.created_at = datetime.now()
+        self.status = Status.TODO
+        self.project_id = None
+        self.completed_at = None
+
+def bytes_per_task(factory, count):
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    tasks = [factory("Tâche", "", Priority.MEDIUM) for _ in range(count)]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    # La liste elle-même (8 octets par élément) n'est pas imputée aux tâches
+    return (after - before - sys.getsizeof(tasks)) / count
+
+def main(count=100_000):
+    legacy = bytes_per_task(LegacyTask, count)
+    compact = bytes_per_task(Task, count)
+    print(f"Tâches mesurées : {count}")
+    print(f"Avant (dict + id str) : {legacy:8.1f} octets/tâche")
+    print(f"Après (slots + id int): {compact:8.1f} octets/tâche")
+    print(f"Gain                  : {100 * (1 - compact / legacy):8.1f} %")
+    return {"legacy": legacy, "compact": compact}
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Coût des snapshots copie sur écriture (TaskManager.snapshot)
+
+Pour chaque taille : durée d'un snapshot (le premier construit le vecteur
+persistant, les suivants sont en O(1)), comparée à la copie complète des
+TaskRecord faite auparavant par ConcurrentTaskManager.save_to_file ; puis
+mémoire ajoutée par k écritures pendant qu'un snapshot est gardé, qui ne
+dépend que de k.
+
+Usage : python3 -m benchmarks.snapshots [--sizes 10000,100000,1000000] [--writes 100,1000,10000]
+"""
+import argparse
+import random
+import tracemalloc
+from src.task_manager.manager import TaskManager
+from src.task_manager.task import Priority
+from benchmarks.suite import format_duration, generate_tasks, timed
+
+PRIORITIES = list(Priority)
+
+def snapshot_costs(count, seed=0):
+    manager = TaskManager("snapshots.json")
+    manager.tasks = generate_tasks(count, seed)
+
+    def first_snapshot():
+        # Reconstruction complète du vecteur persistant, comme au premier appel
+        manager._versions = None
+        manager.snapshot()
+
+    return {
+        "first_snapshot": timed(first_snapshot, repeat=1),
+        "snapshot": timed(lambda: [manager.snapshot() for _ in range(1_000)]) / 1_000,
+        "full_copy": timed(lambda: {key: task.snapshot() for key, task in manager._by_id.items()})
+    }, manager
+
+def write_overhead(manager, writes, seed=0):
+    """Octets alloués par k modifications de priorité pendant qu'un snapshot est gardé"""
+    rng = random.Random(seed)
+    tasks = rng.sample(manager.tasks, writes)
+    manager.snapshot()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    snapshot = manager.snapshot()
+    for task in tasks:
+        task.update_priority(rng.choice(PRIORITIES))
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del snapshot
+    return after - before
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Coût des snapshots copie sur écriture")
+    parser.add_argument("--sizes", default="10000,100000,1000000")
+    parser.add_argument("--writes", default="100,1000,10000")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+    sizes = [int(size) for size in args.sizes.split(",") if size]
+    writes = [int(count) for count in args.writes.split(",") if count]
+    results = {}
+    for count in sizes:
+        costs, manager = snapshot_costs(count, args.seed)
+        overhead = {k: write_overhead(manager, k, args.seed) for k in writes if k <= count}
+        results[count] = {"costs": costs, "overhead": overhead}
+        print(f"{count} tâches")
+        print(f"  premier snapshot      {format_duration(costs['first_snapshot']):>12}")
+        print(f"  snapshot              {format_duration(costs['snapshot']):>12}")
+        print(f"  copie complète        {format_duration(costs['full_copy']):>12}")
+        for k, size in overhead.items():
+            print(f"  {k:>7} écritures     {size / 1024:>9.1f} Kio ({size / k:.0f} octets/écriture)")
+    return results
+
+if __name__ == "__main__":
+    main()
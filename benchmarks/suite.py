@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+"""
+Suite de benchmarks des chemins critiques de TaskManager
+
+Mesure add_task, get_task, delete_task, les filtres, get_statistics,
+save_to_file/load_from_file, generate_daily_report et export_tasks_csv sur
+des jeux de tâches synthétiques (reproductibles : graine fixe) de tailles
+croissantes. Les résultats sont écrits en JSON ; --compare signale les
+régressions par rapport à un fichier de référence (code de sortie 1).
+
+Usage :
+    python3 -m benchmarks.suite [--sizes 1000,100000,1000000] [--output resultats.json]
+                                [--compare reference.json] [--threshold 0.25]
+"""
+import argparse
+import gc
+import json
+import os
+import platform
+import random
+import sys
+import tempfile
+import time
+import uuid
+from datetime import datetime, timedelta
+from src.task_manager.manager import TaskManager
+from src.task_manager.services import ReportService
+from src.task_manager.task import Task, Priority, Status
+
+DEFAULT_SIZES = (1_000, 100_000, 1_000_000)
+WORDS = ["rapport", "réunion", "client", "facture", "relire", "préparer", "envoyer", "budget",
+         "équipe", "tâche", "migration", "revue", "déploiement", "audit", "planning"]
+PRIORITIES = list(Priority)
+# Répartition réaliste : la majorité des tâches à faire ou terminées
+STATUSES = [Status.TODO] * 5 + [Status.IN_PROGRESS] * 2 + [Status.DONE] * 3 + [Status.CANCELLED]
+
+def generate_tasks(count, seed=0, projects=50, days=90):
+    """Tâches synthétiques déterministes : titres, priorités, statuts, projets et dates variés"""
+    rng = random.Random(seed)
+    start = datetime(2024, 1, 1)
+    project_ids = [f"projet-{i}" for i in range(projects)]
+    tasks = []
+    for _ in range(count):
+        created_at = start + timedelta(seconds=rng.randrange(days * 86400))
+        status = rng.choice(STATUSES)
+        completed_at = created_at + timedelta(seconds=rng.randrange(7 * 86400)) if status == Status.DONE else None
+        tasks.append(Task._restore(
+            uuid.UUID(int=rng.getrandbits(128), version=4).int,
+            " ".join(rng.choice(WORDS) for _ in range(3)),
+            " ".join(rng.choice(WORDS) for _ in range(8)),
+            rng.choice(PRIORITIES),
+            created_at,
+            status,
+            rng.choice(project_ids) if rng.random() < 0.8 else None,
+            completed_at
+        ))
+    return tasks
+
+def timed(func, repeat=3):
+    """Meilleur temps (secondes) sur repeat exécutions, ramasse-miettes désactivé"""
+    best = float("inf")
+    for _ in range(repeat):
+        gc.collect()
+        gc.disable()
+        try:
+            start = time.perf_counter()
+            func()
+            best = min(best, time.perf_counter() - start)
+        finally:
+            gc.enable()
+    return best
+
+def per_op(func, operations, repeat=3):
+    """Temps moyen par opération (secondes)"""
+    return timed(func, repeat) / operations
+
+def run_size(count, directory, seed=0):
+    """Résultats {benchmark: secondes} pour un jeu de count tâches"""
+    tasks = generate_tasks(count, seed)
+    manager = TaskManager(os.path.join(directory, f"tasks-{count}.json"))
+    manager.tasks = tasks
+    rng = random.Random(seed)
+    ids = [task.id for task in rng.sample(tasks, min(count, 10_000))]
+    results = {}
+
+    def add_tasks():
+        start = time.perf_counter()
+        added = [manager.add_task("Nouvelle tâche", "Desc", Priority.HIGH) for _ in range(1_000)]
+        elapsed = time.perf_counter() - start
+        for task_id in added:
+            manager.delete_task(task_id)
+        return elapsed
+
+    def delete_tasks():
+        victims = [manager.add_task("À supprimer") for _ in range(1_000)]
+        start = time.perf_counter()
+        for task_id in victims:
+            manager.delete_task(task_id)
+        return time.perf_counter() - start
+
+    # Chaque mesure remet le gestionnaire dans son état initial (hors chronométrage)
+    results["add_task"] = min(add_tasks() for _ in range(3)) / 1_000
+    results["get_task"] = per_op(lambda: [manager.get_task(task_id) for task_id in ids], len(ids))
+    results["delete_task"] = min(delete_tasks() for _ in range(3)) / 1_000
+    results["get_tasks_by_status"] = timed(lambda: manager.get_tasks_by_status(Status.TODO))
+    results["get_tasks_by_priority"] = timed(lambda: manager.get_tasks_by_priority(Priority.HIGH))
+    results["get_statistics"] = per_op(lambda: [manager.get_statistics() for _ in range(100)], 100)
+    results["save_to_file"] = timed(manager.save_to_file, repeat=1 if count >= 1_000_000 else 3)
+    results["load_from_file"] = timed(manager.load_from_file, repeat=1 if count >= 1_000_000 else 3)
+    fast = TaskManager(os.path.join(directory, f"tasks-{count}-fast.json"), codec="auto")
+    fast.tasks = manager.tasks
+    results["save_to_file_auto"] = timed(fast.save_to_file)
+    results["load_from_file_auto"] = timed(fast.load_from_file)
+    reports = ReportService()
+    snapshot = manager.tasks
+    results["generate_daily_report"] = timed(lambda: reports.generate_daily_report(snapshot))
+    csv_path = os.path.join(directory, f"export-{count}.csv")
+    results["export_tasks_csv"] = timed(lambda: reports.export_tasks_csv(snapshot, csv_path),
+                                        repeat=1 if count >= 1_000_000 else 3)
+    return results
+
+def run(sizes=DEFAULT_SIZES, seed=0, log=print):
+    report = {
+        "meta": {
+            "date": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "seed": seed
+        },
+        "results": {}
+    }
+    with tempfile.TemporaryDirectory() as directory:
+        for count in sizes:
+            start = time.perf_counter()
+            results = run_size(count, directory, seed)
+            report["results"][str(count)] = results
+            log(f"{count} tâches ({time.perf_counter() - start:.1f} s)")
+            for name, seconds in results.items():
+                log(f"  {name:<24}{format_duration(seconds):>12}")
+    return report
+
+def format_duration(seconds):
+    if seconds < 1e-3:
+        return f"{seconds * 1e6:.2f} µs"
+    if seconds < 1:
+        return f"{seconds * 1e3:.2f} ms"
+    return f"{seconds:.2f} s"
+
+def compare(current, baseline, threshold=0.25, floor=1e-7):
+    """Régressions [(taille, benchmark, référence, actuel, ratio)] au-delà de threshold
+
+    Les mesures plus courtes que floor (bruit de l'horloge) sont ignorées.
+    """
+    regressions = []
+    for size, results in current["results"].items():
+        reference = baseline.get("results", {}).get(size, {})
+        for name, seconds in results.items():
+            old = reference.get(name)
+            if old is None or max(old, seconds) < floor:
+                continue
+            ratio = seconds / old if old > 0 else float("inf")
+            if ratio > 1 + threshold:
+                regressions.append((size, name, old, seconds, ratio))
+    return regressions
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmarks de TaskManager")
+    parser.add_argument("--sizes", default=",".join(map(str, DEFAULT_SIZES)),
+                        help="tailles des jeux de tâches, séparées par des virgules")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="fichier JSON des résultats")
+    parser.add_argument("--compare", help="fichier JSON de référence")
+    parser.add_argument("--threshold", type=float, default=0.25,
+                        help="ralentissement toléré avant de signaler une régression (0.25 = +25 %%)")
+    args = parser.parse_args(argv)
+    sizes = [int(size) for size in args.sizes.split(",") if size]
+    report = run(sizes, args.seed)
+    if args.output:
+        os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"Résultats écrits dans {args.output}")
+    if args.compare:
+        try:
+            with open(args.compare, "r") as f:
+                baseline = json.load(f)
+        except FileNotFoundError:
+            print(f"Référence absente ({args.compare}) : comparaison ignorée")
+            return 0
+        regressions = compare(report, baseline, args.threshold)
+        for size, name, old, new, ratio in regressions:
+            print(f"RÉGRESSION {size} tâches, {name} : {format_duration(old)} -> {format_duration(new)} (x{ratio:.2f})")
+        if regressions:
+            return 1
+        print(f"Aucune régression au-delà de +{args.threshold:.0%} par rapport à {args.compare}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,95 @@
+import asyncio
+from typing import List, Optional
+from .services import ReportService
+from .task import Task, Priority, Status
+from .threadsafe import ConcurrentTaskManager
+
+class AsyncTaskManager:
+    """Façade asyncio d'un TaskManager
+
+    Les opérations en mémoire s'exécutent directement ; les accès disque
+    (sauvegarde, chargement, export CSV) partent dans un exécuteur pour ne pas
+    bloquer la boucle. Le gestionnaire sous-jacent est un
+    ``ConcurrentTaskManager`` : la boucle peut continuer à modifier les tâches
+    pendant une écriture. Les sauvegardes demandées pendant qu'une autre est en
+    cours sont regroupées en une seule écriture suivante.
+    """
+
+    def __init__(self, storage_file="tasks.json", manager=None, executor=None, report_service=None, **options):
+        self.manager = manager if manager is not None else ConcurrentTaskManager(storage_file, **options)
+        self.executor = executor
+        self.report_service = report_service or ReportService()
+        self._save_lock = None
+        # Sauvegarde en attente (pas encore commencée) par nom de fichier
+        self._pending_saves = {}
+
+    def _run(self, func, *args):
+        return asyncio.get_running_loop().run_in_executor(self.executor, func, *args)
+
+    async def add_task(self, title, description="", priority=Priority.MEDIUM, due_date=None, assignee_email=None):
+        return self.manager.add_task(title, description, priority, due_date, assignee_email)
+
+    async def add_tasks(self, items):
+        return await self._run(self.manager.add_tasks, items)
+
+    async def get_task(self, task_id) -> Optional[Task]:
+        return self.manager.get_task(task_id)
+
+    async def delete_task(self, task_id) -> bool:
+        return self.manager.delete_task(task_id)
+
+    async def get_tasks_by_status(self, status: Status) -> List[Task]:
+        return self.manager.get_tasks_by_status(status)
+
+    async def get_tasks_by_priority(self, priority: Priority) -> List[Task]:
+        return self.manager.get_tasks_by_priority(priority)
+
+    async def get_statistics(self):
+        return self.manager.get_statistics()
+
+    async def save(self, filename=None):
+        """Sauvegarde hors de la boucle ; les appels concurrents partagent une même écriture"""
+        pending = self._pending_saves.get(filename)
+        while pending is not None:
+            # Une écriture pas encore commencée inclura aussi nos changements
+            try:
+                return await asyncio.shield(pending)
+            except asyncio.CancelledError:
+                if not pending.cancelled():
+                    raise
+                # L'écriture partagée a été annulée (appelant annulé) : on la relance
+                pending = self._pending_saves.get(filename)
+        future = asyncio.get_running_loop().create_future()
+        self._pending_saves[filename] = future
+        if self._save_lock is None:
+            self._save_lock = asyncio.Lock()
+        try:
+            async with self._save_lock:
+                del self._pending_saves[filename]
+                try:
+                    await self._run(self.manager.save_to_file, filename)
+                except Exception as e:
+                    future.set_exception(e)
+                    # Marque l'exception comme consommée si personne d'autre n'attendait
+                    future.exception()
+                    raise
+                future.set_result(None)
+        finally:
+            # Annulation (en attente du verrou ou pendant l'écriture) : libère les appelants en attente
+            if self._pending_saves.get(filename) is future:
+                del self._pending_saves[filename]
+            if not future.done():
+                future.cancel()
+
+    async def load(self, filename=None):
+        if self._save_lock is None:
+            self._save_lock = asyncio.Lock()
+        async with self._save_lock:
+            await self._run(self.manager.load_from_file, filename)
+
+    async def export_csv(self, filename, tasks=None, **options):
+        """Exporte tasks (par défaut un snapshot de toutes les tâches) via ReportService.export_tasks_csv"""
+        if tasks is None:
+            tasks = self.manager.snapshot()
+        export = self.report_service.export_tasks_csv
+        return await self._run(lambda: export(tasks, filename, **options))
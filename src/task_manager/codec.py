@@ -0,0 +1,134 @@
+import json
+from datetime import datetime
+from .task import Task, PRIORITY_BY_NAME, STATUS_BY_NAME, format_id, id_key, intern_value
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - dépend de l'environnement
+    orjson = None
+
+# Tables membre -> nom précalculées pour la sérialisation
+PRIORITY_NAMES = {member: name for name, member in PRIORITY_BY_NAME.items()}
+STATUS_NAMES = {member: name for name, member in STATUS_BY_NAME.items()}
+
+def encode_tasks(tasks):
+    """Dicts sérialisables (même contenu que Task.to_dict) avec cache des dates partagées"""
+    isoformats = {}
+    for task in tasks:
+        created_at = task.created_at
+        created = isoformats.get(created_at)
+        if created is None:
+            created = isoformats[created_at] = created_at.isoformat()
+        completed_at = task.completed_at
+        due_date = task.due_date
+        yield {
+            "id": format_id(task._key),
+            "title": task.title,
+            "description": task.description,
+            "priority": PRIORITY_NAMES[task.priority],
+            "created_at": created,
+            "status": STATUS_NAMES[task.status],
+            "project_id": task.project_id,
+            "completed_at": completed_at.isoformat() if completed_at else None,
+            "due_date": due_date.isoformat() if due_date else None,
+            "assignee_email": task.assignee_email
+        }
+
+def decode_tasks(records):
+    """Reconstruit les tâches ; les horodatages identiques partagent un même objet datetime"""
+    dates = {}
+    restore = Task._restore
+    tasks = []
+    for data in records:
+        title = data["title"]
+        if not title or not isinstance(title, str):
+            raise ValueError("Le titre de la tâche ne peut pas être vide.")
+        created = data["created_at"]
+        created_at = dates.get(created)
+        if created_at is None:
+            created_at = dates[created] = datetime.fromisoformat(created)
+        completed = data.get("completed_at")
+        due = data.get("due_date")
+        tasks.append(restore(
+            id_key(data["id"]),
+            title,
+            data.get("description", ""),
+            PRIORITY_BY_NAME[data["priority"]],
+            created_at,
+            STATUS_BY_NAME[data["status"]],
+            intern_value(data.get("project_id")),
+            datetime.fromisoformat(completed) if completed else None,
+            datetime.fromisoformat(due) if due else None,
+            intern_value(data.get("assignee_email"))
+        ))
+    return tasks
+
+class JsonCodec:
+    """Sérialiseur stdlib : lisible (indent=2, format historique) ou compact
+
+    Le format compact écrit un enregistrement par ligne, sans indentation.
+    """
+
+    name = "json"
+
+    def __init__(self, indent=None):
+        self.indent = indent
+
+    def dump(self, tasks, path):
+        if self.indent is not None:
+            with open(path, "w") as f:
+                json.dump(list(encode_tasks(tasks)), f, indent=self.indent)
+            return
+        encode = json.JSONEncoder(separators=(",", ":")).encode
+        with open(path, "w") as f:
+            f.write("[\n")
+            f.write(",\n".join(encode(record) for record in encode_tasks(tasks)))
+            f.write("\n]")
+
+    def load(self, path):
+        return decode_tasks(self.load_records(path))
+
+    def load_records(self, path):
+        """Enregistrements bruts (dicts) du fichier, sans construire les tâches"""
+        with open(path, "r") as f:
+            return json.load(f)
+
+class OrjsonCodec:
+    """Sérialiseur orjson (même disposition que le format compact de JsonCodec)"""
+
+    name = "orjson"
+
+    def dump(self, tasks, path):
+        dumps = orjson.dumps
+        with open(path, "wb") as f:
+            f.write(b"[\n")
+            f.write(b",\n".join(dumps(record) for record in encode_tasks(tasks)))
+            f.write(b"\n]")
+
+    def load(self, path):
+        return decode_tasks(self.load_records(path))
+
+    def load_records(self, path):
+        with open(path, "rb") as f:
+            return orjson.loads(f.read())
+
+READABLE = JsonCodec(indent=2)
+
+def get_codec(name="auto"):
+    """Retourne un sérialiseur : "readable" (format historique), "json" (compact), "orjson" ou "auto"
+
+    "auto" choisit orjson s'il est installé, sinon le JSON compact de la stdlib.
+    """
+    if not isinstance(name, str):
+        return name
+    if name == "readable":
+        return READABLE
+    if name == "json":
+        return JsonCodec()
+    if name == "orjson":
+        if orjson is None:
+            raise ValueError("orjson n'est pas installé")
+        return OrjsonCodec()
+    if name == "auto":
+        return OrjsonCodec() if orjson is not None else JsonCodec()
+    raise ValueError(f"Sérialiseur inconnu : {name}")
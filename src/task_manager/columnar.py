@@ -0,0 +1,185 @@
+from array import array
+from collections import Counter
+from datetime import datetime
+from itertools import compress
+from .task import Priority, Status
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - dépend de l'environnement
+    np = None
+
+STATUSES = list(Status)
+PRIORITIES = list(Priority)
+STATUS_CODES = {status: code for code, status in enumerate(STATUSES)}
+PRIORITY_CODES = {priority: code for code, priority in enumerate(PRIORITIES)}
+DONE_CODE = STATUS_CODES[Status.DONE]
+NO_DATE = float("nan")
+
+def _epoch(value):
+    return value.timestamp() if value is not None else NO_DATE
+
+class ColumnarTaskStore:
+    """Stockage en colonnes des champs agrégés des tâches
+
+    Chaque tâche occupe une ligne de tableaux ``array`` (codes de statut et de
+    priorité, dates en secondes epoch, code de projet). Comptages, regroupements
+    et filtres par dates sont calculés d'un bloc sur les colonnes, avec NumPy
+    s'il est installé et sinon avec les primitives C de la bibliothèque standard.
+    Les suppressions marquent la ligne comme morte ; les lignes mortes sont
+    compactées quand elles deviennent majoritaires.
+    """
+
+    def __init__(self, use_numpy=None):
+        self.use_numpy = np is not None if use_numpy is None else use_numpy and np is not None
+        self.keys = []
+        self.alive = array("b")
+        self.status = array("b")
+        self.priority = array("b")
+        self.created_at = array("d")
+        self.completed_at = array("d")
+        self.project = array("l")
+        self._rows = {}
+        self._project_codes = {None: -1}
+        self._projects = []
+        self._dead = 0
+
+    @classmethod
+    def from_tasks(cls, tasks, use_numpy=None):
+        store = cls(use_numpy)
+        for task in tasks:
+            store.add(task)
+        return store
+
+    def __len__(self):
+        return len(self._rows)
+
+    def _project_code(self, project_id):
+        code = self._project_codes.get(project_id)
+        if code is None:
+            code = self._project_codes[project_id] = len(self._projects)
+            self._projects.append(project_id)
+        return code
+
+    def add(self, task):
+        self._rows[task._key] = len(self.keys)
+        self.keys.append(task._key)
+        self.alive.append(1)
+        self.status.append(STATUS_CODES[task.status])
+        self.priority.append(PRIORITY_CODES[task.priority])
+        self.created_at.append(_epoch(task.created_at))
+        self.completed_at.append(_epoch(task.completed_at))
+        self.project.append(self._project_code(task.project_id))
+
+    def update(self, task, field):
+        row = self._rows.get(task._key)
+        if row is None:
+            return
+        if field == "status":
+            self.status[row] = STATUS_CODES[task.status]
+        elif field == "priority":
+            self.priority[row] = PRIORITY_CODES[task.priority]
+        elif field == "created_at":
+            self.created_at[row] = _epoch(task.created_at)
+        elif field == "completed_at":
+            self.completed_at[row] = _epoch(task.completed_at)
+        elif field == "project_id":
+            self.project[row] = self._project_code(task.project_id)
+
+    def remove(self, task):
+        row = self._rows.pop(task._key, None)
+        if row is None:
+            return
+        self.alive[row] = 0
+        self._dead += 1
+        if self._dead > len(self._rows):
+            self.compact()
+
+    def compact(self):
+        """Réécrit les colonnes sans les lignes mortes"""
+        alive = self.alive
+        for name in ("status", "priority", "created_at", "completed_at", "project"):
+            column = getattr(self, name)
+            setattr(self, name, array(column.typecode, compress(column, alive)))
+        self.keys = list(compress(self.keys, alive))
+        self.alive = array("b", [1]) * len(self.keys)
+        self._rows = {key: row for row, key in enumerate(self.keys)}
+        self._dead = 0
+
+    def _counts(self, column, size):
+        """Nombre de lignes vivantes par code, pour les codes 0..size-1"""
+        if self.use_numpy:
+            codes = np.frombuffer(column, dtype=np.int8)
+            if self._dead:
+                codes = codes[np.frombuffer(self.alive, dtype=np.int8).astype(bool)]
+            return np.bincount(codes, minlength=size).tolist()
+        counter = Counter(compress(column, self.alive) if self._dead else column)
+        return [counter.get(code, 0) for code in range(size)]
+
+    def count_by_status(self):
+        return dict(zip((s.name for s in STATUSES), self._counts(self.status, len(STATUSES))))
+
+    def count_by_priority(self):
+        return dict(zip((p.name for p in PRIORITIES), self._counts(self.priority, len(PRIORITIES))))
+
+    def count_by_project(self):
+        counts = self._counts_project()
+        return {self._projects[code] if code >= 0 else None: n for code, n in counts.items() if n}
+
+    def _counts_project(self):
+        if self.use_numpy:
+            codes = np.frombuffer(self.project, dtype=np.dtype(f"i{self.project.itemsize}"))
+            if self._dead:
+                codes = codes[np.frombuffer(self.alive, dtype=np.int8).astype(bool)]
+            counts = np.bincount(codes + 1, minlength=len(self._projects) + 1).tolist()
+            return {code - 1: n for code, n in enumerate(counts)}
+        return Counter(compress(self.project, self.alive) if self._dead else self.project)
+
+    def _date_mask(self, column, start, end):
+        low = start.timestamp() if start is not None else float("-inf")
+        high = end.timestamp() if end is not None else float("inf")
+        if self.use_numpy:
+            values = np.frombuffer(column, dtype=np.float64)
+            mask = (values >= low) & (values < high)
+            if self._dead:
+                mask &= np.frombuffer(self.alive, dtype=np.int8).astype(bool)
+            return mask
+        return [alive and low <= value < high for alive, value in zip(self.alive, column)]
+
+    def _mask_count(self, mask):
+        return int(mask.sum()) if self.use_numpy else sum(mask)
+
+    def count_created_between(self, start=None, end=None):
+        """Nombre de tâches créées dans [start, end)"""
+        return self._mask_count(self._date_mask(self.created_at, start, end))
+
+    def count_completed_between(self, start=None, end=None):
+        """Nombre de tâches terminées dans [start, end)"""
+        return self._mask_count(self._date_mask(self.completed_at, start, end))
+
+    def keys_created_between(self, start=None, end=None):
+        """Clés (Task._key) des tâches créées dans [start, end)"""
+        mask = self._date_mask(self.created_at, start, end)
+        if self.use_numpy:
+            return [self.keys[row] for row in np.flatnonzero(mask).tolist()]
+        return list(compress(self.keys, mask))
+
+    def statistics(self):
+        """Même résultat que TaskManager.get_statistics"""
+        tasks_by_status = self.count_by_status()
+        return {
+            "total_tasks": len(self),
+            "completed_tasks": tasks_by_status[Status.DONE.name],
+            "tasks_by_priority": self.count_by_priority(),
+            "tasks_by_status": tasks_by_status
+        }
+
+    def daily_report(self, date=None):
+        """Même résultat que ReportService.generate_daily_report"""
+        date = date or datetime.now()
+        return {
+            "date": date.isoformat(),
+            "total": len(self),
+            "completed": self._counts(self.status, len(STATUSES))[DONE_CODE],
+            "by_priority": {name: n for name, n in self.count_by_priority().items() if n}
+        }
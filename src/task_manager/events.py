@@ -0,0 +1,186 @@
+import itertools
+import threading
+import time
+from collections import deque, namedtuple
+from enum import Enum
+from .task import Status
+
+class EventType(Enum):
+    CREATED = "created"
+    UPDATED = "updated"
+    COMPLETED = "completed"
+    DELETED = "deleted"
+    # L'ensemble des tâches a été remplacé (load_from_file, affectation de tasks)
+    RESET = "reset"
+
+class TaskEvent(namedtuple("TaskEvent", ("seq", "type", "task_id", "field", "old", "new", "record", "timestamp"))):
+    """Changement d'une tâche
+
+    ``record`` est un TaskRecord (copie immuable) de la tâche après le
+    changement ; field, old et new ne sont renseignés que pour UPDATED et
+    COMPLETED. Un événement RESET ne concerne aucune tâche.
+    """
+
+    __slots__ = ()
+
+class ChangeFeed:
+    """Flux des changements d'un TaskManager résident
+
+    Chaque changement reçoit un numéro de séquence croissant. Les derniers
+    ``capacity`` événements sont gardés dans un tampon circulaire : un
+    consommateur relit ``since(seq)`` depuis son dernier numéro vu au lieu de
+    comparer des copies complètes des tâches. Les abonnés (``subscribe``) sont
+    appelés de manière synchrone, dans le thread qui a fait le changement.
+    """
+
+    def __init__(self, manager, capacity=10_000, clock=time.time):
+        if capacity < 1:
+            raise ValueError("La capacité doit être positive")
+        self.manager = manager
+        self.capacity = capacity
+        self.clock = clock
+        self._events = deque(maxlen=capacity)
+        self._counter = itertools.count(1)
+        self._lock = threading.Lock()
+        self._subscribers = ()
+        self.last_seq = 0
+        manager.add_listener(self._on_change)
+
+    def close(self):
+        """Se désabonne du gestionnaire"""
+        self.manager.remove_listener(self._on_change)
+
+    def _on_change(self, op, task, field, old, new):
+        if op == "add":
+            kind = EventType.CREATED
+        elif op == "delete":
+            kind = EventType.DELETED
+        elif op == "reset":
+            kind = EventType.RESET
+        elif field == "status" and new == Status.DONE:
+            kind = EventType.COMPLETED
+        else:
+            kind = EventType.UPDATED
+        record = task.snapshot() if task is not None else None
+        with self._lock:
+            seq = self.last_seq = next(self._counter)
+            event = TaskEvent(seq, kind, record.id if record is not None else None,
+                              field, old, new, record, self.clock())
+            self._events.append(event)
+        for callback in self._subscribers:
+            callback(event)
+
+    def subscribe(self, callback):
+        """Enregistre callback(event) appelé pour chaque nouvel événement"""
+        self._subscribers = self._subscribers + (callback,)
+
+    def unsubscribe(self, callback):
+        subscribers = list(self._subscribers)
+        subscribers.remove(callback)
+        self._subscribers = tuple(subscribers)
+
+    def since(self, seq=0, types=None):
+        """Événements de numéro > seq, du plus ancien au plus récent
+
+        Lève ValueError si des événements postérieurs à seq ont déjà quitté
+        le tampon : le consommateur doit alors se resynchroniser sur
+        ``manager.tasks`` puis repartir de ``last_seq``.
+        """
+        with self._lock:
+            events = self._events
+            if not events or seq >= events[-1].seq:
+                return []
+            first = events[0].seq
+            if seq < first - 1:
+                raise ValueError(f"Événements {seq + 1} à {first - 1} perdus (tampon de {self.capacity})")
+            # Numéros consécutifs : position directe dans le tampon
+            selected = list(itertools.islice(events, max(seq - first + 1, 0), None))
+        if types is not None:
+            selected = [event for event in selected if event.type in types]
+        return selected
+
+class CompletionNotifier:
+    """Envoie les notifications de fin de tâche par lots depuis un ChangeFeed
+
+    ``recipient`` est une adresse ou une fonction record -> adresse (None :
+    pas de notification). L'abonné au flux ne fait que mettre les fins de
+    tâche en file : il est appelé pendant la modification de la tâche (sous
+    le verrou d'écriture d'un ConcurrentTaskManager). Un thread d'envoi
+    expédie chaque lot de ``batch_size`` ; ``flush()`` envoie le reste.
+    Les échecs d'envoi sont comptés dans ``errors``, jamais levés.
+    """
+
+    def __init__(self, feed, email_service, recipient, batch_size=100):
+        self.feed = feed
+        self.email_service = email_service
+        self.recipient = recipient if callable(recipient) else (lambda record: recipient)
+        self.batch_size = batch_size
+        self.sent = 0
+        self.errors = []
+        self._pending = []
+        self._closed = False
+        self._lock = threading.Lock()
+        self._ready = threading.Condition(self._lock)
+        # Un seul envoi à la fois : lots expédiés dans l'ordre des fins de tâche
+        self._sending = threading.Lock()
+        self._worker = threading.Thread(target=self._run, name="completion-notifier", daemon=True)
+        self._worker.start()
+        feed.subscribe(self._on_event)
+
+    def close(self):
+        """Se désabonne du flux, arrête le thread d'envoi et envoie les notifications en attente"""
+        self.feed.unsubscribe(self._on_event)
+        with self._ready:
+            self._closed = True
+            self._ready.notify()
+        self._worker.join()
+        self.flush()
+
+    def _on_event(self, event):
+        if event.type != EventType.COMPLETED:
+            return
+        with self._ready:
+            self._pending.append(event.record)
+            if len(self._pending) >= self.batch_size:
+                self._ready.notify()
+
+    def _run(self):
+        while True:
+            with self._ready:
+                while not self._closed and len(self._pending) < self.batch_size:
+                    self._ready.wait()
+                if self._closed:
+                    return
+                batch = self._pending[:self.batch_size]
+                del self._pending[:self.batch_size]
+            self._send(batch)
+
+    def flush(self):
+        """Envoie les fins de tâche en attente ; retourne (envoyés, erreurs) de ce lot"""
+        with self._lock:
+            batch, self._pending = self._pending, []
+        return self._send(batch)
+
+    def _send(self, records):
+        with self._sending:
+            rows = []
+            errors = []
+            for record in records:
+                try:
+                    email = self.recipient(record)
+                except Exception as e:
+                    errors.append((None, f"Destinataire introuvable : {e}"))
+                    continue
+                if email is not None:
+                    rows.append((email, record.title))
+            sent = 0
+            if rows:
+                try:
+                    sent, failures = self.email_service.send_completion_notifications(rows)
+                except Exception as e:
+                    failures = [(index, f"Échec de l'envoi : {e}") for index in range(len(rows))]
+                errors.extend((rows[index][0], message) for index, message in failures)
+            with self._lock:
+                self.sent += sent
+                self.errors.extend(errors)
+            return sent, errors
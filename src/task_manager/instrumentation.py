@@ -0,0 +1,292 @@
+import cProfile
+import functools
+import io
+import logging
+import os
+import pstats
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from .manager import TaskManager
+from .services import EmailService, ReportService
+from .threadsafe import ConcurrentTaskManager
+
+# Bornes (secondes) des seaux de l'histogramme de latence
+LATENCY_BUCKETS = (1e-6, 5e-6, 1e-5, 5e-5, 1e-4, 5e-4, 1e-3, 5e-3, 1e-2, 5e-2, 0.1, 0.5, 1.0, 5.0, 10.0)
+DEFAULT_CLASSES = (TaskManager, ConcurrentTaskManager, ReportService, EmailService)
+
+class Histogram:
+    """Histogramme cumulable à seaux fixes (format Prometheus)"""
+
+    def __init__(self, bounds=LATENCY_BUCKETS):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def cumulative(self):
+        """[(borne, nombre de valeurs <= borne)], la dernière borne étant +Inf"""
+        total = 0
+        result = []
+        for bound, count in zip(self.bounds + (float("inf"),), self.counts):
+            total += count
+            result.append((bound, total))
+        return result
+
+class MethodStats:
+    """Compteurs d'une méthode : appels, erreurs, latences et tailles de données"""
+
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.latency = Histogram()
+        self.payload_bytes = 0
+        self.payload_max = 0
+
+    def to_dict(self):
+        return {
+            "calls": self.calls,
+            "errors": self.errors,
+            "total_seconds": self.latency.sum,
+            "mean_seconds": self.latency.sum / self.calls if self.calls else 0.0,
+            "payload_bytes": self.payload_bytes,
+            "payload_max": self.payload_max
+        }
+
+class MemorySink:
+    """Agrège les mesures en mémoire ({"Classe.méthode": MethodStats})"""
+
+    def __init__(self):
+        self.methods = {}
+        self._lock = threading.Lock()
+
+    def record(self, name, seconds, size, error):
+        with self._lock:
+            stats = self.methods.get(name)
+            if stats is None:
+                stats = self.methods[name] = MethodStats()
+            stats.calls += 1
+            if error:
+                stats.errors += 1
+            stats.latency.observe(seconds)
+            if size is not None:
+                stats.payload_bytes += size
+                stats.payload_max = max(stats.payload_max, size)
+
+    def snapshot(self):
+        with self._lock:
+            return {name: stats.to_dict() for name, stats in self.methods.items()}
+
+    def reset(self):
+        with self._lock:
+            self.methods = {}
+
+class LoggingSink:
+    """Écrit une ligne de log par appel"""
+
+    def __init__(self, logger=None, level=logging.DEBUG):
+        self.logger = logger or logging.getLogger("task_manager.instrumentation")
+        self.level = level
+
+    def record(self, name, seconds, size, error):
+        if self.logger.isEnabledFor(self.level):
+            self.logger.log(self.level, "%s %.6fs taille=%s%s", name, seconds, size, " ERREUR" if error else "")
+
+class PrometheusSink(MemorySink):
+    """Agrégats en mémoire exposés au format texte Prometheus (render())"""
+
+    def __init__(self, prefix="taskmanager"):
+        super().__init__()
+        self.prefix = prefix
+
+    def render(self):
+        p = self.prefix
+        lines = [
+            f"# TYPE {p}_calls_total counter",
+            f"# TYPE {p}_errors_total counter",
+            f"# TYPE {p}_call_duration_seconds histogram",
+            f"# TYPE {p}_payload_bytes_total counter",
+        ]
+        with self._lock:
+            for name in sorted(self.methods):
+                stats = self.methods[name]
+                label = f'method="{name}"'
+                lines.append(f"{p}_calls_total{{{label}}} {stats.calls}")
+                lines.append(f"{p}_errors_total{{{label}}} {stats.errors}")
+                for bound, count in stats.latency.cumulative():
+                    le = "+Inf" if bound == float("inf") else repr(bound)
+                    lines.append(f'{p}_call_duration_seconds_bucket{{{label},le="{le}"}} {count}')
+                lines.append(f"{p}_call_duration_seconds_sum{{{label}}} {stats.latency.sum}")
+                lines.append(f"{p}_call_duration_seconds_count{{{label}}} {stats.latency.count}")
+                lines.append(f"{p}_payload_bytes_total{{{label}}} {stats.payload_bytes}")
+        return "\n".join(lines) + "\n"
+
+def _file_size(path):
+    try:
+        return os.path.getsize(path)
+    except (OSError, TypeError):
+        return None
+
+def _storage_path(manager, args, kwargs):
+    filename = args[0] if args else kwargs.get("filename")
+    if filename is not None:
+        return filename
+    if manager.storage is None:
+        return manager.storage_file
+    return getattr(manager.storage, "path", None)
+
+# Taille des données d'un appel : fichier écrit ou lu pour les E/S, sinon len() du résultat
+_PAYLOAD = {
+    "save_to_file": lambda self, args, kwargs, result: _file_size(_storage_path(self, args, kwargs)),
+    "load_from_file": lambda self, args, kwargs, result: _file_size(_storage_path(self, args, kwargs)),
+    "export_tasks_csv": lambda self, args, kwargs, result: _file_size(args[1] if len(args) > 1 else kwargs.get("filename")),
+}
+
+def _result_size(self, args, kwargs, result):
+    if isinstance(result, (list, tuple, dict, str, bytes)):
+        return len(result)
+    return None
+
+# Appels mesurés en cours dans le thread : {(id de l'objet, nom de méthode)}
+_active = threading.local()
+
+def _wrap(name, method, sink):
+    payload = _PAYLOAD.get(method.__name__, _result_size)
+    clock = time.perf_counter
+
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        # Redéfinition qui appelle super() : un seul appel mesuré, au nom de la classe concrète
+        active = getattr(_active, "calls", None)
+        if active is None:
+            active = _active.calls = set()
+        call = (id(self), method.__name__)
+        if call in active:
+            return method(self, *args, **kwargs)
+        active.add(call)
+        start = clock()
+        error = True
+        result = None
+        try:
+            result = method(self, *args, **kwargs)
+            error = False
+            return result
+        finally:
+            elapsed = clock() - start
+            active.discard(call)
+            sink.record(name, elapsed, None if error else payload(self, args, kwargs, result), error)
+
+    return wrapper
+
+# Méthodes d'origine remplacées : {(classe, nom): fonction, ou _INHERITED si héritée}
+_originals = {}
+_lock = threading.Lock()
+_INHERITED = object()
+
+def _with_subclasses(classes):
+    seen = []
+    pending = list(classes)
+    while pending:
+        cls = pending.pop()
+        if cls not in seen:
+            seen.append(cls)
+            pending.extend(cls.__subclasses__())
+    return seen
+
+def _public_methods(cls):
+    """{nom: (fonction, définie dans cls)} des méthodes publiques, héritées comprises"""
+    methods = {}
+    for klass in cls.__mro__[:-1]:
+        for attr, value in vars(klass).items():
+            if attr in methods or attr.startswith("_"):
+                continue
+            # Le premier attribut trouvé masque ceux des classes parentes, même s'il est écarté
+            methods[attr] = None
+            if callable(value) and not isinstance(value, (staticmethod, classmethod, type)):
+                methods[attr] = (value, klass is cls)
+    return {attr: method for attr, method in methods.items() if method is not None}
+
+def instrument(sink=None, classes=DEFAULT_CLASSES):
+    """Enveloppe les méthodes publiques des classes pour mesurer chaque appel
+
+    Les sous-classes (ConcurrentTaskManager...) sont instrumentées aussi :
+    chaque classe reçoit ses propres enveloppes, redéfinitions et méthodes
+    héritées comprises, et les appels sont nommés d'après la classe de
+    l'objet. Sans instrumentation les classes gardent leurs méthodes
+    d'origine : le mode désactivé ne coûte rien. Retourne le sink
+    (MemorySink par défaut).
+    """
+    sink = sink if sink is not None else MemorySink()
+    with _lock:
+        _restore()
+        # Méthodes relevées avant toute enveloppe : une sous-classe hérite de la fonction d'origine
+        targets = [(cls, _public_methods(cls)) for cls in _with_subclasses(classes)]
+        for cls, methods in targets:
+            for attr, (method, own) in methods.items():
+                _originals[(cls, attr)] = method if own else _INHERITED
+                setattr(cls, attr, _wrap(f"{cls.__name__}.{attr}", method, sink))
+    return sink
+
+def _restore():
+    for (cls, attr), method in _originals.items():
+        if method is _INHERITED:
+            delattr(cls, attr)
+        else:
+            setattr(cls, attr, method)
+    _originals.clear()
+
+def uninstrument():
+    """Rétablit les méthodes d'origine"""
+    with _lock:
+        _restore()
+
+def is_instrumented():
+    return bool(_originals)
+
+@contextmanager
+def instrumented(sink=None, classes=DEFAULT_CLASSES):
+    """Instrumente le temps d'un bloc et fournit le sink"""
+    sink = instrument(sink, classes)
+    try:
+        yield sink
+    finally:
+        uninstrument()
+
+class ProfileResult:
+    """Profil cProfile d'un bloc ; report() le met en forme"""
+
+    def __init__(self, sort="cumulative", limit=20):
+        self.profiler = cProfile.Profile()
+        self.sort = sort
+        self.limit = limit
+        self.stats = None
+
+    def report(self):
+        if self.stats is None:
+            return ""
+        out = io.StringIO()
+        pstats.Stats(self.profiler, stream=out).sort_stats(self.sort).print_stats(self.limit)
+        return out.getvalue()
+
+    def dump(self, path):
+        """Écrit le profil (format pstats, lisible par snakeviz, pstats...)"""
+        if self.stats is None:
+            raise ValueError("Profil indisponible : le bloc profile() n'est pas terminé")
+        self.stats.dump_stats(path)
+
+@contextmanager
+def profile(sort="cumulative", limit=20):
+    """Capture un profil cProfile des appels effectués dans le bloc"""
+    result = ProfileResult(sort, limit)
+    result.profiler.enable()
+    try:
+        yield result
+    finally:
+        result.profiler.disable()
+        result.stats = pstats.Stats(result.profiler)
@@ -1,63 +1,588 @@
-import json
+import weakref
+from collections.abc import Sequence
+from contextlib import nullcontext
+from datetime import datetime
 from typing import List, Optional
-from .task import Task, Priority, Status
+from .task import Task, Priority, Status, PRIORITY_BY_NAME, format_id, id_key, intern_value, new_keys
+from .storage import JsonFileStorage
+from .codec import READABLE, get_codec
+from .columnar import ColumnarTaskStore
+from .search import SearchIndex
+from .reminders import DueIndex, PENDING_STATUSES
+from .project import Project
+from .query import Query
+from .snapshot import VersionedStore
+
+# Champs indexés : valeur -> {clé: tâche} (dict utilisé comme ensemble ordonné).
+# Les tâches sont indexées par leur clé compacte Task._key (voir task.id_key).
+INDEXED_FIELDS = ("status", "priority", "project_id")
+
+class TaskList(Sequence):
+    """Liste des tâches en lecture seule, figée à sa création
+
+    Renvoyée par ``TaskManager.tasks`` : append, remove ou clear n'existent
+    pas (AttributeError) au lieu de modifier une copie sans effet sur le
+    gestionnaire. Ajouter ou supprimer passe par add_task / delete_task ;
+    remplacer toutes les tâches par ``manager.tasks = [...]``. Se compare
+    à une liste ou un tuple de mêmes tâches.
+    """
+
+    __slots__ = ("_tasks",)
+
+    def __init__(self, tasks=()):
+        self._tasks = tuple(tasks)
+
+    def __len__(self):
+        return len(self._tasks)
+
+    def __getitem__(self, index):
+        return self._tasks[index]
+
+    def __iter__(self):
+        return iter(self._tasks)
+
+    def __eq__(self, other):
+        if isinstance(other, TaskList):
+            return self._tasks == other._tasks
+        if isinstance(other, (list, tuple)):
+            return self._tasks == tuple(other)
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self):
+        return f"TaskList({list(self._tasks)!r})"
 
 class TaskManager:
-    """Gestionnaire principal des tâches"""
+    """Gestionnaire principal des tâches
+
+    Par défaut les tâches vivent en mémoire et sont persistées dans un fichier
+    JSON (``JsonFileStorage``). Avec un backend non résident (``SQLiteStorage``)
+    les données restent dans la base : le gestionnaire ne garde que les tâches
+    en cours d'utilisation et délègue les requêtes au backend.
 
-    def __init__(self, storage_file="tasks.json"):
-        self.tasks = []
+    ``columnar=True`` maintient en plus un ``ColumnarTaskStore`` (attribut
+    ``columns``) pour les rapports. ``get_statistics`` lit les compteurs
+    tenus à jour par les index ; ``verify_statistics=True`` les vérifie à
+    chaque appel par un parcours complet (mode debug). ``searchable=True``
+    maintient un index plein texte (``search_index``) utilisé par ``search``.
+    Les échéances des tâches en attente sont tenues dans ``due_index``
+    (``pop_due``, voir ``reminders.ReminderDispatcher``). ``snapshot()``
+    fournit une vue figée des tâches en O(1) (copie sur écriture).
+    ``codec`` choisit le
+    sérialiseur des fichiers JSON ("auto", "orjson", "json" compact ou
+    "readable", le format historique utilisé par défaut).
+    """
+
+    def __init__(self, storage_file="tasks.json", storage=None, columnar=False, codec=None, verify_statistics=False,
+                 searchable=False):
+        # Méthode liée créée une seule fois : le tuple d'observateurs est partagé par les tâches
+        self._observer = self._on_task_changed
+        self._shared_observers = (self._observer,)
         self.storage_file = storage_file
+        self.storage = storage
+        self.codec = get_codec(codec) if codec is not None else READABLE
+        self._resident = storage is None or storage.resident
+        # Changements en attente pour les backends incrémentaux (None : réécriture complète)
+        self._track_changes = storage is not None and storage.incremental
+        self._changes = {}
+        self._indexes = {field: {} for field in INDEXED_FIELDS}
+        # Backend non résident : simple carte d'identité des tâches utilisées
+        self._by_id = {} if self._resident else weakref.WeakValueDictionary()
+        self.columns = ColumnarTaskStore() if columnar and self._resident else None
+        self.verify_statistics = verify_statistics
+        self.search_index = SearchIndex() if searchable and self._resident else None
+        self.due_index = DueIndex() if self._resident else None
+        # Versions des tâches pour snapshot(), créées au premier appel
+        self._versions = None
+        self._listeners = ()
+        self.projects = {}
+
+    def add_listener(self, callback):
+        """Enregistre callback(op, task, field, old, new) appelé après chaque changement
+
+        op vaut "add", "delete", "update" (field, old, new renseignés) ou
+        "reset" (task None : l'ensemble des tâches a été remplacé).
+        Backends résidents uniquement.
+        """
+        if not self._resident:
+            raise ValueError("Les abonnements requièrent un backend résident")
+        self._listeners = self._listeners + (callback,)
+
+    def remove_listener(self, callback):
+        listeners = list(self._listeners)
+        listeners.remove(callback)
+        self._listeners = tuple(listeners)
+
+    def snapshot(self):
+        """Vue immuable (TaskSnapshot) de l'ensemble des tâches, en O(1)
+
+        Le premier appel copie les tâches (O(N)) dans un vecteur persistant ;
+        ensuite chaque modification y recopie un chemin en O(log n) et les
+        tâches inchangées restent partagées entre les snapshots. Rapports,
+        export CSV et sauvegarde peuvent lire le snapshot pendant que les
+        modifications continuent. Backends résidents uniquement.
+        """
+        if not self._resident:
+            raise ValueError("Les snapshots requièrent un backend résident")
+        if self._versions is None:
+            self._versions = VersionedStore(self._by_id.values())
+        return self._versions.snapshot()
+
+    def _notify(self, op, task=None, field=None, old=None, new=None):
+        for callback in self._listeners:
+            callback(op, task, field, old, new)
+
+    def _backend(self, filename=None):
+        if filename is not None or self.storage is None:
+            return JsonFileStorage(filename or self.storage_file, self.codec)
+        return self.storage
+
+    @property
+    def tasks(self) -> TaskList:
+        """Tâches dans l'ordre d'insertion, en lecture seule (TaskList, copie en O(N))"""
+        if not self._resident:
+            return TaskList(self._attach(task) for task in self.storage.find())
+        return TaskList(self._by_id.values())
+
+    def iter_tasks(self):
+        """Itère les tâches ; un backend non résident les lit en flux, sans tout charger"""
+        if not self._resident:
+            return (self._attach(task) for task in self.storage.find())
+        return iter(self.tasks)
+
+    @tasks.setter
+    def tasks(self, tasks):
+        if not self._resident:
+            self._detach_all()
+            self.storage.clear()
+            self.storage.insert(tasks)
+            return
+        self._reset(tasks)
+        # Remplacement complet : la prochaine sauvegarde réécrit tout
+        self._changes = None
+
+    def _reset(self, tasks):
+        versioned = self._versions is not None
+        self._versions = None
+        # Index plein texte reconstruit en un lot (vocabulaire trié une fois)
+        search_index, self.search_index = self.search_index, None
+        self._detach_all()
+        self._indexes = {field: {} for field in INDEXED_FIELDS}
+        if self.columns is not None:
+            self.columns = ColumnarTaskStore(self.columns.use_numpy)
+        self.due_index.clear()
+        for task in tasks:
+            self._register(task, notify=False)
+        if search_index is not None:
+            search_index.clear()
+            search_index.add_many(self._by_id.values())
+            self.search_index = search_index
+        if versioned:
+            self._versions = VersionedStore(self._by_id.values())
+        if self._listeners:
+            self._notify("reset")
+
+    def _detach_all(self):
+        for task in list(self._by_id.values()):
+            task.remove_observer(self._observer)
+        self._by_id.clear()
+
+    def _register(self, task, notify=True):
+        key = task._key
+        self._by_id[key] = task
+        for field, index in self._indexes.items():
+            index.setdefault(getattr(task, field), {})[key] = task
+        if self.columns is not None:
+            self.columns.add(task)
+        if self.search_index is not None:
+            self.search_index.add(task)
+        if task.due_date is not None:
+            self.due_index.add(task)
+        if self._versions is not None:
+            self._versions.add(task)
+        if task._observers:
+            task.add_observer(self._observer)
+        else:
+            task._observers = self._shared_observers
+        if notify and self._listeners:
+            self._notify("add", task)
+
+    def _register_many(self, tasks):
+        """Enregistre des tâches neuves en un passage par index"""
+        by_id = self._by_id
+        for task in tasks:
+            by_id[task._key] = task
+        for field, index in self._indexes.items():
+            bucket, current = None, object()
+            for task in tasks:
+                value = getattr(task, field)
+                if value is not current:
+                    bucket, current = index.setdefault(value, {}), value
+                bucket[task._key] = task
+        if self.columns is not None:
+            add = self.columns.add
+            for task in tasks:
+                add(task)
+        if self.search_index is not None:
+            self.search_index.add_many(tasks)
+        add = self.due_index.add
+        for task in tasks:
+            if task.due_date is not None:
+                add(task)
+        if self._versions is not None:
+            add = self._versions.add
+            for task in tasks:
+                add(task)
+        if self._track_changes and self._changes is not None:
+            self._changes.update((task._key, "add") for task in tasks)
+        if self._listeners:
+            for task in tasks:
+                self._notify("add", task)
+
+    def _attach(self, task):
+        """Retourne l'instance déjà suivie pour cet id, sinon suit la tâche lue du backend"""
+        if task is None:
+            return None
+        current = self._by_id.get(task._key)
+        if current is not None:
+            return current
+        self._by_id[task._key] = task
+        task.add_observer(self._observer)
+        return task
+
+    def _record_change(self, key, op):
+        changes = self._changes
+        if not self._track_changes or changes is None:
+            return
+        previous = changes.get(key)
+        if previous == "add":
+            if op == "delete":
+                del changes[key]
+        elif op != "update" or previous is None:
+            changes[key] = op
+
+    def _unregister(self, task):
+        key = task._key
+        del self._by_id[key]
+        for field, index in self._indexes.items():
+            self._index_discard(index, getattr(task, field), key)
+        if self.columns is not None:
+            self.columns.remove(task)
+        if self.search_index is not None:
+            self.search_index.remove(task)
+        self.due_index.remove(task)
+        if self._versions is not None:
+            self._versions.remove(task)
+        task.remove_observer(self._observer)
+        if self._listeners:
+            self._notify("delete", task)
+
+    @staticmethod
+    def _index_discard(index, value, key):
+        bucket = index.get(value)
+        if bucket is not None:
+            bucket.pop(key, None)
+            if not bucket:
+                del index[value]
+
+    def _on_task_changed(self, task, field, old, new):
+        if not self._resident:
+            self.storage.update(task)
+            return
+        key = task._key
+        self._record_change(key, "update")
+        index = self._indexes.get(field)
+        if index is not None:
+            self._index_discard(index, old, key)
+            index.setdefault(new, {})[key] = task
+        if self.columns is not None:
+            self.columns.update(task, field)
+        if self.search_index is not None and field in ("title", "description"):
+            self.search_index.update(task)
+        # Nouvel assigné : la tâche redevient due (un rappel écarté faute de destinataire est renvoyé)
+        if field in ("due_date", "assignee_email") or (
+                field == "status" and (old in PENDING_STATUSES) != (new in PENDING_STATUSES)):
+            self.due_index.update(task)
+        if self._versions is not None:
+            self._versions.update(task)
+        if self._listeners:
+            self._notify("update", task, field, old, new)
 
-    def add_task(self, title, description="", priority=Priority.MEDIUM):
-        task = Task(title, description, priority)
-        self.tasks.append(task)
+    def _lookup(self, field, value) -> List[Task]:
+        if not self._resident:
+            return [self._attach(task) for task in self.storage.find(field, value)]
+        return list(self._indexes[field].get(value, {}).values())
+
+    def add_task(self, title, description="", priority=Priority.MEDIUM, due_date=None, assignee_email=None):
+        task = Task(title, description, priority, due_date, assignee_email)
+        if not self._resident:
+            self.storage.insert([task])
+            return self._attach(task).id
+        self._register(task)
+        self._record_change(task._key, "add")
         return task.id
 
+    def add_tasks(self, items):
+        """Ajout en masse depuis des dicts {"title", "description", "priority"}
+
+        La priorité peut être un membre de Priority ou son nom. Les lignes
+        invalides sont ignorées et signalées sans interrompre le lot. Retourne
+        (ids créés, erreurs [(index, message)]).
+        """
+        items = list(items)
+        keys = new_keys(len(items))
+        # Un seul horodatage (objet immuable partagé) pour tout le lot
+        now = datetime.now()
+        observers = self._shared_observers if self._resident else None
+        restore = Task._restore
+        tasks = []
+        errors = []
+        for index, item in enumerate(items):
+            try:
+                title = item["title"]
+                priority = item.get("priority", Priority.MEDIUM)
+                description = item.get("description", "")
+                due_date = item.get("due_date")
+                assignee_email = item.get("assignee_email")
+            except (KeyError, TypeError, AttributeError) as e:
+                errors.append((index, f"Ligne invalide : {e!r}"))
+                continue
+            if not title or not isinstance(title, str):
+                errors.append((index, "Le titre de la tâche ne peut pas être vide."))
+                continue
+            if not isinstance(priority, Priority):
+                priority = PRIORITY_BY_NAME.get(priority) if isinstance(priority, str) else None
+                if priority is None:
+                    errors.append((index, "La priorité doit être une instance de Priority."))
+                    continue
+            if due_date is not None and not isinstance(due_date, datetime):
+                errors.append((index, "L'échéance doit être une datetime."))
+                continue
+            if assignee_email is not None and (not isinstance(assignee_email, str) or "@" not in assignee_email):
+                errors.append((index, "Email invalide"))
+                continue
+            tasks.append(restore(keys[index], title, description, priority, now, Status.TODO, None, None,
+                                 due_date, intern_value(assignee_email), observers))
+        if self._resident:
+            self._register_many(tasks)
+        else:
+            self.storage.insert(tasks)
+        return [format_id(task._key) for task in tasks], errors
+
     def get_task(self, task_id) -> Optional[Task]:
-        for task in self.tasks:
-            if task.id == task_id:
-                return task
-        return None
+        task = self._by_id.get(id_key(task_id))
+        if task is None and not self._resident:
+            task = self._attach(self.storage.get(task_id))
+        return task
 
     def get_tasks_by_status(self, status: Status) -> List[Task]:
-        return [task for task in self.tasks if task.status == status]
+        return self._lookup("status", status)
 
     def get_tasks_by_priority(self, priority: Priority) -> List[Task]:
-        return [task for task in self.tasks if task.priority == priority]
+        return self._lookup("priority", priority)
+
+    def get_tasks_by_project(self, project_id) -> List[Task]:
+        return self._lookup("project_id", project_id)
+
+    def query(self, **conditions) -> Query:
+        """Requête composable : ``manager.query(status__ne=Status.DONE).order_by("created_at").limit(50).all()``
+
+        Voir query.Query pour les opérateurs et le choix de l'index.
+        """
+        return Query(self).where(**conditions)
+
+    def _reading(self):
+        """Contexte des lectures composées (verrou de lecture dans ConcurrentTaskManager)"""
+        return nullcontext()
+
+    def search(self, query, status: Optional[Status] = None, priority: Optional[Priority] = None,
+               limit=None) -> List[Task]:
+        """Tâches dont le titre ou la description contient les termes de query, classées par pertinence
+
+        Accents et casse sont ignorés, le dernier terme peut être un préfixe.
+        status et priority restreignent les résultats via leurs index.
+        """
+        if self.search_index is None:
+            raise ValueError("Recherche non activée : créer le gestionnaire avec searchable=True")
+        within = None
+        for field, value in (("status", status), ("priority", priority)):
+            if value is not None:
+                bucket = self._indexes[field].get(value, {})
+                within = bucket if within is None else within.keys() & bucket.keys()
+        by_id = self._by_id
+        return [by_id[key] for key in self.search_index.search(query, limit, within)]
+
+    def pop_due(self, until, limit=None) -> List[Task]:
+        """Retire de l'index des échéances et retourne les tâches en attente dues avant until
+
+        Coût proportionnel au nombre de tâches retournées. Une tâche n'est
+        rendue qu'une fois, sauf si son échéance change ou si elle est rouverte.
+        """
+        if self.due_index is None:
+            raise ValueError("L'index des échéances requiert un backend résident")
+        return self.due_index.pop_due(until, limit)
+
+    def defer_due(self, task, at):
+        """Remet une tâche retirée par pop_due dans l'index : pop_due la rend de nouveau dès que until >= at
+
+        Sans effet si la tâche a été supprimée, terminée ou remise entre-temps.
+        """
+        if self.due_index is None:
+            raise ValueError("L'index des échéances requiert un backend résident")
+        if self._by_id.get(task._key) is task and task not in self.due_index:
+            self.due_index.add(task, at)
 
     def delete_task(self, task_id) -> bool:
-        for i, task in enumerate(self.tasks):
-            if task.id == task_id:
-                del self.tasks[i]
-                return True
-        return False
+        key = id_key(task_id)
+        if not self._resident:
+            task = self._by_id.pop(key, None)
+            if task is not None:
+                task.remove_observer(self._observer)
+            return self.storage.delete(task_id)
+        task = self._by_id.get(key)
+        if task is None:
+            return False
+        self._unregister(task)
+        self._record_change(key, "delete")
+        return True
 
     def save_to_file(self, filename=None):
-        fname = filename or self.storage_file
+        backend = self._backend(filename)
+        own = backend is self.storage
         try:
-            with open(fname, "w") as f:
-                json.dump([task.to_dict() for task in self.tasks], f, indent=2)
+            if own and not self._resident:
+                backend.save(None, None)
+            else:
+                tasks = self._by_id if self._resident else {t._key: t for t in self.tasks}
+                backend.save(tasks, self._changes if own else None)
+            if backend.stores_projects:
+                backend.save_projects(self.projects.values())
         except Exception as e:
             raise IOError(f"Erreur lors de la sauvegarde : {e}")
+        if own:
+            self._changes = {}
 
     def load_from_file(self, filename=None):
-        fname = filename or self.storage_file
+        backend = self._backend(filename)
+        own = backend is self.storage
+        try:
+            tasks = backend.load()
+            if self._resident:
+                self._reset(tasks)
+            elif own:
+                # Les données restent dans la base : on oublie seulement les instances suivies
+                self._detach_all()
+            else:
+                self.tasks = tasks
+            if backend.stores_projects:
+                self.projects = {project.id: project for project in backend.load_projects()}
+        except Exception as e:
+            raise IOError(f"Erreur lors du chargement : {e}")
+        self._changes = {} if own else None
+
+    def add_project(self, name, description="", project_id=None):
+        project = Project(name, description, project_id)
+        if project.id in self.projects:
+            raise ValueError(f"Projet déjà existant : {project.id}")
+        self.projects[project.id] = project
+        return project.id
+
+    def get_project(self, project_id) -> Optional[Project]:
+        return self.projects.get(project_id)
+
+    def get_projects(self) -> List[Project]:
+        return list(self.projects.values())
+
+    def delete_project(self, project_id) -> bool:
+        """Supprime le projet ; ses tâches sont conservées, sans projet"""
+        if self.projects.pop(project_id, None) is None:
+            return False
+        for task in self.get_tasks_by_project(project_id):
+            task.assign_to_project(None)
+        return True
+
+    def get_project_statistics(self, project_id):
+        """Statistiques (même forme que get_statistics) des seules tâches du projet, via l'index"""
+        return self._scan_statistics(self.get_tasks_by_project(project_id))
+
+    def _partitioned_storage(self):
+        if self.storage is None or not self.storage.partitioned:
+            raise ValueError("Le backend ne stocke pas les projets séparément (voir ShardedStorage)")
+        return self.storage
+
+    def _forget_changes(self, keys):
+        if self._changes is not None:
+            for key in keys:
+                self._changes.pop(key, None)
+
+    def _shard_tasks(self, storage, project_id):
+        """Tâches rangées dans le shard de project_id (42 et "42" partagent un shard)"""
+        shard = storage.shard_id(project_id)
+        values = [value for value in self._indexes["project_id"] if storage.shard_id(value) == shard]
+        return [task for value in values for task in self._lookup("project_id", value)]
+
+    def load_project(self, project_id):
+        """Recharge depuis son shard les tâches d'un seul projet"""
+        storage = self._partitioned_storage()
         try:
-            with open(fname, "r") as f:
-                data = json.load(f)
-                self.tasks = [Task.from_dict(d) for d in data]
-        except FileNotFoundError:
-            self.tasks = []
+            tasks = storage.load_shard(project_id)
         except Exception as e:
             raise IOError(f"Erreur lors du chargement : {e}")
+        current = self._shard_tasks(storage, project_id)
+        for task in current:
+            self._unregister(task)
+        for task in tasks:
+            existing = self._by_id.get(task._key)
+            if existing is not None:
+                self._unregister(existing)
+            self._register(task)
+        self._forget_changes([task._key for task in current] + [task._key for task in tasks])
+
+    def save_project(self, project_id):
+        """Écrit le shard d'un seul projet ; les autres shards ne sont pas touchés"""
+        storage = self._partitioned_storage()
+        tasks = self._shard_tasks(storage, project_id)
+        try:
+            storage.save_shard(project_id, tasks)
+        except Exception as e:
+            raise IOError(f"Erreur lors de la sauvegarde : {e}")
+        self._forget_changes([task._key for task in tasks])
 
     def get_statistics(self):
-        total_tasks = len(self.tasks)
-        completed_tasks = len([t for t in self.tasks if t.status == Status.DONE])
+        """Statistiques en O(1) : tailles des seaux des index status et priority
+
+        Avec ``verify_statistics`` les compteurs sont comparés à un parcours
+        complet des tâches (et aux colonnes) ; une divergence lève RuntimeError.
+        """
+        if not self._resident:
+            return self.storage.statistics()
+        by_status = self._indexes["status"]
+        by_priority = self._indexes["priority"]
+        tasks_by_status = {s.name: len(by_status.get(s, ())) for s in Status}
+        stats = {
+            "total_tasks": len(self._by_id),
+            "completed_tasks": tasks_by_status[Status.DONE.name],
+            "tasks_by_priority": {p.name: len(by_priority.get(p, ())) for p in Priority},
+            "tasks_by_status": tasks_by_status
+        }
+        if self.verify_statistics:
+            expected = self._scan_statistics()
+            if self.columns is not None and self.columns.statistics() != expected:
+                raise RuntimeError(f"Colonnes incohérentes : {self.columns.statistics()} au lieu de {expected}")
+            if stats != expected:
+                raise RuntimeError(f"Statistiques incohérentes : {stats} au lieu de {expected}")
+        return stats
+
+    def _scan_statistics(self, tasks=None):
+        """Statistiques recalculées par un parcours complet des tâches (par défaut toutes)"""
+        if tasks is None:
+            tasks = self._by_id.values()
+        total_tasks = len(tasks)
+        completed_tasks = len([t for t in tasks if t.status == Status.DONE])
         tasks_by_priority = {p.name: 0 for p in Priority}
         tasks_by_status = {s.name: 0 for s in Status}
-        for t in self.tasks:
+        for t in tasks:
             tasks_by_priority[t.priority.name] += 1
             tasks_by_status[t.status.name] += 1
         return {
@@ -65,4 +590,4 @@ class TaskManager:
             "completed_tasks": completed_tasks,
             "tasks_by_priority": tasks_by_priority,
             "tasks_by_status": tasks_by_status
-        } 
\ No newline at end of file
+        }
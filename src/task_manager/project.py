@@ -0,0 +1,30 @@
+import uuid
+from datetime import datetime
+from .task import intern_value
+
+class Project:
+    """Un projet regroupant des tâches (Task.project_id)"""
+
+    __slots__ = ("id", "name", "description", "created_at")
+
+    def __init__(self, name, description="", project_id=None):
+        if not name or not isinstance(name, str):
+            raise ValueError("Le nom du projet ne peut pas être vide.")
+        self.id = intern_value(project_id or str(uuid.uuid4()))
+        self.name = name
+        self.description = description
+        self.created_at = datetime.now()
+
+    def to_dict(self):
+        return {
+            "id": self.id,
+            "name": self.name,
+            "description": self.description,
+            "created_at": self.created_at.isoformat()
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        project = cls(data["name"], data.get("description", ""), data["id"])
+        project.created_at = datetime.fromisoformat(data["created_at"])
+        return project
@@ -0,0 +1,268 @@
+import heapq
+import operator
+from itertools import chain, islice
+from operator import attrgetter
+from .task import Priority, Status, PRIORITY_BY_NAME, STATUS_BY_NAME, format_id, id_key, intern_value
+
+FIELDS = ("id", "title", "description", "priority", "created_at", "status", "project_id",
+          "completed_at", "due_date", "assignee_email")
+OPERATORS = ("eq", "ne", "in", "not_in", "lt", "lte", "gt", "gte", "contains", "isnull")
+# Champs disposant d'un index de hachage dans le gestionnaire (plus "id" via _by_id)
+INDEXED = ("status", "priority", "project_id")
+_ORDERING = {"lt": operator.lt, "lte": operator.le, "gt": operator.gt, "gte": operator.ge}
+
+def _normalize(field, value):
+    """Valeur comparable au champ : noms d'énumération acceptés, identifiants en clés compactes"""
+    if field == "priority" and isinstance(value, str):
+        member = PRIORITY_BY_NAME.get(value)
+    elif field == "status" and isinstance(value, str):
+        member = STATUS_BY_NAME.get(value)
+    elif field == "id":
+        return id_key(value)
+    else:
+        return intern_value(value)
+    if member is None:
+        raise ValueError(f"Valeur invalide pour {field} : {value}")
+    return member
+
+def _rank(value):
+    # Les priorités se comparent par niveau
+    return value.value if isinstance(value, Priority) else value
+
+def _sort_value(value):
+    return _rank(value.value if isinstance(value, Status) else value)
+
+class Predicate:
+    """Condition ``champ opérateur valeur`` sur une tâche"""
+
+    __slots__ = ("field", "op", "value", "test")
+
+    def __init__(self, field, op, value):
+        if field not in FIELDS:
+            raise ValueError(f"Champ inconnu : {field}")
+        if op not in OPERATORS:
+            raise ValueError(f"Opérateur inconnu : {op}")
+        if op in _ORDERING and field in ("id", "status"):
+            raise ValueError(f"Le champ {field} n'est pas ordonné")
+        if op in ("in", "not_in"):
+            value = frozenset(_normalize(field, v) for v in value)
+        elif op == "contains":
+            if not isinstance(value, str):
+                raise ValueError("contains attend une chaîne")
+        elif op != "isnull":
+            value = _normalize(field, value)
+        self.field = field
+        self.op = op
+        self.value = value
+        self.test = self._compile()
+
+    def _compile(self):
+        get = attrgetter("_key" if self.field == "id" else self.field)
+        op, value = self.op, self.value
+        if op == "eq":
+            return lambda task: get(task) == value
+        if op == "ne":
+            return lambda task: get(task) != value
+        if op == "in":
+            return lambda task: get(task) in value
+        if op == "not_in":
+            return lambda task: get(task) not in value
+        if op == "isnull":
+            return lambda task: (get(task) is None) == bool(value)
+        if op == "contains":
+            needle = value.casefold()
+
+            def test(task):
+                current = get(task)
+                return current is not None and needle in current.casefold()
+
+            return test
+        bound = _rank(value)
+        compare = _ORDERING[op]
+
+        def test(task):
+            # Une valeur absente (None) ne satisfait aucune comparaison
+            current = get(task)
+            return current is not None and compare(_rank(current), bound)
+
+        return test
+
+    def __repr__(self):
+        return f"Predicate({self.field!r}, {self.op!r}, {self.value!r})"
+
+class Query:
+    """Requête composable sur les tâches d'un TaskManager
+
+    Les conditions s'écrivent ``champ=valeur`` ou ``champ__opérateur=valeur``
+    (opérateurs : eq, ne, in, not_in, lt, lte, gt, gte, contains, isnull) et
+    se combinent par ET. Le planificateur parcourt l'index le plus sélectif
+    (id, status, priority, project_id) et vérifie les autres conditions à la
+    volée : sans tri, une requête paginée s'arrête dès qu'elle a assez de
+    résultats ; avec tri et limite, seuls offset + limit résultats sont gardés
+    (tas). Sans ``order_by`` l'ordre est celui de l'index choisi.
+    """
+
+    def __init__(self, manager):
+        self.manager = manager
+        self.predicates = []
+        self.ordering = []
+        self._limit = None
+        self._offset = 0
+
+    def where(self, **conditions):
+        for name, value in conditions.items():
+            field, _, op = name.partition("__")
+            self.predicates.append(Predicate(field, op or "eq", value))
+        return self
+
+    def order_by(self, *fields):
+        """Tri par champs ; préfixe "-" pour un ordre décroissant. Les valeurs absentes viennent en dernier."""
+        for name in fields:
+            field = name.lstrip("-")
+            if field not in FIELDS:
+                raise ValueError(f"Champ inconnu : {field}")
+            self.ordering.append((field, name.startswith("-")))
+        return self
+
+    def limit(self, count):
+        if count is not None and count < 0:
+            raise ValueError("La limite doit être positive")
+        self._limit = count
+        return self
+
+    def offset(self, count):
+        if count < 0:
+            raise ValueError("Le décalage doit être positif")
+        self._offset = count
+        return self
+
+    def _options(self, predicate):
+        """Valeurs d'index à parcourir pour un prédicat, ou None s'il ne peut pas utiliser d'index"""
+        field, op, value = predicate.field, predicate.op, predicate.value
+        if field != "id" and field not in INDEXED:
+            return None
+        if op == "eq":
+            return (value,)
+        if op == "in":
+            return tuple(value)
+        if op in ("ne", "not_in") and field != "id" and self.manager._resident:
+            # Complément : tous les seaux sauf les valeurs exclues
+            excluded = value if op == "not_in" else (value,)
+            return tuple(v for v in self.manager._indexes[field] if v not in excluded)
+        return None
+
+    def plan(self):
+        """(prédicat choisi ou None, valeurs d'index, estimation du nombre de candidats)"""
+        manager = self.manager
+        best = (None, None, len(manager._by_id) if manager._resident else float("inf"))
+        for predicate in self.predicates:
+            values = self._options(predicate)
+            if values is None:
+                continue
+            if predicate.field == "id":
+                cost = len(values)
+            elif manager._resident:
+                index = manager._indexes[predicate.field]
+                cost = sum(len(index.get(v, ())) for v in values)
+            else:
+                # Sans statistiques du backend : le moins de valeurs possible
+                cost = len(values) * 1e9
+            if cost < best[2]:
+                best = (predicate, values, cost)
+        return best
+
+    def explain(self):
+        """Description du plan : index parcouru, estimation et conditions vérifiées à la volée"""
+        chosen, values, cost = self.plan()
+        return {
+            "index": chosen.field if chosen is not None else None,
+            "estimated": cost if self.manager._resident else None,
+            "filters": [p for p in self.predicates if p is not chosen],
+            "ordering": list(self.ordering)
+        }
+
+    def _candidates(self, chosen, values):
+        manager = self.manager
+        if chosen is None:
+            return iter(manager._by_id.values()) if manager._resident else manager.iter_tasks()
+        if chosen.field == "id":
+            by_id = manager._by_id
+            if manager._resident:
+                return (by_id[key] for key in values if key in by_id)
+            tasks = (manager.get_task(format_id(key)) for key in values)
+            return (task for task in tasks if task is not None)
+        if manager._resident:
+            index = manager._indexes[chosen.field]
+            return chain.from_iterable(index.get(v, {}).values() for v in values)
+        storage = manager.storage
+        return (manager._attach(task) for v in values for task in storage.find(chosen.field, v))
+
+    def _matches(self):
+        chosen, values, _ = self.plan()
+        tests = [p.test for p in self.predicates if p is not chosen]
+        candidates = self._candidates(chosen, values)
+        if not tests:
+            return candidates
+        return (task for task in candidates if all(test(task) for test in tests))
+
+    def _sorted(self, tasks):
+        stop = None if self._limit is None else self._offset + self._limit
+        directions = {descending for _, descending in self.ordering}
+        if len(directions) == 1:
+            getters = [attrgetter(field) for field, _ in self.ordering]
+            descending = directions.pop()
+
+            def key(task):
+                # (absente, valeur) : les valeurs None en dernier dans les deux sens
+                values = []
+                for get in getters:
+                    value = get(task)
+                    values.append((value is None) != descending)
+                    values.append(_sort_value(value) if value is not None else 0)
+                return values
+
+            if stop is not None:
+                select = heapq.nlargest if descending else heapq.nsmallest
+                return select(stop, tasks, key=key)
+            return sorted(tasks, key=key, reverse=descending)
+        # Sens mélangés : tris stables successifs, du dernier critère au premier
+        result = list(tasks)
+        for field, descending in reversed(self.ordering):
+            get = attrgetter(field)
+            result.sort(key=lambda task: ((get(task) is None) != descending,
+                                          _sort_value(get(task)) if get(task) is not None else 0),
+                        reverse=descending)
+        return result
+
+    def _execute(self):
+        tasks = self._matches()
+        if self.ordering:
+            tasks = self._sorted(tasks)
+        stop = None if self._limit is None else self._offset + self._limit
+        return islice(tasks, self._offset, stop)
+
+    def all(self):
+        with self.manager._reading():
+            return list(self._execute())
+
+    def __iter__(self):
+        return iter(self.all())
+
+    def first(self):
+        with self.manager._reading():
+            return next(self._execute(), None)
+
+    def count(self):
+        """Nombre de résultats (offset et limit compris), sans construire de liste
+
+        Une requête réduite à une condition indexée est comptée par la taille des seaux.
+        """
+        with self.manager._reading():
+            chosen, values, cost = self.plan()
+            if (len(self.predicates) == 1 and chosen is not None and chosen.field != "id"
+                    and self.manager._resident):
+                total = cost
+            else:
+                total = sum(1 for _ in self._matches())
+        total = max(total - self._offset, 0)
+        return total if self._limit is None else min(total, self._limit)
@@ -0,0 +1,133 @@
+import heapq
+import itertools
+from datetime import datetime, timedelta
+from .task import Status
+
+# Statuts pour lesquels un rappel d'échéance a un sens
+PENDING_STATUSES = frozenset({Status.TODO, Status.IN_PROGRESS})
+
+# Marqueur d'une entrée de tas invalidée (suppression paresseuse)
+_REMOVED = object()
+
+class DueIndex:
+    """Index des échéances à rappeler, adossé à un tas trié par due_date
+
+    Seules les tâches en attente (TODO, IN_PROGRESS) avec une échéance sont
+    indexées. ``pop_due`` retire les tâches échues en O(k log n) pour k
+    tâches retournées : une tâche n'est rendue qu'une fois, jusqu'à ce que
+    son échéance ou son assigné change, qu'elle soit rouverte ou remise avec
+    ``add(task, at)`` (rendue alors quand until atteint at).
+    """
+
+    def __init__(self):
+        self._entries = {}
+        self._heap = []
+        self._counter = itertools.count()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, task):
+        return task._key in self._entries
+
+    def add(self, task, at=None):
+        if task.due_date is None or task.status not in PENDING_STATUSES:
+            return
+        entry = [task.due_date if at is None else at, next(self._counter), task]
+        self._entries[task._key] = entry
+        heapq.heappush(self._heap, entry)
+
+    def remove(self, task):
+        entry = self._entries.pop(task._key, None)
+        if entry is None:
+            return
+        entry[2] = _REMOVED
+        # Compactage quand les entrées invalidées dominent le tas
+        if len(self._heap) > 2 * len(self._entries) + 64:
+            self._heap = [entry for entry in self._heap if entry[2] is not _REMOVED]
+            heapq.heapify(self._heap)
+
+    def update(self, task):
+        self.remove(task)
+        self.add(task)
+
+    def clear(self):
+        self._entries = {}
+        self._heap = []
+
+    def next_due(self):
+        """Prochaine échéance indexée (None si aucune)"""
+        heap = self._heap
+        while heap and heap[0][2] is _REMOVED:
+            heapq.heappop(heap)
+        return heap[0][0] if heap else None
+
+    def pop_due(self, until, limit=None):
+        """Retire et retourne les tâches d'échéance (ou de date de remise) <= until, de la plus proche à la plus lointaine"""
+        heap = self._heap
+        due = []
+        while heap and heap[0][0] <= until and (limit is None or len(due) < limit):
+            task = heapq.heappop(heap)[2]
+            if task is not _REMOVED:
+                del self._entries[task._key]
+                due.append(task)
+        return due
+
+class ReminderDispatcher:
+    """Envoie par lots les rappels des tâches arrivant à échéance
+
+    Chaque ``run`` retire de l'index des échéances du gestionnaire les tâches
+    dues avant ``maintenant + window`` et les transmet à
+    ``EmailService.send_reminders`` par lots de ``batch_size`` : le coût est
+    proportionnel au nombre de tâches dues, pas au nombre total de tâches.
+    Les tâches sans ``assignee_email`` sont ignorées ; un ``assign_to``
+    ultérieur les remet dans l'index et le ``run`` suivant envoie le rappel.
+
+    Un rappel en échec est signalé puis remis dans l'index : il est retenté
+    par un ``run`` postérieur d'au moins ``retry_delay`` (délai doublé à
+    chaque échec), au plus ``max_retries`` fois avant d'être abandonné.
+    """
+
+    def __init__(self, manager, email_service, window=timedelta(hours=24), batch_size=100, clock=datetime.now,
+                 retry_delay=timedelta(minutes=5), max_retries=3):
+        self.manager = manager
+        self.email_service = email_service
+        self.window = window
+        self.batch_size = batch_size
+        self.clock = clock
+        self.retry_delay = retry_delay
+        self.max_retries = max_retries
+        # Échecs consécutifs par clé de tâche
+        self._failures = {}
+
+    def run(self, now=None):
+        """Envoie les rappels dus ; retourne (nombre envoyés, erreurs [(id de tâche, message)])"""
+        until = (now or self.clock()) + self.window
+        tasks = [task for task in self.manager.pop_due(until) if task.assignee_email is not None]
+        sent = 0
+        errors = []
+        failed = []
+        for start in range(0, len(tasks), self.batch_size):
+            chunk = tasks[start:start + self.batch_size]
+            count, failures = self.email_service.send_reminders(
+                [(task.assignee_email, task.title, task.due_date) for task in chunk])
+            sent += count
+            errors.extend((chunk[index].id, message) for index, message in failures)
+            failed.extend(chunk[index] for index, _ in failures)
+        self._retry(tasks, failed, until)
+        return sent, errors
+
+    def _retry(self, tasks, failed, until):
+        failures = self._failures
+        failed_keys = {task._key for task in failed}
+        for task in tasks:
+            if task._key not in failed_keys:
+                failures.pop(task._key, None)
+        for task in failed:
+            count = failures.get(task._key, 0) + 1
+            if count > self.max_retries:
+                del failures[task._key]
+                continue
+            failures[task._key] = count
+            # Rendue par le premier run dont until dépasse celui-ci du délai d'attente
+            self.manager.defer_due(task, until + self.retry_delay * 2 ** (count - 1))
@@ -0,0 +1,136 @@
+from collections import Counter
+from datetime import datetime, timedelta
+from math import ceil
+
+PERIODS = ("day", "week", "month")
+PERCENTILES = (50, 90, 99)
+
+def _check_period(period):
+    if period not in PERIODS:
+        raise ValueError(f"Période inconnue : {period}")
+
+def period_start(day, period):
+    """Premier jour de la période (jour, semaine commençant le lundi, mois) contenant day"""
+    if period == "day":
+        return day
+    if period == "week":
+        return day - timedelta(days=day.weekday())
+    if period == "month":
+        return day.replace(day=1)
+    raise ValueError(f"Période inconnue : {period}")
+
+def next_period(start, period):
+    if period == "day":
+        return start + timedelta(days=1)
+    if period == "week":
+        return start + timedelta(days=7)
+    if start.month == 12:
+        return start.replace(year=start.year + 1, month=1)
+    return start.replace(month=start.month + 1)
+
+def percentile(values, p):
+    """Percentile (rang le plus proche) d'une liste triée"""
+    if not values:
+        return None
+    return values[max(0, ceil(p / 100 * len(values)) - 1)]
+
+class PeriodBucket:
+    """Agrégats d'une période : créations, terminaisons, priorités et délais (secondes, triés)"""
+
+    __slots__ = ("created", "completed", "by_priority", "lead_times")
+
+    def __init__(self):
+        self.created = 0
+        self.completed = 0
+        self.by_priority = Counter()
+        self.lead_times = []
+
+def bucket_tasks(tasks, period="day", since=None):
+    """Répartit les tâches en un seul passage : {début de période: PeriodBucket}
+
+    Une tâche compte dans la période de sa création et, si elle est terminée,
+    dans celle de sa terminaison (avec son délai de traitement). Avec ``since``
+    les périodes antérieures sont ignorées.
+    """
+    _check_period(period)
+    buckets = {}
+    starts = {}
+
+    def bucket_for(value):
+        day = value.date()
+        start = starts.get(day)
+        if start is None:
+            start = starts[day] = period_start(day, period)
+        if since is not None and start < since:
+            return None
+        bucket = buckets.get(start)
+        if bucket is None:
+            bucket = buckets[start] = PeriodBucket()
+        return bucket
+
+    for task in tasks:
+        created_at = task.created_at
+        bucket = bucket_for(created_at)
+        if bucket is not None:
+            bucket.created += 1
+            bucket.by_priority[task.priority.name] += 1
+        completed_at = task.completed_at
+        if completed_at is not None:
+            bucket = bucket_for(completed_at)
+            if bucket is not None:
+                bucket.completed += 1
+                bucket.lead_times.append((completed_at - created_at).total_seconds())
+    for bucket in buckets.values():
+        bucket.lead_times.sort()
+    return buckets
+
+class ReportCache:
+    """Périodes déjà calculées, réutilisées d'un appel à l'autre
+
+    Les périodes antérieures à la dernière calculée sont considérées closes :
+    seules la dernière et les suivantes sont recalculées au prochain appel.
+    """
+
+    def __init__(self, period="day"):
+        _check_period(period)
+        self.period = period
+        self.buckets = {}
+        self.until = None
+
+    def refresh(self, tasks):
+        fresh = bucket_tasks(tasks, self.period, self.until)
+        if self.until is not None:
+            for start in [start for start in self.buckets if start >= self.until]:
+                del self.buckets[start]
+        self.buckets.update(fresh)
+        self.until = max(self.buckets) if self.buckets else None
+        return self.buckets
+
+def _as_date(value):
+    return value.date() if isinstance(value, datetime) else value
+
+def period_reports(buckets, period="day", start=None, end=None):
+    """Série continue de rapports, de la période de start à celle de end (incluses)"""
+    if start is None or end is None:
+        if not buckets:
+            return []
+        start = start or min(buckets)
+        end = end or max(buckets)
+    current = period_start(_as_date(start), period)
+    last = period_start(_as_date(end), period)
+    reports = []
+    empty = PeriodBucket()
+    while current <= last:
+        following = next_period(current, period)
+        bucket = buckets.get(current, empty)
+        lead_times = bucket.lead_times
+        reports.append({
+            "period": current.isoformat(),
+            "created": bucket.created,
+            "completed": bucket.completed,
+            "by_priority": dict(bucket.by_priority),
+            "throughput": bucket.completed / (following - current).days,
+            "lead_time": {f"p{p}": percentile(lead_times, p) for p in PERCENTILES}
+        })
+        current = following
+    return reports
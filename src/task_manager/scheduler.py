@@ -0,0 +1,181 @@
+import heapq
+import itertools
+import threading
+import time
+from typing import List, Optional
+from .task import Task, Status, id_key
+
+# Marqueur d'une entrée de tas invalidée (suppression paresseuse)
+_REMOVED = object()
+
+class TaskScheduler:
+    """File de travail ordonnée par priorité puis ancienneté, adossée à un tas
+
+    Seules les tâches TODO non réservées sont dans la file. ``claim`` réserve
+    des tâches (statut IN_PROGRESS) pour ``lease`` secondes ; une réservation
+    expirée, ou ``release``, remet la tâche en TODO dans la file. ``complete``
+    la termine. Les tâches déjà IN_PROGRESS à la création du planificateur ou
+    au rechargement des tâches reçoivent une nouvelle réservation : leur
+    travailleur a pu disparaître, elles reviennent en file à son expiration. Le planificateur s'abonne au gestionnaire : ajouts,
+    suppressions, chargements et modifications (``update_priority``,
+    ``mark_completed``...) mettent la file à jour en O(log n).
+
+    Avec ``aging`` (secondes), la clé de tri devient
+    ``created_at - priorité * aging`` : un niveau de priorité vaut ``aging``
+    secondes d'ancienneté, une tâche LOW finit donc par passer devant.
+    """
+
+    def __init__(self, manager, lease=300.0, aging=None, clock=time.time):
+        self.manager = manager
+        self.lease = lease
+        self.aging = aging
+        self.clock = clock
+        self._lock = threading.RLock()
+        self._counter = itertools.count()
+        self._rebuild()
+        manager.add_listener(self._on_change)
+
+    def close(self):
+        """Se désabonne du gestionnaire"""
+        self.manager.remove_listener(self._on_change)
+
+    def _sort_key(self, task):
+        created = task.created_at.timestamp()
+        if self.aging is None:
+            return (-task.priority.value, created)
+        return (created - task.priority.value * self.aging,)
+
+    def _entry(self, task):
+        return [self._sort_key(task), next(self._counter), task]
+
+    def _rebuild(self):
+        # Lecture du gestionnaire avant de prendre le verrou (même ordre que les notifications)
+        todo = self.manager.get_tasks_by_status(Status.TODO)
+        in_progress = self.manager.get_tasks_by_status(Status.IN_PROGRESS)
+        with self._lock:
+            self._entries = {task._key: self._entry(task) for task in todo}
+            self._heap = list(self._entries.values())
+            heapq.heapify(self._heap)
+            expiry = self.clock() + self.lease
+            self._leases = {task._key: (expiry, task) for task in in_progress}
+            self._lease_heap = [(expiry, next(self._counter), key) for key in self._leases]
+
+    def _push(self, task):
+        entry = self._entry(task)
+        self._entries[task._key] = entry
+        heapq.heappush(self._heap, entry)
+
+    def _discard(self, key):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            entry[2] = _REMOVED
+
+    def _on_change(self, op, task, field, old, new):
+        with self._lock:
+            if op == "reset":
+                self._rebuild()
+                return
+            key = task._key
+            if op == "add":
+                if task.status == Status.TODO:
+                    self._push(task)
+            elif op == "delete":
+                self._discard(key)
+                self._leases.pop(key, None)
+            elif field == "status":
+                if new == Status.TODO:
+                    # Remise en file (release, expiration ou modification externe)
+                    self._leases.pop(key, None)
+                    if key not in self._entries:
+                        self._push(task)
+                else:
+                    self._discard(key)
+                    if new != Status.IN_PROGRESS:
+                        self._leases.pop(key, None)
+            elif field == "priority" and key in self._entries:
+                self._discard(key)
+                self._push(task)
+
+    def __len__(self):
+        """Nombre de tâches en attente dans la file"""
+        return len(self._entries)
+
+    def _expired(self):
+        """Retire les réservations échues et retourne leurs tâches"""
+        now = self.clock()
+        heap = self._lease_heap
+        expired = []
+        while heap and heap[0][0] <= now:
+            expiry, _, key = heapq.heappop(heap)
+            lease = self._leases.get(key)
+            if lease is not None and lease[0] == expiry:
+                del self._leases[key]
+                expired.append(lease[1])
+        return expired
+
+    def _requeue(self, tasks):
+        # Hors verrou : la modification notifie le gestionnaire, puis le planificateur
+        for task in tasks:
+            if task.status == Status.IN_PROGRESS:
+                task.status = Status.TODO
+
+    def _pop(self):
+        heap = self._heap
+        while heap:
+            entry = heapq.heappop(heap)
+            task = entry[2]
+            if task is not _REMOVED:
+                del self._entries[task._key]
+                return task
+        return None
+
+    def next_task(self) -> Optional[Task]:
+        """Tâche qui serait réservée ensuite, sans la réserver"""
+        with self._lock:
+            expired = self._expired()
+        self._requeue(expired)
+        with self._lock:
+            heap = self._heap
+            while heap and heap[0][2] is _REMOVED:
+                heapq.heappop(heap)
+            return heap[0][2] if heap else None
+
+    def claim(self, n=1, lease=None) -> List[Task]:
+        """Réserve jusqu'à n tâches pour lease secondes (par défaut self.lease)"""
+        with self._lock:
+            expired = self._expired()
+        self._requeue(expired)
+        lease = self.lease if lease is None else lease
+        claimed = []
+        with self._lock:
+            expiry = self.clock() + lease
+            while len(claimed) < n:
+                task = self._pop()
+                if task is None:
+                    break
+                self._leases[task._key] = (expiry, task)
+                heapq.heappush(self._lease_heap, (expiry, next(self._counter), task._key))
+                claimed.append(task)
+        for task in claimed:
+            task.status = Status.IN_PROGRESS
+        return claimed
+
+    def _take_lease(self, task_id):
+        with self._lock:
+            lease = self._leases.pop(id_key(task_id), None)
+        if lease is None:
+            raise ValueError(f"Aucune réservation en cours pour la tâche {task_id}")
+        return lease[1]
+
+    def release(self, task_id):
+        """Rend une tâche réservée : elle retourne dans la file"""
+        self._requeue([self._take_lease(task_id)])
+
+    def complete(self, task_id):
+        """Termine une tâche réservée"""
+        self._take_lease(task_id).mark_completed()
+
+    def leased(self) -> List[Task]:
+        """Tâches actuellement réservées"""
+        with self._lock:
+            return [task for _, task in self._leases.values()]
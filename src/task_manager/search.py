@@ -0,0 +1,202 @@
+import heapq
+import re
+import unicodedata
+from bisect import bisect_left, insort
+from math import log
+from operator import itemgetter
+
+_WORD = re.compile(r"\w+")
+# Poids d'une occurrence selon le champ
+TITLE_WEIGHT = 2
+DESCRIPTION_WEIGHT = 1
+
+def fold(text):
+    """Minuscules sans accents : "Tâche" -> "tache" """
+    if text.isascii():
+        return text.lower()
+    decomposed = unicodedata.normalize("NFKD", text)
+    return "".join(c for c in decomposed if not unicodedata.combining(c)).casefold()
+
+def tokenize(text):
+    return _WORD.findall(fold(text)) if text else []
+
+class SearchIndex:
+    """Index inversé plein texte des titres et descriptions
+
+    Chaque terme (minuscule, sans accents) pointe vers {clé de tâche: poids},
+    le poids comptant double pour le titre. Une requête est l'intersection de
+    ses termes, le dernier étant traité comme un préfixe (saisie en cours) via
+    une recherche dichotomique dans le vocabulaire trié. Les résultats sont
+    classés par somme des poids pondérés par la rareté du terme (idf).
+
+    Le vocabulaire reste trié au fil des ajouts (insertion dichotomique) ; les
+    termes devenus vides y restent jusqu'à ce qu'ils soient réutilisés ou
+    qu'ils en représentent la moitié, et sont ignorés par la recherche.
+    """
+
+    def __init__(self):
+        self.postings = {}
+        self._documents = {}
+        self._vocabulary = []
+        # Termes du vocabulaire sans plus aucune tâche
+        self._stale = set()
+
+    def __len__(self):
+        return len(self._documents)
+
+    @staticmethod
+    def _weights(task):
+        weights = {}
+        for token in tokenize(task.title):
+            weights[token] = weights.get(token, 0) + TITLE_WEIGHT
+        for token in tokenize(task.description):
+            weights[token] = weights.get(token, 0) + DESCRIPTION_WEIGHT
+        return weights
+
+    def _index(self, task, created):
+        key = task._key
+        weights = self._weights(task)
+        self._documents[key] = weights
+        postings = self.postings
+        for token, weight in weights.items():
+            bucket = postings.get(token)
+            if bucket is None:
+                bucket = postings[token] = {}
+                if token in self._stale:
+                    self._stale.discard(token)
+                else:
+                    created.append(token)
+            bucket[key] = weight
+
+    def add(self, task):
+        created = []
+        self._index(task, created)
+        for token in created:
+            insort(self._vocabulary, token)
+
+    def add_many(self, tasks):
+        """Indexe un lot de tâches, le vocabulaire étant trié une seule fois"""
+        created = []
+        for task in tasks:
+            self._index(task, created)
+        if created:
+            # Tri d'une suite triée suivie des nouveaux termes : O(n + k log k)
+            self._vocabulary.extend(created)
+            self._vocabulary.sort()
+
+    def remove(self, task):
+        key = task._key
+        weights = self._documents.pop(key, None)
+        if weights is None:
+            return
+        postings = self.postings
+        for token in weights:
+            bucket = postings[token]
+            del bucket[key]
+            if not bucket:
+                del postings[token]
+                self._stale.add(token)
+        if len(self._stale) > len(self._vocabulary) // 2 + 64:
+            stale = self._stale
+            self._vocabulary = [token for token in self._vocabulary if token not in stale]
+            self._stale = set()
+
+    def update(self, task):
+        if task._key in self._documents:
+            self.remove(task)
+            self.add(task)
+
+    def clear(self):
+        self.postings = {}
+        self._documents = {}
+        self._vocabulary = []
+        self._stale = set()
+
+    def _expand(self, prefix):
+        """Termes du vocabulaire commençant par prefix"""
+        vocabulary = self._vocabulary
+        postings = self.postings
+        tokens = []
+        for i in range(bisect_left(vocabulary, prefix), len(vocabulary)):
+            token = vocabulary[i]
+            if not token.startswith(prefix):
+                break
+            if token in postings:
+                tokens.append(token)
+        return tokens
+
+    def search(self, query, limit=None, within=None):
+        """Clés des tâches correspondant à la requête, de la plus pertinente à la moins pertinente
+
+        ``within`` (conteneur de clés, ex. un seau d'index de statut) restreint
+        les résultats. Seul le terme le plus sélectif (ou within) est parcouru
+        dans l'index inversé ; les autres termes sont vérifiés sur les termes
+        de chaque candidat.
+        """
+        terms = tokenize(query)
+        if not terms:
+            return []
+        postings = self.postings
+        total = len(self._documents)
+        idfs = {}
+
+        def idf(token):
+            value = idfs.get(token)
+            if value is None:
+                value = idfs[token] = log(1 + total / len(postings[token]))
+            return value
+
+        # (taille des listes, terme, expansions) ; le dernier terme est un préfixe
+        groups = []
+        last = len(terms) - 1
+        for i, term in enumerate(terms):
+            tokens = self._expand(term) if i == last else [term] if term in postings else []
+            if not tokens:
+                return []
+            groups.append((sum(len(postings[token]) for token in tokens), i, term, tokens))
+        groups.sort()
+        if within is not None and len(within) < groups[0][0]:
+            candidates, first, others = within, None, groups
+        else:
+            candidates = first = self._merge(groups[0][3], idf)
+            others, within = groups[1:], None
+        documents = self._documents
+        scores = []
+        for key in candidates:
+            if within is not None and key not in within:
+                continue
+            score = first[key] if first is not None else 0.0
+            document = documents[key]
+            for _, i, term, _ in others:
+                if i != last:
+                    weight = document.get(term)
+                    best = weight * idf(term) if weight is not None else 0.0
+                else:
+                    best = max((weight * idf(token) for token, weight in document.items()
+                                if token.startswith(term)), default=0.0)
+                if not best:
+                    break
+                score += best
+            else:
+                scores.append((score, key))
+        if limit is not None:
+            best = heapq.nlargest(limit, scores, key=itemgetter(0))
+        else:
+            best = sorted(scores, key=itemgetter(0), reverse=True)
+        return [key for _, key in best]
+
+    def _merge(self, tokens, idf):
+        """{clé: meilleur score} d'un terme, fusionnant ses expansions de préfixe"""
+        postings = self.postings
+        if len(tokens) == 1:
+            token = tokens[0]
+            value = idf(token)
+            return {key: weight * value for key, weight in postings[token].items()}
+        scores = {}
+        for token in tokens:
+            value = idf(token)
+            for key, weight in postings[token].items():
+                weighted = weight * value
+                if weighted > scores.get(key, 0.0):
+                    scores[key] = weighted
+        return scores
@@ -1,13 +1,145 @@
+import gzip
 import smtplib
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from datetime import datetime
+from email.message import EmailMessage
+from itertools import islice
+from operator import attrgetter
 import csv
+from .columnar import ColumnarTaskStore
+from .reports import bucket_tasks, period_reports
+
+class RateLimiter:
+    """Seau à jetons : au plus ``rate`` envois par seconde (rafales jusqu'à ``burst``)"""
+
+    def __init__(self, rate, burst=None):
+        self.rate = rate
+        self.burst = burst or max(1, int(rate))
+        self._tokens = self.burst
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+# Refus d'un message donné, la session SMTP restant utilisable (sauf 421)
+PER_MESSAGE_ERRORS = (smtplib.SMTPRecipientsRefused, smtplib.SMTPSenderRefused, smtplib.SMTPDataError)
+
+def _smtp_codes(error):
+    """Codes SMTP d'une erreur : un par destinataire refusé pour SMTPRecipientsRefused"""
+    if isinstance(error, smtplib.SMTPRecipientsRefused):
+        return [code for code, _ in error.recipients.values()]
+    code = getattr(error, "smtp_code", None)
+    return [] if code is None else [code]
+
+class SMTPConnectionPool:
+    """Pool borné de connexions SMTP réutilisables
+
+    Au plus ``size`` connexions ouvertes ; elles sont créées à la demande et
+    rendues au pool après usage. Une connexion ayant levé une erreur est fermée
+    au lieu d'être réutilisée, sauf pour les refus propres à un message
+    (destinataire, expéditeur, contenu) : smtplib a déjà réinitialisé la
+    session (RSET) et la connexion reste saine.
+    """
+
+    def __init__(self, host, port, size=4, timeout=10, starttls=False, credentials=None):
+        self.host = host
+        self.port = port
+        self.timeout = timeout
+        self.starttls = starttls
+        self.credentials = credentials
+        self._slots = threading.BoundedSemaphore(size)
+        self._idle = []
+        self._lock = threading.Lock()
+        self.opened = 0
+
+    def _connect(self):
+        connection = smtplib.SMTP(self.host, self.port, timeout=self.timeout)
+        try:
+            if self.starttls:
+                connection.starttls()
+            if self.credentials:
+                connection.login(*self.credentials)
+        except Exception:
+            self._discard(connection)
+            raise
+        self.opened += 1
+        return connection
+
+    @staticmethod
+    def _discard(connection):
+        try:
+            connection.quit()
+        except Exception:
+            connection.close()
+
+    @contextmanager
+    def connection(self):
+        with self._slots:
+            with self._lock:
+                connection = self._idle.pop() if self._idle else None
+            if connection is None:
+                connection = self._connect()
+            try:
+                yield connection
+            except PER_MESSAGE_ERRORS as e:
+                # 421 : le serveur ferme la session, smtplib aussi
+                if 421 in _smtp_codes(e) or connection.sock is None:
+                    self._discard(connection)
+                else:
+                    with self._lock:
+                        self._idle.append(connection)
+                raise
+            except Exception:
+                self._discard(connection)
+                raise
+            with self._lock:
+                self._idle.append(connection)
+
+    def close(self):
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for connection in idle:
+            self._discard(connection)
+
+def _is_permanent(error):
+    """Erreur SMTP définitive (5xx, pour tous les destinataires refusés) : inutile de réessayer"""
+    codes = _smtp_codes(error)
+    return bool(codes) and all(500 <= code < 600 for code in codes)
 
 class EmailService:
-    """Service d'envoi d'emails (à mocker dans les tests)"""
+    """Service d'envoi d'emails (à mocker dans les tests)
 
-    def __init__(self, smtp_server="smtp.gmail.com", port=587):
+    Les méthodes unitaires simulent l'envoi. ``send_reminders`` envoie
+    réellement un lot : connexions SMTP réutilisées (pool borné à
+    ``pool_size``), envois en parallèle, débit limité à ``rate_limit``
+    messages par seconde vers le serveur et nouvelles tentatives avec
+    attente exponentielle sur les erreurs temporaires.
+    """
+
+    def __init__(self, smtp_server="smtp.gmail.com", port=587, sender="noreply@taskmanager.local",
+                 pool_size=4, rate_limit=None, max_retries=3, backoff=0.5, timeout=10,
+                 starttls=False, credentials=None):
         self.smtp_server = smtp_server
         self.port = port
+        self.sender = sender
+        self.pool_size = pool_size
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.rate_limiter = RateLimiter(rate_limit) if rate_limit else None
+        self.pool = SMTPConnectionPool(smtp_server, port, pool_size, timeout, starttls, credentials)
 
     def send_task_reminder(self, email, task_title, due_date):
         if not isinstance(email, str) or "@" not in email:
@@ -21,11 +153,97 @@ class EmailService:
         # Simulation d'envoi
         return True
 
+    def reminder_message(self, email, task_title, due_date):
+        message = EmailMessage()
+        message["From"] = self.sender
+        message["To"] = email
+        message["Subject"] = f"Rappel : {task_title}"
+        due = due_date.strftime("%d/%m/%Y %H:%M") if isinstance(due_date, datetime) else due_date
+        message.set_content(f"La tâche « {task_title} » arrive à échéance le {due}.")
+        return message
+
+    def completion_message(self, email, task_title):
+        message = EmailMessage()
+        message["From"] = self.sender
+        message["To"] = email
+        message["Subject"] = f"Tâche terminée : {task_title}"
+        message.set_content(f"La tâche « {task_title} » est terminée.")
+        return message
+
+    def send_reminders(self, batch):
+        """Envoie un lot de rappels (email, task_title, due_date)
+
+        Les lignes invalides ou en échec sont signalées sans interrompre le
+        lot. Retourne (nombre d'emails envoyés, erreurs [(index, message)]).
+        """
+        return self._send_rows(batch, self.reminder_message)
+
+    def send_completion_notifications(self, batch):
+        """Envoie un lot de notifications de fin (email, task_title) ; même retour que send_reminders"""
+        return self._send_rows(batch, self.completion_message)
+
+    def _send_rows(self, batch, build):
+        """Construit un message par ligne (email, *champs) via build puis envoie le lot"""
+        messages = []
+        errors = []
+        for index, item in enumerate(batch):
+            try:
+                email, *fields = item
+            except (TypeError, ValueError) as e:
+                errors.append((index, f"Ligne invalide : {e!r}"))
+                continue
+            if not isinstance(email, str) or "@" not in email:
+                errors.append((index, "Email invalide"))
+                continue
+            try:
+                message = build(email, *fields)
+            except TypeError as e:
+                errors.append((index, f"Ligne invalide : {e!r}"))
+                continue
+            messages.append((index, message))
+        return self._send_batch(messages, errors)
+
+    def _send_batch(self, messages, errors):
+        sent = 0
+        if messages:
+            with ThreadPoolExecutor(max_workers=min(self.pool_size, len(messages))) as executor:
+                results = executor.map(self._send_with_retry, (message for _, message in messages))
+                for (index, _), error in zip(messages, results):
+                    if error is None:
+                        sent += 1
+                    else:
+                        errors.append((index, error))
+        errors.sort()
+        return sent, errors
+
+    def _send_with_retry(self, message):
+        """Envoie un message ; retourne None ou le message de la dernière erreur"""
+        attempt = 0
+        while True:
+            if self.rate_limiter is not None:
+                self.rate_limiter.acquire()
+            try:
+                with self.pool.connection() as connection:
+                    connection.send_message(message)
+                return None
+            except (smtplib.SMTPException, OSError) as e:
+                if _is_permanent(e) or attempt >= self.max_retries:
+                    return f"Échec de l'envoi : {e}"
+            time.sleep(self.backoff * 2 ** attempt)
+            attempt += 1
+
+    def close(self):
+        """Ferme les connexions SMTP du pool"""
+        self.pool.close()
+
 class ReportService:
     """Service de génération de rapports"""
 
     def generate_daily_report(self, tasks, date=None):
+        """tasks est une liste de tâches ou un ColumnarTaskStore (agrégats calculés par colonnes)"""
         date = date or datetime.now()
+        if isinstance(tasks, ColumnarTaskStore):
+            return tasks.daily_report(date)
         total = len(tasks)
         completed = len([t for t in tasks if getattr(t, 'status', None) and t.status.name == 'DONE'])
         by_priority = {}
@@ -40,13 +258,73 @@ class ReportService:
             "by_priority": by_priority
         }
 
-    def export_tasks_csv(self, tasks, filename):
+    def generate_period_reports(self, tasks, period="day", start=None, end=None, cache=None):
+        """Rapports par jour, semaine ou mois calculés en un seul passage sur les tâches
+
+        Chaque rapport donne les tâches créées (et leur répartition par
+        priorité), terminées, le débit (terminées par jour) et les percentiles
+        du délai de traitement en secondes. Sans start/end la série couvre de
+        la première à la dernière période active. Un ``ReportCache`` évite de
+        recalculer les périodes closes lors des appels suivants.
+        """
+        if cache is not None:
+            if cache.period != period:
+                raise ValueError("Le cache a été calculé pour une autre période")
+            buckets = cache.refresh(tasks)
+        else:
+            buckets = bucket_tasks(tasks, period)
+        return period_reports(buckets, period, start, end)
+
+    def export_tasks_csv(self, tasks, filename, columns=None, compress=False, progress=None, chunk_size=1000):
+        """Exporte en flux les tâches de n'importe quel itérable (liste, générateur du stockage...)
+
+        ``columns`` restreint et ordonne les colonnes (par défaut CSV_COLUMNS),
+        ``compress=True`` écrit un fichier gzip et ``progress(n)`` est appelé
+        après chaque bloc de ``chunk_size`` lignes avec le nombre de lignes
+        écrites. La mémoire utilisée ne dépend pas du nombre de tâches.
+        Retourne le nombre de lignes écrites.
+        """
+        columns = list(columns) if columns is not None else CSV_COLUMNS
+        unknown = [column for column in columns if column not in _CSV_GETTERS]
+        if unknown:
+            raise ValueError(f"Colonnes inconnues : {', '.join(unknown)}")
+        getters = [_CSV_GETTERS[column] for column in columns]
+        written = 0
         try:
-            with open(filename, "w", newline="") as csvfile:
-                fieldnames = ["id", "title", "description", "priority", "created_at", "status", "project_id", "completed_at"]
-                writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-                writer.writeheader()
-                for t in tasks:
-                    writer.writerow(t.to_dict())
+            if compress:
+                csvfile = gzip.open(filename, "wt", newline="")
+            else:
+                csvfile = open(filename, "w", newline="")
+            with csvfile:
+                writer = csv.writer(csvfile)
+                writer.writerow(columns)
+                iterator = iter(tasks)
+                while True:
+                    chunk = [[get(t) for get in getters] for t in islice(iterator, chunk_size)]
+                    if not chunk:
+                        break
+                    writer.writerows(chunk)
+                    written += len(chunk)
+                    if progress is not None:
+                        progress(written)
         except Exception as e:
-            raise IOError(f"Erreur lors de l'export CSV : {e}") 
\ No newline at end of file
+            raise IOError(f"Erreur lors de l'export CSV : {e}")
+        return written
+
+def _isoformat(value):
+    return value.isoformat() if value else None
+
+# Colonne -> valeur de la cellule (mêmes valeurs que Task.to_dict)
+_CSV_GETTERS = {
+    "id": attrgetter("id"),
+    "title": attrgetter("title"),
+    "description": attrgetter("description"),
+    "priority": attrgetter("priority.name"),
+    "created_at": lambda t: t.created_at.isoformat(),
+    "status": attrgetter("status.name"),
+    "project_id": attrgetter("project_id"),
+    "completed_at": lambda t: _isoformat(t.completed_at),
+    "due_date": lambda t: _isoformat(t.due_date),
+    "assignee_email": attrgetter("assignee_email"),
+}
+CSV_COLUMNS = list(_CSV_GETTERS)
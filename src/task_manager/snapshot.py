@@ -0,0 +1,185 @@
+from itertools import chain
+from .task import id_key
+
+# Trie à 32 branches : 5 bits de l'emplacement par niveau
+BITS = 5
+WIDTH = 1 << BITS
+MASK = WIDTH - 1
+
+class _Node:
+    __slots__ = ("items", "owner")
+
+    def __init__(self, items, owner):
+        self.items = items
+        self.owner = owner
+
+def _leaves(node, shift):
+    if shift == 0:
+        yield node.items
+        return
+    for child in node.items:
+        yield from _leaves(child, shift - BITS)
+
+def _lookup(root, shift, slot):
+    node = root
+    while shift:
+        node = node.items[(slot >> shift) & MASK]
+        shift -= BITS
+    return node.items[slot & MASK]
+
+class TaskSnapshot:
+    """Vue immuable des tâches à un instant donné (TaskRecord, ordre d'insertion)
+
+    Se lit comme le dict clé -> tâche attendu par les backends (``values``,
+    ``get``, ``[clé]``) et comme une liste de tâches par les rapports et
+    l'export CSV (``len``, itération). Les modifications ultérieures du
+    gestionnaire ne sont pas visibles.
+    """
+
+    __slots__ = ("_root", "_shift", "_count", "_size", "_slots")
+
+    def __init__(self, root, shift, count, size, slots):
+        self._root = root
+        self._shift = shift
+        self._count = count
+        self._size = size
+        self._slots = slots
+
+    def __len__(self):
+        return self._size
+
+    def __iter__(self):
+        # Emplacements vides (tâches supprimées) : None, écartés par filter
+        return filter(None, chain.from_iterable(_leaves(self._root, self._shift)))
+
+    def values(self):
+        return iter(self)
+
+    def keys(self):
+        return (record.key for record in self)
+
+    def items(self):
+        return ((record.key, record) for record in self)
+
+    def get(self, task_id, default=None):
+        """TaskRecord d'un identifiant (ou d'une clé compacte) tel qu'il était à l'instant du snapshot"""
+        slots = self._slots
+        # Clé compacte (backends) ou identifiant (appelants)
+        slot = slots.get(task_id)
+        if slot is None:
+            slot = slots.get(id_key(task_id))
+        # Emplacement attribué après le snapshot : tâche absente de cette version
+        if slot is None or slot >= self._count:
+            return default
+        record = _lookup(self._root, self._shift, slot)
+        return record if record is not None else default
+
+    def __getitem__(self, task_id):
+        record = self.get(task_id)
+        if record is None:
+            raise KeyError(task_id)
+        return record
+
+    def __contains__(self, task_id):
+        return self.get(task_id) is not None
+
+class VersionedStore:
+    """Copies immuables des tâches dans un vecteur persistant (copie sur écriture)
+
+    Chaque tâche occupe un emplacement (ordre d'insertion) d'un trie à 32
+    branches. ``snapshot()`` fige l'état courant en O(1) : les écritures
+    suivantes recopient seulement le chemin du trie qu'elles touchent
+    (O(log32 n)), les nœuds inchangés restant partagés entre les versions.
+    Entre deux snapshots les nœuds déjà recopiés sont modifiés sur place.
+
+    L'index clé -> emplacement est partagé par les versions : un emplacement
+    n'est jamais réattribué à une autre tâche. Quand les emplacements vides
+    dominent, le vecteur est reconstruit avec un nouvel index.
+    """
+
+    def __init__(self, tasks=()):
+        self._build([task.snapshot() for task in tasks])
+
+    def _build(self, records):
+        """Construit le trie niveau par niveau à partir des enregistrements, en O(n)"""
+        owner = self._owner = object()
+        level = [_Node(records[i:i + WIDTH], owner) for i in range(0, len(records), WIDTH)]
+        shift = 0
+        while len(level) > 1:
+            level = [_Node(level[i:i + WIDTH], owner) for i in range(0, len(level), WIDTH)]
+            shift += BITS
+        self._root = level[0] if level else _Node([], owner)
+        self._shift = shift
+        self._count = self._size = len(records)
+        # Nouvel objet : les snapshots existants gardent l'index de leur version
+        self._slots = {record.key: slot for slot, record in enumerate(records)}
+
+    def __len__(self):
+        return self._size
+
+    def _editable(self, node):
+        if node.owner is self._owner:
+            return node
+        return _Node(list(node.items), self._owner)
+
+    def _path(self, slot):
+        """Feuille (modifiable) contenant slot, en recopiant au besoin les nœuds du chemin"""
+        node = self._root = self._editable(self._root)
+        shift = self._shift
+        while shift:
+            index = (slot >> shift) & MASK
+            items = node.items
+            if index == len(items):
+                child = _Node([], self._owner)
+                items.append(child)
+            else:
+                child = items[index] = self._editable(items[index])
+            node = child
+            shift -= BITS
+        return node
+
+    def _set(self, slot, record):
+        self._path(slot).items[slot & MASK] = record
+
+    def add(self, task):
+        self._put(task._key, task.snapshot())
+
+    def _put(self, key, record):
+        slot = self._slots.get(key)
+        if slot is not None:
+            # Tâche réinsérée : elle reprend son emplacement
+            if _lookup(self._root, self._shift, slot) is None:
+                self._size += 1
+            self._set(slot, record)
+            return
+        slot = self._count
+        if slot == WIDTH << self._shift:
+            # Trie plein : nouvelle racine d'un niveau de plus
+            self._root = _Node([self._root], self._owner)
+            self._shift += BITS
+        self._path(slot).items.append(record)
+        self._slots[key] = slot
+        self._count += 1
+        self._size += 1
+
+    def update(self, task):
+        slot = self._slots.get(task._key)
+        if slot is not None:
+            self._set(slot, task.snapshot())
+
+    def remove(self, task):
+        slot = self._slots.get(task._key)
+        if slot is None or _lookup(self._root, self._shift, slot) is None:
+            return
+        self._set(slot, None)
+        self._size -= 1
+        if self._count - self._size > self._size + WIDTH * WIDTH:
+            self._compact()
+
+    def _compact(self):
+        self._build(list(self.snapshot()))
+
+    def snapshot(self):
+        """Fige l'état courant en O(1) et le retourne (TaskSnapshot)"""
+        self._owner = object()
+        return TaskSnapshot(self._root, self._shift, self._count, self._size, self._slots)
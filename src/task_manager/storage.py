@@ -0,0 +1,795 @@
+import json
+import mmap
+import os
+import re
+import sqlite3
+from array import array
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from itertools import compress
+from urllib.parse import quote, unquote
+from .task import Task, Priority, Status, format_id, id_key, intern_value
+from .codec import READABLE, encode_tasks, decode_tasks
+from .project import Project
+
+def _fsync_directory(path):
+    """Rend durable le renommage d'un fichier dans son répertoire"""
+    try:
+        fd = os.open(os.path.dirname(os.path.abspath(path)), os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+class StorageBackend:
+    """Interface des backends de persistance de TaskManager
+
+    Un backend résident (``resident = True``) fournit ``load()`` et
+    ``save(tasks, changes)`` : le gestionnaire garde les tâches en mémoire.
+    Un backend non résident garde les données lui-même et fournit en plus
+    ``get``, ``insert``, ``update``, ``delete``, ``clear``, ``find`` et
+    ``statistics``.
+    """
+
+    resident = True
+    # Le backend exploite le détail des changements passé à save()
+    incremental = False
+    # Le backend persiste aussi les projets (load_projects / save_projects)
+    stores_projects = False
+    # Le backend sait charger et sauvegarder un projet seul (load_shard / save_shard)
+    partitioned = False
+
+    def load(self):
+        """Retourne un itérable des tâches persistées"""
+        raise NotImplementedError
+
+    def save(self, tasks, changes):
+        """Persiste tasks (dict clé -> Task) ; changes vaut {clé: "add"|"update"|"delete"} ou None"""
+        raise NotImplementedError
+
+class JsonFileStorage(StorageBackend):
+    """Backend par défaut : un tableau JSON réécrit entièrement à chaque sauvegarde
+
+    Le format dépend du sérialiseur (voir codec.get_codec) ; par défaut le
+    format lisible historique (indent=2).
+    """
+
+    def __init__(self, path, codec=READABLE):
+        self.path = path
+        self.codec = codec
+
+    def load(self):
+        try:
+            return self.codec.load(self.path)
+        except FileNotFoundError:
+            return []
+
+    def save(self, tasks, changes):
+        self.codec.dump(tasks.values(), self.path)
+
+class JournalStorage(StorageBackend):
+    """Stockage incrémental : snapshot JSON Lines + journal append-only des modifications
+
+    Chaque sauvegarde n'ajoute au journal que les tâches ajoutées, modifiées ou
+    supprimées depuis la précédente ; le journal est fusionné dans le snapshot
+    (compaction) dès qu'il dépasse ``compact_every`` enregistrements.
+
+    Chaque compaction incrémente une génération, écrite en tête du snapshot
+    et dans chaque enregistrement du journal : au rejeu, les enregistrements
+    d'une génération antérieure au snapshot (journal non vidé après un crash)
+    sont ignorés.
+
+    Sans ``load()`` préalable, les changements sauvegardés s'ajoutent au
+    contenu existant : une compaction rejoue alors d'abord le snapshot et le
+    journal sur disque au lieu de les remplacer par les seules tâches en mémoire.
+    """
+
+    incremental = True
+
+    def __init__(self, path, compact_every=1000):
+        self.path = path
+        self.journal_path = path + ".journal"
+        self.compact_every = compact_every
+        self.journal_records = 0
+        self.generation = None
+        # Vrai quand le gestionnaire a chargé le contenu : ses tâches sont alors l'état complet
+        self.loaded = False
+
+    def load(self):
+        """Rejoue snapshot puis journal en streaming et retourne les tâches"""
+        tasks = self._replay()
+        self.loaded = True
+        return tasks.values()
+
+    def _replay(self):
+        tasks = {}
+        self.generation = 0
+        for data in self._read_snapshot():
+            if "generation" in data:
+                self.generation = data["generation"]
+                continue
+            task = Task.from_dict(data)
+            tasks[task._key] = task
+        self.journal_records = 0
+        for record in self._read_journal():
+            if record.get("generation", 0) < self.generation:
+                continue
+            self._apply(tasks, record)
+            self.journal_records += 1
+        return tasks
+
+    def _current_generation(self):
+        if self.generation is None:
+            # Sauvegarde sans chargement préalable : génération lue dans l'en-tête du snapshot
+            self.generation = 0
+            for data in self._read_snapshot():
+                self.generation = data.get("generation", 0)
+                break
+        return self.generation
+
+    def save(self, tasks, changes):
+        """Persiste les changements {clé: "add"|"update"|"delete"} ; tasks est le dict clé -> Task"""
+        if changes is None or self.journal_records + len(changes) >= self.compact_every:
+            if changes is not None and not self.loaded:
+                # Jamais chargé : les changements s'appliquent au contenu sur disque
+                current = self._replay()
+                for key, op in changes.items():
+                    if op == "delete":
+                        current.pop(key, None)
+                    else:
+                        current[key] = tasks[key]
+                tasks = current
+            self.compact(tasks.values())
+            return
+        if not changes:
+            return
+        generation = self._current_generation()
+        lines = []
+        for key, op in changes.items():
+            if op == "delete":
+                record = {"op": "delete", "id": format_id(key), "generation": generation}
+            else:
+                record = {"op": op, "task": tasks[key].to_dict(), "generation": generation}
+            lines.append(json.dumps(record))
+        self._append("\n".join(lines) + "\n")
+        self.journal_records += len(lines)
+
+    def compact(self, tasks):
+        """Réécrit le snapshot de façon atomique puis vide le journal"""
+        generation = self._current_generation() + 1
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w") as f:
+            f.write(json.dumps({"generation": generation}))
+            f.write("\n")
+            for task in tasks:
+                f.write(json.dumps(task.to_dict()))
+                f.write("\n")
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.path)
+        _fsync_directory(self.path)
+        # Un crash ici laisse l'ancien journal : sa génération, antérieure au
+        # nouveau snapshot, le fait ignorer au prochain chargement
+        self.generation = generation
+        with open(self.journal_path, "w") as f:
+            f.flush()
+            os.fsync(f.fileno())
+        self.journal_records = 0
+
+    def _append(self, payload):
+        fd = os.open(self.journal_path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        try:
+            os.write(fd, payload.encode("utf-8"))
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+
+    def _read_snapshot(self):
+        try:
+            f = open(self.path, "r")
+        except FileNotFoundError:
+            return
+        with f:
+            first = f.read(1)
+            while first.isspace():
+                first = f.read(1)
+            f.seek(0)
+            if first == "[":
+                # Ancien format : tableau JSON produit par TaskManager.save_to_file
+                yield from json.load(f)
+            else:
+                for line in f:
+                    if line.strip():
+                        yield json.loads(line)
+
+    def _read_journal(self):
+        """Enregistrements du journal ; une dernière ligne tronquée par un crash est retirée du fichier
+
+        Sans cette réparation, le prochain ajout serait écrit à la suite des
+        octets partiels et fusionnerait deux enregistrements en une ligne invalide.
+        """
+        try:
+            f = open(self.journal_path, "rb")
+        except FileNotFoundError:
+            return
+        with f:
+            end = 0
+            for line in f:
+                if not line.endswith(b"\n"):
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        record = None
+                    break
+                end += len(line)
+                if line.strip():
+                    yield json.loads(line)
+            else:
+                return
+        if record is not None:
+            # Enregistrement complet auquel il ne manque que le saut de ligne
+            self._append("\n")
+            yield record
+        else:
+            os.truncate(self.journal_path, end)
+
+    @staticmethod
+    def _apply(tasks, record):
+        if record["op"] == "delete":
+            tasks.pop(id_key(record["id"]), None)
+        else:
+            task = Task.from_dict(record["task"])
+            tasks[task._key] = task
+
+
+class SQLiteStorage(StorageBackend):
+    """Backend non résident SQLite : filtres et statistiques exécutés en SQL
+
+    Les écritures sont faites dans une transaction validée par ``save()``
+    (``TaskManager.save_to_file``) ; ``load()`` annule les écritures non
+    validées.
+    """
+
+    resident = False
+    COLUMNS = ("id", "title", "description", "priority", "created_at", "status", "project_id", "completed_at",
+               "due_date", "assignee_email")
+    QUERYABLE = ("status", "priority", "project_id")
+
+    def __init__(self, path):
+        self.path = path
+        self.connection = sqlite3.connect(path)
+        self.connection.executescript("""
+            CREATE TABLE IF NOT EXISTS tasks (
+                id TEXT PRIMARY KEY,
+                title TEXT NOT NULL,
+                description TEXT,
+                priority TEXT NOT NULL,
+                created_at TEXT NOT NULL,
+                status TEXT NOT NULL,
+                project_id TEXT,
+                completed_at TEXT,
+                due_date TEXT,
+                assignee_email TEXT
+            );
+        """)
+        # Bases créées avant l'ajout des échéances
+        existing = {row[1] for row in self.connection.execute("PRAGMA table_info(tasks)")}
+        for column in ("due_date", "assignee_email"):
+            if column not in existing:
+                self.connection.execute(f"ALTER TABLE tasks ADD COLUMN {column} TEXT")
+        self.connection.executescript("""
+            CREATE INDEX IF NOT EXISTS idx_tasks_status ON tasks(status);
+            CREATE INDEX IF NOT EXISTS idx_tasks_priority ON tasks(priority);
+            CREATE INDEX IF NOT EXISTS idx_tasks_project_id ON tasks(project_id);
+            CREATE INDEX IF NOT EXISTS idx_tasks_created_at ON tasks(created_at);
+            CREATE INDEX IF NOT EXISTS idx_tasks_due_date ON tasks(due_date);
+        """)
+        self._select = f"SELECT {', '.join(self.COLUMNS)} FROM tasks"
+
+    def close(self):
+        self.connection.close()
+
+    @classmethod
+    def _row(cls, task):
+        data = task.to_dict()
+        return tuple(data[column] for column in cls.COLUMNS)
+
+    @classmethod
+    def _task(cls, row):
+        return Task.from_dict(dict(zip(cls.COLUMNS, row)))
+
+    def load(self):
+        self.connection.rollback()
+        return None
+
+    def save(self, tasks, changes):
+        self.connection.commit()
+
+    def insert(self, tasks):
+        """Insertion en masse dans une seule transaction, annulée entièrement en cas d'erreur"""
+        placeholders = ", ".join("?" * len(self.COLUMNS))
+        if not self.connection.in_transaction:
+            self.connection.execute("BEGIN")
+        self.connection.execute("SAVEPOINT bulk_insert")
+        try:
+            self.connection.executemany(
+                f"INSERT INTO tasks ({', '.join(self.COLUMNS)}) VALUES ({placeholders})",
+                (self._row(task) for task in tasks))
+        except Exception:
+            self.connection.execute("ROLLBACK TO bulk_insert")
+            raise
+        finally:
+            self.connection.execute("RELEASE bulk_insert")
+
+    def update(self, task):
+        row = self._row(task)
+        assignments = ", ".join(f"{column} = ?" for column in self.COLUMNS[1:])
+        self.connection.execute(f"UPDATE tasks SET {assignments} WHERE id = ?", row[1:] + row[:1])
+
+    def delete(self, task_id):
+        return self.connection.execute("DELETE FROM tasks WHERE id = ?", (task_id,)).rowcount > 0
+
+    def clear(self):
+        self.connection.execute("DELETE FROM tasks")
+
+    def get(self, task_id):
+        row = self.connection.execute(self._select + " WHERE id = ?", (task_id,)).fetchone()
+        return self._task(row) if row else None
+
+    def find(self, field=None, value=None):
+        """Itère les tâches (dans l'ordre d'insertion) dont field vaut value"""
+        if field is None:
+            cursor = self.connection.execute(self._select + " ORDER BY rowid")
+        elif field not in self.QUERYABLE:
+            raise ValueError(f"Champ non indexé : {field}")
+        elif value is None:
+            cursor = self.connection.execute(f"{self._select} WHERE {field} IS NULL ORDER BY rowid")
+        else:
+            if isinstance(value, (Priority, Status)):
+                value = value.name
+            cursor = self.connection.execute(f"{self._select} WHERE {field} = ? ORDER BY rowid", (value,))
+        for row in cursor:
+            yield self._task(row)
+
+    def count(self):
+        return self.connection.execute("SELECT COUNT(*) FROM tasks").fetchone()[0]
+
+    def statistics(self):
+        tasks_by_priority = {p.name: 0 for p in Priority}
+        tasks_by_status = {s.name: 0 for s in Status}
+        rows = self.connection.execute("SELECT priority, status, COUNT(*) FROM tasks GROUP BY priority, status")
+        for priority, status, count in rows:
+            tasks_by_priority[priority] += count
+            tasks_by_status[status] += count
+        return {
+            "total_tasks": sum(tasks_by_status.values()),
+            "completed_tasks": tasks_by_status[Status.DONE.name],
+            "tasks_by_priority": tasks_by_priority,
+            "tasks_by_status": tasks_by_status
+        }
+
+class LazyFileStorage(StorageBackend):
+    """Backend non résident en lecture paresseuse d'un fichier JSON mappé en mémoire
+
+    Au chargement, un seul passage sur le fichier (``mmap``) construit un index
+    compact : clé -> position de l'enregistrement, plus les codes de statut, de
+    priorité et de projet. Les ``Task`` ne sont construites qu'à l'accès ;
+    ``get``, ``find`` et ``statistics`` fonctionnent sans tout matérialiser.
+    Les modifications restent en mémoire jusqu'à ``save()``, qui réécrit le
+    fichier en recopiant tels quels les enregistrements inchangés.
+
+    Tous les formats écrits par ce paquet sont acceptés (le champ "id" doit
+    être la première clé de chaque enregistrement).
+    """
+
+    resident = False
+    _ID = re.compile(rb'"id":')
+    _RECORD = re.compile(
+        rb'\{\s*"id":\s*"([^"\\]*)",\s*"title":\s*"(?:[^"\\]|\\.)*",\s*"description":\s*"(?:[^"\\]|\\.)*",'
+        rb'\s*"priority":\s*"(\w+)",\s*"created_at":\s*"[^"]*",\s*"status":\s*"(\w+)",'
+        rb'\s*"project_id":\s*(?:"((?:[^"\\]|\\.)*)"|null)')
+    _FIELDS = re.compile(rb'"(id|priority|status|project_id)":\s*(?:"((?:[^"\\]|\\.)*)"|null)')
+    _STATUS_CODES = {status.name.encode(): code for code, status in enumerate(Status)}
+    _PRIORITY_CODES = {priority.name.encode(): code for code, priority in enumerate(Priority)}
+    _STATUSES = list(Status)
+    _PRIORITIES = list(Priority)
+
+    def __init__(self, path):
+        self.path = path
+        self._map = None
+        self._indexed = False
+
+    def close(self):
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+
+    def _reset_index(self):
+        self._rows = {}
+        self.keys = []
+        self.offsets = array("q")
+        self.ends = array("q")
+        self.alive = array("b")
+        self.status = array("b")
+        self.priority = array("b")
+        self.project = array("l")
+        self._project_codes = {None: -1}
+        self._projects = []
+        # Tâches ajoutées ou modifiées depuis le dernier save(), par clé
+        self._dirty = {}
+
+    def load(self):
+        """(Ré)indexe le fichier ; les modifications non sauvegardées sont abandonnées"""
+        self.close()
+        self._reset_index()
+        self._indexed = True
+        try:
+            with open(self.path, "rb") as f:
+                if os.fstat(f.fileno()).st_size:
+                    self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except FileNotFoundError:
+            return None
+        if self._map is not None:
+            self._build_index(self._map)
+        return None
+
+    def _ensure_index(self):
+        if not self._indexed:
+            self.load()
+
+    @staticmethod
+    def _string(raw):
+        return json.loads(b'"' + raw + b'"') if b"\\" in raw else raw.decode("utf-8")
+
+    def _project_code(self, project_id):
+        code = self._project_codes.get(project_id)
+        if code is None:
+            code = self._project_codes[project_id] = len(self._projects)
+            self._projects.append(project_id)
+        return code
+
+    def _build_index(self, data):
+        # Chemin rapide : une seule correspondance par enregistrement écrit par ce paquet
+        self._index_records(data)
+        if len(self.keys) != sum(1 for _ in self._ID.finditer(data)):
+            self._reset_index()
+            self._index_fields(data)
+
+    def _append_row(self, key, start, end, status, priority, project):
+        self._rows[key] = len(self.keys)
+        self.keys.append(key)
+        self.offsets.append(start)
+        self.ends.append(end)
+        self.alive.append(1)
+        self.status.append(status)
+        self.priority.append(priority)
+        self.project.append(project)
+
+    def _index_records(self, data):
+        status_codes, priority_codes = self._STATUS_CODES, self._PRIORITY_CODES
+        string, project_code, append_row = self._string, self._project_code, self._append_row
+        ends = self.ends
+        for match in self._RECORD.finditer(data):
+            start = match.start()
+            if ends:
+                ends[-1] = start
+            raw_id, priority, status, project = match.group(1, 2, 3, 4)
+            append_row(
+                id_key(raw_id.decode("utf-8")), start, len(data),
+                status_codes[status], priority_codes[priority],
+                project_code(intern_value(string(project))) if project is not None else -1)
+
+    def _index_fields(self, data):
+        """Chemin générique : champs repérés un à un, dans n'importe quel ordre après l'id"""
+        status_codes, priority_codes = self._STATUS_CODES, self._PRIORITY_CODES
+        row = -1
+        for match in self._FIELDS.finditer(data):
+            field, value = match.group(1), match.group(2)
+            if field == b"id":
+                start = data.rfind(b"{", 0, match.start())
+                if start < 0 or data[start + 1:match.start()].strip():
+                    raise ValueError(f"Format non supporté pour le chargement paresseux à l'octet {match.start()}")
+                if row >= 0:
+                    self.ends[row] = start
+                row += 1
+                self._append_row(id_key(self._string(value)), start, len(data), 0, 0, -1)
+            elif row < 0:
+                continue
+            elif field == b"status":
+                self.status[row] = status_codes[value]
+            elif field == b"priority":
+                self.priority[row] = priority_codes[value]
+            elif value is not None:
+                self.project[row] = self._project_code(intern_value(self._string(value)))
+
+    def _raw(self, row):
+        """Octets de l'enregistrement stocké à la ligne row"""
+        return self._map[self.offsets[row]:self.ends[row]].rstrip(b" \t\r\n,]")
+
+    def _task(self, row):
+        key = self.keys[row]
+        task = self._dirty.get(key)
+        if task is None:
+            task = Task.from_dict(json.loads(self._raw(row)))
+        return task
+
+    def _live_rows(self, column=None, code=None):
+        if column is None:
+            return compress(range(len(self.keys)), self.alive)
+        return (row for row, value in enumerate(column) if value == code and self.alive[row])
+
+    def get(self, task_id):
+        self._ensure_index()
+        row = self._rows.get(id_key(task_id))
+        return self._task(row) if row is not None else None
+
+    def find(self, field=None, value=None):
+        """Itère (dans l'ordre du fichier) les tâches dont field vaut value"""
+        self._ensure_index()
+        if field is None:
+            rows = self._live_rows()
+        elif field == "status":
+            rows = self._live_rows(self.status, self._STATUSES.index(value))
+        elif field == "priority":
+            rows = self._live_rows(self.priority, self._PRIORITIES.index(value))
+        elif field == "project_id":
+            code = self._project_codes.get(value)
+            rows = self._live_rows(self.project, code) if code is not None else ()
+        else:
+            raise ValueError(f"Champ non indexé : {field}")
+        for row in rows:
+            yield self._task(row)
+
+    def count(self):
+        self._ensure_index()
+        return len(self._rows)
+
+    def statistics(self):
+        self._ensure_index()
+        dead = len(self.keys) - len(self._rows)
+        statuses = Counter(compress(self.status, self.alive) if dead else self.status)
+        priorities = Counter(compress(self.priority, self.alive) if dead else self.priority)
+        tasks_by_status = {s.name: statuses.get(code, 0) for code, s in enumerate(self._STATUSES)}
+        return {
+            "total_tasks": len(self._rows),
+            "completed_tasks": tasks_by_status[Status.DONE.name],
+            "tasks_by_priority": {p.name: priorities.get(code, 0) for code, p in enumerate(self._PRIORITIES)},
+            "tasks_by_status": tasks_by_status
+        }
+
+    def _set_codes(self, row, task):
+        self.status[row] = self._STATUSES.index(task.status)
+        self.priority[row] = self._PRIORITIES.index(task.priority)
+        self.project[row] = self._project_code(task.project_id)
+
+    def insert(self, tasks):
+        self._ensure_index()
+        for task in tasks:
+            row = len(self.keys)
+            self._rows[task._key] = row
+            self.keys.append(task._key)
+            self.offsets.append(-1)
+            self.ends.append(-1)
+            self.alive.append(1)
+            self.status.append(0)
+            self.priority.append(0)
+            self.project.append(-1)
+            self._set_codes(row, task)
+            self._dirty[task._key] = task
+
+    def update(self, task):
+        row = self._rows.get(task._key)
+        if row is None:
+            return
+        self._set_codes(row, task)
+        self._dirty[task._key] = task
+
+    def delete(self, task_id):
+        self._ensure_index()
+        key = id_key(task_id)
+        row = self._rows.pop(key, None)
+        if row is None:
+            return False
+        self.alive[row] = 0
+        self._dirty.pop(key, None)
+        return True
+
+    def clear(self):
+        self._ensure_index()
+        for row in self._rows.values():
+            self.alive[row] = 0
+        self._rows.clear()
+        self._dirty.clear()
+
+    def save(self, tasks, changes):
+        """Réécrit le fichier (un enregistrement par ligne) puis le réindexe"""
+        self._ensure_index()
+        encode = json.JSONEncoder(separators=(",", ":")).encode
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(b"[")
+            separator = b"\n"
+            for row in self._live_rows():
+                task = self._dirty.get(self.keys[row])
+                if task is None:
+                    f.write(separator + self._raw(row))
+                else:
+                    f.write(separator + encode(next(encode_tasks([task]))).encode("utf-8"))
+                separator = b",\n"
+            f.write(b"\n]")
+            f.flush()
+            os.fsync(f.fileno())
+        self.close()
+        os.replace(tmp_path, self.path)
+        _fsync_directory(self.path)
+        self.load()
+
+def _read_shard(codec, path):
+    """Lecture d'un shard (exécutée dans un processus du pool) : enregistrements bruts"""
+    try:
+        return codec.load_records(path)
+    except FileNotFoundError:
+        return []
+
+class ShardedStorage(StorageBackend):
+    """Un fichier JSON par projet dans un répertoire, plus un manifeste des projets
+
+    Les tâches sans projet vont dans ``unassigned.json``, celles d'un projet
+    dans ``project-<id>.json``. Une sauvegarde ne réécrit que les shards des
+    projets touchés depuis la précédente ; ``load_shard``/``save_shard``
+    lisent ou écrivent un seul projet. Avec ``workers`` > 1 le chargement
+    complet lit et analyse les shards en parallèle dans un pool de processus.
+    """
+
+    incremental = True
+    stores_projects = True
+    partitioned = True
+    MANIFEST = "projects.json"
+    UNASSIGNED = "unassigned.json"
+
+    def __init__(self, directory, codec=READABLE, workers=None):
+        self.directory = directory
+        self.codec = codec
+        self.workers = workers
+        # Projet de chaque tâche tel qu'écrit sur disque (shards à réécrire après un déplacement)
+        self._shard_of = {}
+        self._members = {}
+        # Shards contenant encore des tâches déplacées depuis (réécrits au prochain save)
+        self._stale = set()
+
+    @staticmethod
+    def shard_id(project_id):
+        """Identifiant de shard d'un projet : chaîne (un id 42 partage le shard de "42"), None sans projet"""
+        return None if project_id is None else str(project_id)
+
+    def shard_path(self, project_id):
+        if project_id is None:
+            name = self.UNASSIGNED
+        else:
+            name = "project-" + quote(str(project_id), safe="") + ".json"
+        return os.path.join(self.directory, name)
+
+    def _shard_ids(self):
+        """Projets (None : sans projet) ayant un shard sur disque"""
+        try:
+            names = os.listdir(self.directory)
+        except FileNotFoundError:
+            return []
+        ids = []
+        for name in sorted(names):
+            if name == self.UNASSIGNED:
+                ids.append(None)
+            elif name.startswith("project-") and name.endswith(".json"):
+                ids.append(unquote(name[len("project-"):-len(".json")]))
+        return ids
+
+    def load(self):
+        shard_ids = self._shard_ids()
+        paths = [self.shard_path(project_id) for project_id in shard_ids]
+        if self.workers and self.workers > 1 and len(paths) > 1:
+            with ProcessPoolExecutor(self.workers) as pool:
+                shards = list(pool.map(_read_shard, [self.codec] * len(paths), paths))
+        else:
+            shards = [_read_shard(self.codec, path) for path in paths]
+        self._shard_of = {}
+        self._members = {}
+        self._stale = set()
+        tasks = {}
+        for project_id, records in zip(shard_ids, shards):
+            loaded = decode_tasks(records)
+            self._track(project_id, loaded)
+            # Une tâche présente dans deux shards (interruption entre l'écriture
+            # du nouveau shard et l'élagage de l'ancien) n'est gardée qu'une fois
+            tasks.update((task._key, task) for task in loaded)
+        return tasks.values()
+
+    def _track(self, project_id, tasks):
+        shard_of = self._shard_of
+        for key in self._members.pop(project_id, ()):
+            if shard_of.get(key) == project_id:
+                del shard_of[key]
+        self._stale.discard(project_id)
+        members = self._members[project_id] = set()
+        for task in tasks:
+            key = task._key
+            if key in shard_of:
+                # Tâche déplacée : son ancien shard la contient encore sur disque
+                previous = shard_of[key]
+                self._members[previous].discard(key)
+                self._stale.add(previous)
+            shard_of[key] = project_id
+            members.add(key)
+
+    def load_shard(self, project_id):
+        """Tâches d'un seul projet"""
+        project_id = self.shard_id(project_id)
+        tasks = decode_tasks(_read_shard(self.codec, self.shard_path(project_id)))
+        self._track(project_id, tasks)
+        return tasks
+
+    def save(self, tasks, changes):
+        """Réécrit les shards des projets touchés (tous si changes vaut None)"""
+        by_project = {}
+        for task in tasks.values():
+            by_project.setdefault(self.shard_id(task.project_id), []).append(task)
+        if changes is None:
+            dirty = set(by_project) | set(self._shard_ids())
+        else:
+            dirty = set(self._stale)
+            for key in changes:
+                if key in self._shard_of:
+                    dirty.add(self._shard_of[key])
+                task = tasks.get(key)
+                if task is not None:
+                    dirty.add(self.shard_id(task.project_id))
+        # Les anciens shards des tâches déplacées font partie de dirty : réécrits depuis la mémoire
+        for project_id in dirty:
+            self._write_shard(project_id, by_project.get(project_id, []))
+
+    def save_shard(self, project_id, tasks):
+        """Réécrit de façon atomique le shard d'un projet (supprimé s'il est vide)
+
+        Les tâches arrivées d'un autre projet sont ensuite retirées de leur
+        ancien shard, relu depuis le disque : sans cela sa copie périmée
+        pourrait l'emporter au rechargement.
+        """
+        self._write_shard(self.shard_id(project_id), tasks)
+        for previous in list(self._stale):
+            shard_of = self._shard_of
+            kept = [task for task in decode_tasks(_read_shard(self.codec, self.shard_path(previous)))
+                    if shard_of.get(task._key, previous) == previous]
+            self._write_shard(previous, kept)
+
+    def _write_shard(self, project_id, tasks):
+        path = self.shard_path(project_id)
+        if not tasks:
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+        else:
+            os.makedirs(self.directory, exist_ok=True)
+            tmp_path = path + ".tmp"
+            self.codec.dump(tasks, tmp_path)
+            os.replace(tmp_path, path)
+            _fsync_directory(path)
+        self._track(project_id, tasks)
+
+    def load_projects(self):
+        try:
+            with open(os.path.join(self.directory, self.MANIFEST), "r") as f:
+                return [Project.from_dict(data) for data in json.load(f)]
+        except FileNotFoundError:
+            return []
+
+    def save_projects(self, projects):
+        os.makedirs(self.directory, exist_ok=True)
+        path = os.path.join(self.directory, self.MANIFEST)
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump([project.to_dict() for project in projects], f, indent=2)
+        os.replace(tmp_path, path)
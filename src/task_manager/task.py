@@ -1,5 +1,9 @@
+from collections import namedtuple
 from datetime import datetime
 from enum import Enum
+import os
+import re
+import sys
 import time
 import uuid
 
@@ -15,15 +19,92 @@ class Status(Enum):
     DONE = "DONE"
     CANCELLED = "CANCELLED"
 
+# Tables nom -> membre précalculées pour la désérialisation
+PRIORITY_BY_NAME = dict(Priority.__members__)
+STATUS_BY_NAME = dict(Status.__members__)
+
+# Champs dont la modification est signalée aux observateurs (index du gestionnaire)
+OBSERVED_FIELDS = frozenset({"title", "description", "priority", "created_at", "status", "project_id",
+                             "completed_at", "due_date", "assignee_email"})
+
+_CANONICAL_UUID = re.compile(r"[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}")
+
+class _IntId(int):
+    """Identifiant entier donné par l'appelant : jamais égal à une clé UUID compacte"""
+
+    __slots__ = ()
+
+    def __eq__(self, other):
+        return type(other) is _IntId and int.__eq__(self, other)
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __hash__(self):
+        return hash((_IntId, int(self)))
+
+def format_id(key):
+    """Identifiant d'origine d'une clé compacte (voir id_key)"""
+    if type(key) is int:
+        h = "%032x" % key
+        return f"{h[:8]}-{h[8:12]}-{h[12:16]}-{h[16:20]}-{h[20:]}"
+    if type(key) is _IntId:
+        return int(key)
+    return key
+
+def id_key(task_id):
+    """Clé compacte d'un identifiant : entier 128 bits pour un UUID canonique, sinon l'identifiant tel quel
+
+    Un identifiant entier est marqué (_IntId) pour ne pas être pris pour une
+    clé UUID : 42 reste 42 à la relecture.
+    """
+    if type(task_id) is str and _CANONICAL_UUID.fullmatch(task_id):
+        return int(task_id.replace("-", ""), 16)
+    if type(task_id) is int:
+        return _IntId(task_id)
+    return task_id
+
+# Masques de uuid.UUID(version=4) : variante RFC 4122 et numéro de version
+_UUID4_CLEAR = ~((0xc000 << 48) | (0xf000 << 64))
+_UUID4_SET = (0x8000 << 48) | (4 << 76)
+
+def new_keys(count):
+    """Génère count clés uuid4 à partir d'un seul appel à os.urandom"""
+    raw = os.urandom(16 * count)
+    from_bytes = int.from_bytes
+    return [(from_bytes(raw[i:i + 16], "big") & _UUID4_CLEAR) | _UUID4_SET for i in range(0, 16 * count, 16)]
+
+def intern_value(value):
+    """Partage les chaînes répétées (ex. project_id) entre toutes les tâches"""
+    return sys.intern(value) if type(value) is str else value
+
+def _check_due_date(due_date):
+    if due_date is not None and not isinstance(due_date, datetime):
+        raise ValueError("L'échéance doit être une datetime.")
+
+def _check_email(email):
+    if email is not None and (not isinstance(email, str) or "@" not in email):
+        raise ValueError("Email invalide")
+
 class Task:
-    """Une tâche avec toutes ses propriétés"""
+    """Une tâche avec toutes ses propriétés
+
+    La classe utilise ``__slots__`` et stocke l'identifiant sous forme d'entier
+    128 bits (``_key``) : la chaîne UUID n'est formatée qu'à la lecture de ``id``.
+    """
+
+    __slots__ = ("_key", "title", "description", "priority", "created_at", "status",
+                 "project_id", "completed_at", "due_date", "assignee_email", "_observers", "__weakref__")
 
-    def __init__(self, title, description="", priority=Priority.MEDIUM):
+    def __init__(self, title, description="", priority=Priority.MEDIUM, due_date=None, assignee_email=None):
         if not title or not isinstance(title, str):
             raise ValueError("Le titre de la tâche ne peut pas être vide.")
         if not isinstance(priority, Priority):
             raise ValueError("La priorité doit être une instance de Priority.")
-        self.id = str(uuid.uuid4())
+        _check_due_date(due_date)
+        _check_email(assignee_email)
+        object.__setattr__(self, "_observers", None)
+        self._key = uuid.uuid4().int
         self.title = title
         self.description = description
         self.priority = priority
@@ -31,10 +112,54 @@ class Task:
         self.status = Status.TODO
         self.project_id = None
         self.completed_at = None
+        self.due_date = due_date
+        self.assignee_email = intern_value(assignee_email)
+
+    def __setattr__(self, name, value):
+        # Slot absent tant que _restore ou __init__ ne l'a pas posé
+        observers = getattr(self, "_observers", None)
+        if observers and name in OBSERVED_FIELDS:
+            old = getattr(self, name)
+            object.__setattr__(self, name, value)
+            if old is not value:
+                for callback in observers:
+                    callback(self, name, old, value)
+        else:
+            object.__setattr__(self, name, value)
+
+    def __reduce__(self):
+        # Copie et pickle sans les observateurs : une tâche suivie n'emporte pas son gestionnaire
+        return (type(self)._restore, tuple(self.snapshot()))
+
+    @property
+    def id(self):
+        return format_id(self._key)
+
+    @id.setter
+    def id(self, value):
+        self._key = id_key(value)
+
+    def add_observer(self, callback):
+        """Enregistre callback(task, champ, ancienne, nouvelle) appelé à chaque modification"""
+        # Tuple immuable : peut être partagé entre toutes les tâches d'un gestionnaire
+        self._observers = (self._observers or ()) + (callback,)
+
+    def remove_observer(self, callback):
+        observers = self._observers
+        if observers and callback in observers:
+            index = observers.index(callback)
+            self._observers = observers[:index] + observers[index + 1:]
 
     def mark_completed(self):
+        # Date posée avant le statut : le passage à DONE est publié avec completed_at renseigné
+        old = self.completed_at
+        completed_at = datetime.now()
+        object.__setattr__(self, "completed_at", completed_at)
         self.status = Status.DONE
-        self.completed_at = datetime.now()
+        observers = self._observers
+        if observers:
+            for callback in observers:
+                callback(self, "completed_at", old, completed_at)
 
     def update_priority(self, new_priority):
         if not isinstance(new_priority, Priority):
@@ -42,7 +167,20 @@ class Task:
         self.priority = new_priority
 
     def assign_to_project(self, project_id):
-        self.project_id = project_id
+        self.project_id = intern_value(project_id)
+
+    def set_due_date(self, due_date):
+        _check_due_date(due_date)
+        self.due_date = due_date
+
+    def assign_to(self, email):
+        _check_email(email)
+        self.assignee_email = intern_value(email)
+
+    def snapshot(self):
+        """Copie immuable des champs de la tâche (TaskRecord)"""
+        return TaskRecord(self._key, self.title, self.description, self.priority, self.created_at,
+                          self.status, self.project_id, self.completed_at, self.due_date, self.assignee_email)
 
     def to_dict(self):
         return {
@@ -53,20 +191,80 @@ class Task:
             "created_at": self.created_at.isoformat(),
             "status": self.status.name,
             "project_id": self.project_id,
-            "completed_at": self.completed_at.isoformat() if self.completed_at else None
+            "completed_at": self.completed_at.isoformat() if self.completed_at else None,
+            "due_date": self.due_date.isoformat() if self.due_date else None,
+            "assignee_email": self.assignee_email
         }
 
+    @classmethod
+    def _restore(cls, key, title, description, priority, created_at, status, project_id, completed_at,
+                 due_date=None, assignee_email=None, observers=None):
+        """Construit une tâche sans passer par __init__ ni par les observateurs"""
+        task = cls.__new__(cls)
+        setattr_ = object.__setattr__
+        setattr_(task, "_observers", observers)
+        setattr_(task, "_key", key)
+        setattr_(task, "title", title)
+        setattr_(task, "description", description)
+        setattr_(task, "priority", priority)
+        setattr_(task, "created_at", created_at)
+        setattr_(task, "status", status)
+        setattr_(task, "project_id", project_id)
+        setattr_(task, "completed_at", completed_at)
+        setattr_(task, "due_date", due_date)
+        setattr_(task, "assignee_email", assignee_email)
+        return task
+
     @classmethod
     def from_dict(cls, data):
-        task = cls(
-            title=data["title"],
-            description=data.get("description", ""),
-            priority=Priority[data["priority"]]
+        title = data["title"]
+        if not title or not isinstance(title, str):
+            raise ValueError("Le titre de la tâche ne peut pas être vide.")
+        completed_at = data.get("completed_at")
+        due_date = data.get("due_date")
+        return cls._restore(
+            id_key(data["id"]),
+            title,
+            data.get("description", ""),
+            PRIORITY_BY_NAME[data["priority"]],
+            datetime.fromisoformat(data["created_at"]),
+            STATUS_BY_NAME[data["status"]],
+            intern_value(data.get("project_id")),
+            datetime.fromisoformat(completed_at) if completed_at else None,
+            datetime.fromisoformat(due_date) if due_date else None,
+            intern_value(data.get("assignee_email"))
         )
-        task.id = data["id"]
-        task.created_at = datetime.fromisoformat(data["created_at"])
-        task.status = Status[data["status"]]
-        task.project_id = data.get("project_id")
-        if data.get("completed_at"):
-            task.completed_at = datetime.fromisoformat(data["completed_at"])
-        return task 
\ No newline at end of file
+
+    @classmethod
+    def from_dicts(cls, items):
+        """Reconstruit des tâches en masse ; retourne (tâches, erreurs [(index, message)])
+
+        Une ligne invalide est signalée dans les erreurs sans interrompre le lot.
+        """
+        tasks = []
+        errors = []
+        from_dict = cls.from_dict
+        for index, data in enumerate(items):
+            try:
+                tasks.append(from_dict(data))
+            except (KeyError, TypeError, ValueError) as e:
+                errors.append((index, f"{type(e).__name__}: {e}"))
+        return tasks, errors
+
+class TaskRecord(namedtuple("TaskRecord", ("key", "title", "description", "priority", "created_at", "status",
+                                           "project_id", "completed_at", "due_date", "assignee_email"),
+                            defaults=(None, None))):
+    """Copie immuable d'une tâche, lisible comme une Task (id, champs, to_dict)"""
+
+    __slots__ = ()
+
+    @property
+    def id(self):
+        return format_id(self.key)
+
+    @property
+    def _key(self):
+        # Même accès que Task._key pour les sérialiseurs et index internes
+        return self.key
+
+    to_dict = Task.to_dict
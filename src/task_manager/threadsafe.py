@@ -0,0 +1,199 @@
+import threading
+from contextlib import contextmanager, ExitStack
+from typing import List, Optional
+from .manager import TaskList, TaskManager
+from .task import Task, Priority, id_key
+
+class RWLock:
+    """Verrou lecteurs/rédacteur : lectures concurrentes, écriture exclusive
+
+    Les rédacteurs en attente sont prioritaires sur les nouveaux lecteurs.
+    Le rédacteur courant peut reprendre le verrou (en lecture ou en écriture).
+    """
+
+    def __init__(self):
+        self._condition = threading.Condition(threading.Lock())
+        self._readers = 0
+        self._writer = None
+        self._writer_depth = 0
+        self._waiting_writers = 0
+
+    @contextmanager
+    def read(self):
+        me = threading.get_ident()
+        with self._condition:
+            if self._writer == me:
+                reentrant = True
+            else:
+                reentrant = False
+                while self._writer is not None or self._waiting_writers:
+                    self._condition.wait()
+                self._readers += 1
+        try:
+            yield
+        finally:
+            if not reentrant:
+                with self._condition:
+                    self._readers -= 1
+                    if not self._readers:
+                        self._condition.notify_all()
+
+    @contextmanager
+    def write(self):
+        me = threading.get_ident()
+        with self._condition:
+            if self._writer == me:
+                self._writer_depth += 1
+            else:
+                self._waiting_writers += 1
+                while self._writer is not None or self._readers:
+                    self._condition.wait()
+                self._waiting_writers -= 1
+                self._writer = me
+                self._writer_depth = 1
+        try:
+            yield
+        finally:
+            with self._condition:
+                self._writer_depth -= 1
+                if not self._writer_depth:
+                    self._writer = None
+                    self._condition.notify_all()
+
+class ConcurrentTaskManager(TaskManager):
+    """TaskManager partageable entre threads
+
+    Les lectures (get_task, filtres, statistiques) se font en parallèle sous
+    le verrou de lecture ; les modifications des index passent par le verrou
+    d'écriture, tenu le temps d'une mise à jour de dict. Les modifications
+    d'une même tâche sont sérialisées par un verrou de shard : utiliser
+    ``editing(task_id)`` pour modifier une tâche partagée entre threads.
+
+    ``save_to_file`` prend un snapshot (copie sur écriture, O(1)) sous verrou
+    puis sérialise et écrit hors verrou : les rédacteurs ne sont bloqués que
+    le temps du snapshot. Seuls les backends résidents sont pris en charge.
+    """
+
+    def __init__(self, storage_file="tasks.json", storage=None, columnar=False, codec=None, shards=64,
+                 verify_statistics=False, searchable=False):
+        if storage is not None and not storage.resident:
+            raise ValueError("ConcurrentTaskManager requiert un backend résident")
+        self._lock = RWLock()
+        self._shards = [threading.RLock() for _ in range(shards)]
+        # Une seule sauvegarde à la fois, sans bloquer les autres opérations
+        self._save_lock = threading.Lock()
+        super().__init__(storage_file, storage, columnar, codec, verify_statistics, searchable)
+
+    def _shard(self, key):
+        return self._shards[hash(key) % len(self._shards)]
+
+    @contextmanager
+    def editing(self, task_id):
+        """Verrouille le shard de la tâche et la fournit (None si absente) pour modification"""
+        with self._shard(id_key(task_id)):
+            yield self.get_task(task_id)
+
+    @contextmanager
+    def _all_shards(self):
+        with ExitStack() as stack:
+            for lock in self._shards:
+                stack.enter_context(lock)
+            yield
+
+    @property
+    def tasks(self) -> TaskList:
+        with self._lock.read():
+            return TaskManager.tasks.fget(self)
+
+    @tasks.setter
+    def tasks(self, tasks):
+        with self._lock.write():
+            TaskManager.tasks.fset(self, tasks)
+
+    def _on_task_changed(self, task, field, old, new):
+        with self._lock.write():
+            super()._on_task_changed(task, field, old, new)
+
+    def _reading(self):
+        return self._lock.read()
+
+    def snapshot(self):
+        # Aucune modification de tâche en cours (mark_completed : statut et date ensemble)
+        with self._all_shards(), self._lock.write():
+            return super().snapshot()
+
+    def _lookup(self, field, value) -> List[Task]:
+        with self._lock.read():
+            return super()._lookup(field, value)
+
+    def add_task(self, title, description="", priority=Priority.MEDIUM, due_date=None, assignee_email=None):
+        # Construction (validation, uuid, horodatage) hors verrou
+        task = Task(title, description, priority, due_date, assignee_email)
+        with self._lock.write():
+            self._register(task)
+            self._record_change(task._key, "add")
+        return task.id
+
+    def add_tasks(self, items):
+        with self._lock.write():
+            return super().add_tasks(items)
+
+    def get_task(self, task_id) -> Optional[Task]:
+        with self._lock.read():
+            return super().get_task(task_id)
+
+    def delete_task(self, task_id) -> bool:
+        with self._shard(id_key(task_id)), self._lock.write():
+            return super().delete_task(task_id)
+
+    def pop_due(self, until, limit=None) -> List[Task]:
+        with self._lock.write():
+            return super().pop_due(until, limit)
+
+    def defer_due(self, task, at):
+        with self._lock.write():
+            super().defer_due(task, at)
+
+    def get_statistics(self):
+        with self._lock.read():
+            return super().get_statistics()
+
+    def search(self, query, status=None, priority=None, limit=None) -> List[Task]:
+        with self._lock.read():
+            return super().search(query, status, priority, limit)
+
+    def load_from_file(self, filename=None):
+        with self._save_lock, self._lock.write():
+            super().load_from_file(filename)
+
+    def load_project(self, project_id):
+        with self._save_lock, self._lock.write():
+            super().load_project(project_id)
+
+    def save_project(self, project_id):
+        # Verrou d'écriture (réentrant) : _lookup reprend le verrou, ce qu'un
+        # lecteur ne peut pas faire si un rédacteur attend entre-temps
+        with self._save_lock, self._all_shards(), self._lock.write():
+            super().save_project(project_id)
+
+    def save_to_file(self, filename=None):
+        backend = self._backend(filename)
+        own = backend is self.storage
+        with self._save_lock:
+            # Copie cohérente : aucune modification de tâche ni d'index en cours
+            with self._all_shards(), self._lock.write():
+                records = TaskManager.snapshot(self)
+                changes = self._changes if own else None
+                projects = list(self.projects.values())
+                if own:
+                    self._changes = {}
+            try:
+                backend.save(records, changes)
+                if backend.stores_projects:
+                    backend.save_projects(projects)
+            except Exception as e:
+                if own:
+                    # Changements perdus pour le journal : réécriture complète au prochain save
+                    with self._lock.write():
+                        self._changes = None
+                raise IOError(f"Erreur lors de la sauvegarde : {e}")
@@ -0,0 +1,126 @@
+import asyncio
+import csv
+import threading
+import time
+from src.task_manager.aio import AsyncTaskManager
+from src.task_manager.task import Priority, Status
+
+class TestAsyncTaskManager:
+    """Tests de la façade asyncio"""
+
+    def test_add_and_get_task(self, tmp_path):
+        async def scenario():
+            manager = AsyncTaskManager(str(tmp_path / "tasks.json"))
+            task_id = await manager.add_task("Test", "Desc", Priority.HIGH)
+            task = await manager.get_task(task_id)
+            return task_id, task, await manager.get_tasks_by_priority(Priority.HIGH)
+
+        task_id, task, high = asyncio.run(scenario())
+        assert task.id == task_id
+        assert task.title == "Test"
+        assert high == [task]
+
+    def test_save_and_load_round_trip(self, tmp_path):
+        path = str(tmp_path / "tasks.json")
+
+        async def scenario():
+            manager = AsyncTaskManager(path)
+            task_id = await manager.add_task("Persistée")
+            (await manager.get_task(task_id)).status = Status.DONE
+            await manager.save()
+            other = AsyncTaskManager(path)
+            await other.load()
+            return task_id, await other.get_task(task_id)
+
+        task_id, task = asyncio.run(scenario())
+        assert task.id == task_id
+        assert task.status == Status.DONE
+
+    def test_concurrent_saves_are_coalesced(self, tmp_path):
+        manager = AsyncTaskManager(str(tmp_path / "tasks.json"))
+        writes = []
+        started = threading.Event()
+        original = manager.manager.save_to_file
+
+        def slow_save(filename=None):
+            writes.append(len(manager.manager.tasks))
+            started.set()
+            time.sleep(0.05)
+            original(filename)
+
+        manager.manager.save_to_file = slow_save
+
+        async def scenario():
+            await manager.add_task("Première")
+            first = asyncio.ensure_future(manager.save())
+            # Attend que la première écriture soit en cours
+            while not started.is_set():
+                await asyncio.sleep(0.001)
+            await manager.add_task("Seconde")
+            await asyncio.gather(first, *(manager.save() for _ in range(10)))
+
+        asyncio.run(scenario())
+        # Une écriture en cours puis une seule écriture pour les dix demandes suivantes
+        assert writes == [1, 2]
+
+    def test_cancelled_save_does_not_block_later_saves(self, tmp_path):
+        manager = AsyncTaskManager(str(tmp_path / "tasks.json"))
+        release = threading.Event()
+        original = manager.manager.save_to_file
+
+        def blocking_save(filename=None):
+            release.wait()
+            original(filename)
+
+        manager.manager.save_to_file = blocking_save
+
+        async def scenario():
+            await manager.add_task("Test")
+            first = asyncio.ensure_future(manager.save())
+            await asyncio.sleep(0.01)
+            # En attente du verrou : sa future est partagée par l'appel suivant
+            queued = asyncio.ensure_future(manager.save())
+            waiter = asyncio.ensure_future(manager.save())
+            await asyncio.sleep(0.01)
+            queued.cancel()
+            release.set()
+            await first
+            await asyncio.wait_for(waiter, 1)
+            await asyncio.wait_for(manager.save(), 1)
+            return manager._pending_saves
+
+        assert asyncio.run(scenario()) == {}
+        assert (tmp_path / "tasks.json").exists()
+
+    def test_save_error_reaches_every_waiter(self, tmp_path):
+        manager = AsyncTaskManager(str(tmp_path / "absent" / "tasks.json"))
+
+        async def scenario():
+            await manager.add_task("Test")
+            return await asyncio.gather(*(manager.save() for _ in range(3)), return_exceptions=True)
+
+        results = asyncio.run(scenario())
+        assert all(isinstance(result, IOError) for result in results)
+
+    def test_load_missing_file_matches_sync_api(self, tmp_path):
+        async def scenario():
+            manager = AsyncTaskManager(str(tmp_path / "absent.json"))
+            await manager.add_task("Oubliée")
+            await manager.load()
+            return manager.manager.tasks
+
+        assert asyncio.run(scenario()) == []
+
+    def test_export_csv(self, tmp_path):
+        path = tmp_path / "export.csv"
+
+        async def scenario():
+            manager = AsyncTaskManager(str(tmp_path / "tasks.json"))
+            await manager.add_task("Exportée", priority=Priority.LOW)
+            await manager.export_csv(str(path))
+
+        asyncio.run(scenario())
+        with open(path, newline="") as f:
+            rows = list(csv.DictReader(f))
+        assert [row["title"] for row in rows] == ["Exportée"]
+        assert rows[0]["priority"] == "LOW"
@@ -0,0 +1,78 @@
+import json
+import pytest
+from datetime import datetime
+from src.task_manager.codec import JsonCodec, OrjsonCodec, get_codec, orjson, decode_tasks, encode_tasks
+from src.task_manager.manager import TaskManager
+from src.task_manager.task import Task, Priority
+
+CODECS = ["readable", "json", pytest.param("orjson", marks=pytest.mark.skipif(orjson is None, reason="orjson absent"))]
+
+def make_tasks():
+    tasks = [Task("Tâche 1", "Desc", Priority.HIGH), Task("Tâche 2")]
+    tasks[0].mark_completed()
+    tasks[1].assign_to_project("p1")
+    return tasks
+
+class TestCodecs:
+    """Tests des sérialiseurs"""
+
+    @pytest.mark.parametrize("name", CODECS)
+    def test_round_trip(self, name, tmp_path):
+        path = str(tmp_path / "tasks.json")
+        tasks = make_tasks()
+        codec = get_codec(name)
+        codec.dump(tasks, path)
+        loaded = codec.load(path)
+        assert [t.to_dict() for t in loaded] == [t.to_dict() for t in tasks]
+
+    @pytest.mark.parametrize("name", CODECS)
+    def test_files_are_interchangeable(self, name, tmp_path):
+        path = str(tmp_path / "tasks.json")
+        tasks = make_tasks()
+        get_codec(name).dump(tasks, path)
+        assert [t.id for t in get_codec("readable").load(path)] == [t.id for t in tasks]
+        with open(path) as f:
+            assert len(json.load(f)) == 2
+
+    def test_readable_is_byte_compatible(self, tmp_path):
+        path = tmp_path / "tasks.json"
+        tasks = make_tasks()
+        get_codec("readable").dump(tasks, str(path))
+        assert path.read_text() == json.dumps([t.to_dict() for t in tasks], indent=2)
+
+    def test_compact_writes_one_record_per_line(self, tmp_path):
+        path = tmp_path / "tasks.json"
+        JsonCodec().dump(make_tasks(), str(path))
+        lines = path.read_text().splitlines()
+        assert lines[0] == "[" and lines[-1] == "]"
+        assert len(lines) == 4
+
+    def test_auto_prefers_orjson(self):
+        expected = OrjsonCodec if orjson is not None else JsonCodec
+        assert isinstance(get_codec("auto"), expected)
+
+    def test_unknown_codec_raises(self):
+        with pytest.raises(ValueError):
+            get_codec("xml")
+
+    def test_decode_shares_identical_timestamps(self):
+        records = list(encode_tasks(make_tasks()))
+        records[1]["created_at"] = records[0]["created_at"]
+        tasks = decode_tasks(records)
+        assert tasks[0].created_at is tasks[1].created_at
+        assert isinstance(tasks[0].created_at, datetime)
+
+    def test_decode_invalid_record_raises(self):
+        with pytest.raises(ValueError):
+            decode_tasks([{"id": "x", "title": "", "priority": "LOW", "created_at": "2024-01-01", "status": "TODO"}])
+
+def test_manager_uses_codec(tmp_path):
+    path = str(tmp_path / "tasks.json")
+    manager = TaskManager(path, codec="json")
+    task_id = manager.add_task("T1")
+    manager.save_to_file()
+    with open(path) as f:
+        assert f.read().count("\n") == 2
+    loaded = TaskManager(path, codec="auto")
+    loaded.load_from_file()
+    assert loaded.get_task(task_id).title == "T1"
@@ -0,0 +1,91 @@
+import pytest
+from datetime import datetime, timedelta
+from src.task_manager.columnar import ColumnarTaskStore, np
+from src.task_manager.manager import TaskManager
+from src.task_manager.services import ReportService
+from src.task_manager.task import Task, Priority, Status
+
+BACKENDS = [False, pytest.param(True, marks=pytest.mark.skipif(np is None, reason="NumPy absent"))]
+
+@pytest.fixture(params=BACKENDS, ids=["array", "numpy"])
+def use_numpy(request):
+    return request.param
+
+def make_tasks():
+    tasks = [Task("T1", priority=Priority.LOW), Task("T2", priority=Priority.HIGH),
+             Task("T3", priority=Priority.HIGH), Task("T4", priority=Priority.URGENT)]
+    tasks[1].mark_completed()
+    tasks[2].status = Status.IN_PROGRESS
+    tasks[3].assign_to_project("p1")
+    for offset, task in enumerate(tasks):
+        task.created_at = datetime(2024, 1, 1) + timedelta(days=offset)
+    return tasks
+
+class TestColumnarTaskStore:
+    """Tests des agrégats par colonnes"""
+
+    def test_statistics_match_manager_scan(self, use_numpy):
+        manager = TaskManager()
+        manager.tasks = make_tasks()
+        store = ColumnarTaskStore.from_tasks(manager.tasks, use_numpy)
+        assert store.statistics() == manager.get_statistics()
+
+    def test_daily_report_matches_report_service(self, use_numpy):
+        tasks = make_tasks()
+        store = ColumnarTaskStore.from_tasks(tasks, use_numpy)
+        date = datetime(2024, 1, 1)
+        service = ReportService()
+        assert service.generate_daily_report(store, date) == service.generate_daily_report(tasks, date)
+
+    def test_date_range_filters(self, use_numpy):
+        tasks = make_tasks()
+        store = ColumnarTaskStore.from_tasks(tasks, use_numpy)
+        start, end = datetime(2024, 1, 2), datetime(2024, 1, 4)
+        assert store.count_created_between(start, end) == 2
+        assert store.keys_created_between(start, end) == [tasks[1]._key, tasks[2]._key]
+        assert store.count_completed_between(datetime(2000, 1, 1)) == 1
+
+    def test_group_by_project(self, use_numpy):
+        store = ColumnarTaskStore.from_tasks(make_tasks(), use_numpy)
+        assert store.count_by_project() == {None: 3, "p1": 1}
+
+    def test_remove_and_compact(self, use_numpy):
+        tasks = make_tasks()
+        store = ColumnarTaskStore.from_tasks(tasks, use_numpy)
+        store.remove(tasks[0])
+        assert store.count_by_priority()["LOW"] == 0
+        assert store.count_created_between() == 3
+        store.remove(tasks[1])
+        store.remove(tasks[2])
+        assert len(store.keys) == 1
+        assert store.statistics()["tasks_by_priority"]["URGENT"] == 1
+
+class TestManagerColumnarMode:
+    """Tests du gestionnaire avec colonnes maintenues"""
+
+    def test_columns_follow_mutations(self):
+        manager = TaskManager(columnar=True)
+        id1 = manager.add_task("T1", priority=Priority.LOW)
+        id2 = manager.add_task("T2")
+        manager.get_task(id1).mark_completed()
+        manager.get_task(id2).update_priority(Priority.URGENT)
+        manager.delete_task(id1)
+        stats = manager.get_statistics()
+        assert stats["total_tasks"] == 1
+        assert stats["completed_tasks"] == 0
+        assert stats["tasks_by_priority"]["URGENT"] == 1
+
+    def test_columns_follow_created_at_changes(self):
+        manager = TaskManager(columnar=True)
+        task_id = manager.add_task("T1")
+        manager.get_task(task_id).created_at = datetime(2020, 5, 1)
+        assert manager.columns.count_created_between(datetime(2020, 5, 1), datetime(2020, 5, 2)) == 1
+        assert manager.columns.keys_created_between(datetime(2021, 1, 1)) == []
+
+    def test_load_rebuilds_columns(self, tmp_path):
+        source = TaskManager(str(tmp_path / "tasks.json"))
+        source.tasks = make_tasks()
+        source.save_to_file()
+        manager = TaskManager(source.storage_file, columnar=True)
+        manager.load_from_file()
+        assert manager.get_statistics() == source.get_statistics()
@@ -0,0 +1,134 @@
+import threading
+import time
+import pytest
+from src.task_manager.events import ChangeFeed, CompletionNotifier, EventType
+from src.task_manager.manager import TaskManager
+from src.task_manager.task import Priority, Status
+from src.task_manager.threadsafe import ConcurrentTaskManager
+
+class FakeEmailService:
+    def __init__(self):
+        self.batches = []
+
+    def send_completion_notifications(self, batch):
+        self.batches.append(list(batch))
+        errors = [(i, "Email invalide") for i, (email, _) in enumerate(batch) if "@" not in email]
+        return len(batch) - len(errors), errors
+
+class TestChangeFeed:
+    """Tests du flux de changements"""
+
+    def setup_method(self):
+        self.manager = TaskManager("test_tasks.json")
+        self.feed = ChangeFeed(self.manager, capacity=5)
+
+    def test_typed_events_with_increasing_sequence(self):
+        task_id = self.manager.add_task("Tâche", priority=Priority.LOW)
+        task = self.manager.get_task(task_id)
+        task.update_priority(Priority.HIGH)
+        task.mark_completed()
+        self.manager.delete_task(task_id)
+        events = self.feed.since(0)
+        assert [event.seq for event in events] == [1, 2, 3, 4, 5]
+        assert [event.type for event in events] == [
+            EventType.CREATED, EventType.UPDATED, EventType.COMPLETED, EventType.UPDATED, EventType.DELETED
+        ]
+        assert all(event.task_id == task_id for event in events)
+        assert (events[1].field, events[1].old, events[1].new) == ("priority", Priority.LOW, Priority.HIGH)
+        assert events[1].record.priority == Priority.HIGH
+        assert events[2].record.status == Status.DONE
+        assert events[2].record.completed_at is not None
+        assert events[3].field == "completed_at"
+        assert events[3].new == events[2].record.completed_at
+        assert self.feed.last_seq == 5
+
+    def test_since_returns_only_newer_events(self):
+        ids = [self.manager.add_task(f"T{i}") for i in range(3)]
+        assert [event.task_id for event in self.feed.since(1)] == ids[1:]
+        assert self.feed.since(3) == []
+        assert [event.seq for event in self.feed.since(0, types={EventType.CREATED})] == [1, 2, 3]
+
+    def test_overflow_reports_lost_events(self):
+        for i in range(8):
+            self.manager.add_task(f"T{i}")
+        assert [event.seq for event in self.feed.since(3)] == [4, 5, 6, 7, 8]
+        with pytest.raises(ValueError):
+            self.feed.since(2)
+
+    def test_reset_on_load(self):
+        self.manager.tasks = []
+        events = self.feed.since(0)
+        assert [event.type for event in events] == [EventType.RESET]
+        assert events[0].record is None
+
+    def test_subscribe_and_close(self):
+        received = []
+        self.feed.subscribe(received.append)
+        self.manager.add_task("A")
+        self.feed.unsubscribe(received.append)
+        self.manager.add_task("B")
+        self.feed.close()
+        self.manager.add_task("C")
+        assert [event.seq for event in received] == [1]
+        assert self.feed.last_seq == 2
+
+    def test_concurrent_manager(self):
+        manager = ConcurrentTaskManager("test_tasks.json")
+        feed = ChangeFeed(manager)
+        task_id = manager.add_task("Partagée")
+        with manager.editing(task_id) as task:
+            task.status = Status.IN_PROGRESS
+        assert [event.type for event in feed.since(0)] == [EventType.CREATED, EventType.UPDATED]
+
+class TestCompletionNotifier:
+    """Tests des notifications de fin par lots"""
+
+    def setup_method(self):
+        self.manager = TaskManager("test_tasks.json")
+        self.feed = ChangeFeed(self.manager)
+        self.email = FakeEmailService()
+
+    def test_batches_completions(self):
+        notifier = CompletionNotifier(self.feed, self.email, "chef@example.com", batch_size=2)
+        ids = [self.manager.add_task(f"T{i}") for i in range(3)]
+        for task_id in ids:
+            self.manager.get_task(task_id).mark_completed()
+        deadline = time.monotonic() + 2
+        while not self.email.batches and time.monotonic() < deadline:
+            time.sleep(0.001)
+        assert self.email.batches == [[("chef@example.com", "T0"), ("chef@example.com", "T1")]]
+        assert notifier.flush() == (1, [])
+        assert notifier.flush() == (0, [])
+        assert notifier.sent == 3
+        notifier.close()
+
+    def test_sending_happens_outside_the_task_update(self):
+        release = threading.Event()
+
+        class SlowEmailService(FakeEmailService):
+            def send_completion_notifications(self, batch):
+                release.wait(2)
+                raise OSError("SMTP indisponible")
+
+        manager = ConcurrentTaskManager("test_tasks.json")
+        notifier = CompletionNotifier(ChangeFeed(manager), SlowEmailService(), "chef@example.com", batch_size=1)
+        task_id = manager.add_task("A")
+        # L'envoi bloqué ne retient ni mark_completed ni le verrou du gestionnaire
+        with manager.editing(task_id) as task:
+            task.mark_completed()
+        assert manager.get_statistics()["completed_tasks"] == 1
+        release.set()
+        notifier.close()
+        assert notifier.sent == 0
+        assert notifier.errors == [("chef@example.com", "Échec de l'envoi : SMTP indisponible")]
+
+    def test_recipient_callable_and_errors(self):
+        recipients = {"A": "a@example.com", "B": "invalide"}
+        notifier = CompletionNotifier(self.feed, self.email, lambda record: recipients.get(record.title))
+        for title in ("A", "B", "C"):
+            self.manager.get_task(self.manager.add_task(title)).mark_completed()
+        self.manager.get_task(self.manager.add_task("D")).status = Status.CANCELLED
+        notifier.close()
+        assert self.email.batches == [[("a@example.com", "A"), ("invalide", "B")]]
+        assert notifier.sent == 1
+        assert notifier.errors == [("invalide", "Email invalide")]
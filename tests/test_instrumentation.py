@@ -0,0 +1,106 @@
+import logging
+import pytest
+from src.task_manager.instrumentation import (
+    Histogram, LoggingSink, PrometheusSink, instrument, instrumented, is_instrumented,
+    profile, uninstrument)
+from src.task_manager.manager import TaskManager
+from src.task_manager.services import ReportService
+from src.task_manager.task import Priority, Status
+from src.task_manager.threadsafe import ConcurrentTaskManager
+
+class TestHistogram:
+    def test_cumulative_buckets(self):
+        histogram = Histogram((0.1, 1.0))
+        for value in (0.05, 0.1, 0.5, 2.0):
+            histogram.observe(value)
+        assert histogram.cumulative() == [(0.1, 2), (1.0, 3), (float("inf"), 4)]
+        assert histogram.count == 4
+
+class TestInstrumentation:
+    """Tests de l'instrumentation des méthodes publiques"""
+
+    def teardown_method(self):
+        uninstrument()
+
+    def test_disabled_mode_keeps_original_methods(self):
+        original = TaskManager.add_task
+        sink = instrument()
+        assert TaskManager.add_task is not original
+        uninstrument()
+        assert TaskManager.add_task is original
+        assert not is_instrumented()
+        TaskManager().add_task("T")
+        assert sink.snapshot() == {}
+
+    def test_counts_latency_and_payload(self, tmp_path):
+        path = str(tmp_path / "tasks.json")
+        with instrumented() as sink:
+            manager = TaskManager(path)
+            for i in range(3):
+                manager.add_task(f"T{i}")
+            manager.get_tasks_by_status(Status.TODO)
+            manager.save_to_file()
+            ReportService().export_tasks_csv(manager.tasks, str(tmp_path / "export.csv"))
+            with pytest.raises(ValueError):
+                manager.add_task("")
+        stats = sink.snapshot()
+        assert stats["TaskManager.add_task"]["calls"] == 4
+        assert stats["TaskManager.add_task"]["errors"] == 1
+        assert stats["TaskManager.get_tasks_by_status"]["payload_bytes"] == 3
+        assert stats["TaskManager.save_to_file"]["payload_bytes"] == (tmp_path / "tasks.json").stat().st_size
+        assert stats["ReportService.export_tasks_csv"]["payload_bytes"] > 0
+        assert stats["TaskManager.add_task"]["total_seconds"] > 0
+        # Les propriétés ne sont pas enveloppées
+        assert "TaskManager.tasks" not in stats
+
+    def test_subclass_overrides_are_instrumented(self):
+        original = ConcurrentTaskManager.add_task
+        inherited = ConcurrentTaskManager.get_tasks_by_status
+        with instrumented() as sink:
+            manager = ConcurrentTaskManager()
+            manager.add_task("T")
+            manager.add_tasks([{"title": "U"}])
+            manager.get_statistics()
+            manager.get_tasks_by_status(Status.TODO)
+            TaskManager().add_task("V")
+        stats = sink.snapshot()
+        assert stats["ConcurrentTaskManager.add_task"]["calls"] == 1
+        # add_tasks appelle super().add_tasks : mesuré une seule fois
+        assert stats["ConcurrentTaskManager.add_tasks"]["calls"] == 1
+        assert "TaskManager.add_tasks" not in stats
+        assert stats["ConcurrentTaskManager.get_statistics"]["calls"] == 1
+        assert stats["ConcurrentTaskManager.get_tasks_by_status"]["calls"] == 1
+        assert stats["TaskManager.add_task"]["calls"] == 1
+        assert ConcurrentTaskManager.add_task is original
+        assert ConcurrentTaskManager.get_tasks_by_status is inherited
+        assert "get_tasks_by_status" not in vars(ConcurrentTaskManager)
+
+    def test_prometheus_render(self):
+        with instrumented(PrometheusSink()) as sink:
+            TaskManager().add_task("T", priority=Priority.HIGH)
+        text = sink.render()
+        assert 'taskmanager_calls_total{method="TaskManager.add_task"} 1' in text
+        assert 'taskmanager_call_duration_seconds_bucket{method="TaskManager.add_task",le="+Inf"} 1' in text
+        assert 'taskmanager_call_duration_seconds_count{method="TaskManager.add_task"} 1' in text
+
+    def test_logging_sink(self, caplog):
+        with caplog.at_level(logging.DEBUG, logger="task_manager.instrumentation"):
+            with instrumented(LoggingSink()):
+                TaskManager().get_statistics()
+        assert "TaskManager.get_statistics" in caplog.text
+
+def test_profile_context_manager(tmp_path):
+    manager = TaskManager()
+    with profile(limit=5) as result:
+        for i in range(50):
+            manager.add_task(f"T{i}")
+    assert "add_task" in result.report()
+    result.dump(str(tmp_path / "profil.pstats"))
+    assert (tmp_path / "profil.pstats").exists()
+
+def test_profile_dump_before_end(tmp_path):
+    with profile() as result:
+        assert result.report() == ""
+        with pytest.raises(ValueError):
+            result.dump(str(tmp_path / "profil.pstats"))
+    assert not (tmp_path / "profil.pstats").exists()
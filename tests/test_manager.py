@@ -166,4 +166,168 @@ def test_save_and_load_empty_tasks(tmp_path):
     manager = TaskManager(str(file_path))
     manager.save_to_file()
     manager.load_from_file()
-    assert manager.tasks == [] 
\ No newline at end of file
+    assert manager.tasks == [] 
+
+class TestTaskManagerIndexes:
+    """Tests des index par id, statut, priorité et projet"""
+
+    def setup_method(self):
+        self.manager = TaskManager("test_tasks.json")
+        self.id1 = self.manager.add_task("T1", priority=Priority.LOW)
+        self.id2 = self.manager.add_task("T2", priority=Priority.HIGH)
+
+    def test_mark_completed_updates_status_index(self):
+        self.manager.get_task(self.id1).mark_completed()
+        assert [t.id for t in self.manager.get_tasks_by_status(Status.DONE)] == [self.id1]
+        assert [t.id for t in self.manager.get_tasks_by_status(Status.TODO)] == [self.id2]
+
+    def test_update_priority_updates_priority_index(self):
+        self.manager.get_task(self.id1).update_priority(Priority.HIGH)
+        assert self.manager.get_tasks_by_priority(Priority.LOW) == []
+        assert len(self.manager.get_tasks_by_priority(Priority.HIGH)) == 2
+
+    def test_assign_to_project_updates_project_index(self):
+        self.manager.get_task(self.id2).assign_to_project("p1")
+        assert [t.id for t in self.manager.get_tasks_by_project("p1")] == [self.id2]
+        assert [t.id for t in self.manager.get_tasks_by_project(None)] == [self.id1]
+
+    def test_delete_task_removes_from_indexes(self):
+        task = self.manager.get_task(self.id1)
+        self.manager.delete_task(self.id1)
+        task.mark_completed()
+        assert self.manager.get_tasks_by_priority(Priority.LOW) == []
+        assert self.manager.get_tasks_by_status(Status.DONE) == []
+
+    def test_tasks_keeps_insertion_order(self):
+        id3 = self.manager.add_task("T3")
+        self.manager.delete_task(self.id2)
+        assert [t.id for t in self.manager.tasks] == [self.id1, id3]
+
+    def test_tasks_is_read_only(self):
+        tasks = self.manager.tasks
+        for mutate in (lambda: tasks.append(Task("T3")), lambda: tasks.remove(tasks[0]), lambda: tasks.clear()):
+            with pytest.raises(AttributeError):
+                mutate()
+        with pytest.raises(TypeError):
+            tasks[0] = Task("T3")
+        assert tasks == [self.manager.get_task(self.id1), self.manager.get_task(self.id2)]
+        assert tasks[1:] == (self.manager.get_task(self.id2),)
+        assert len(self.manager.tasks) == 2
+
+    def test_load_rebuilds_indexes(self, tmp_path):
+        self.manager.get_task(self.id2).mark_completed()
+        file_path = tmp_path / "tasks.json"
+        self.manager.save_to_file(str(file_path))
+        loaded = TaskManager(str(file_path))
+        loaded.load_from_file()
+        assert [t.id for t in loaded.get_tasks_by_status(Status.DONE)] == [self.id2]
+        assert loaded.get_task(self.id1).title == "T1"
+
+
+class TestTaskManagerBulk:
+    """Tests de l'ajout en masse"""
+
+    def setup_method(self):
+        self.manager = TaskManager("test_tasks.json")
+
+    def test_add_tasks_creates_and_indexes(self):
+        ids, errors = self.manager.add_tasks([
+            {"title": "T1", "priority": Priority.HIGH},
+            {"title": "T2", "description": "D", "priority": "LOW"},
+            {"title": "T3"},
+        ])
+        assert errors == []
+        assert len(ids) == 3
+        assert self.manager.get_task(ids[1]).description == "D"
+        assert [t.id for t in self.manager.get_tasks_by_priority(Priority.LOW)] == [ids[1]]
+        assert len(self.manager.get_tasks_by_status(Status.TODO)) == 3
+
+    def test_add_tasks_reports_errors_without_aborting(self):
+        ids, errors = self.manager.add_tasks([
+            {"title": ""},
+            {"title": "OK"},
+            {"title": "T", "priority": "BAD"},
+            {"description": "sans titre"},
+            None,
+        ])
+        assert len(ids) == 1
+        assert [index for index, _ in errors] == [0, 2, 3, 4]
+        assert len(self.manager.tasks) == 1
+
+    def test_bulk_tasks_are_observed(self):
+        ids, _ = self.manager.add_tasks([{"title": "T1"}, {"title": "T2"}])
+        self.manager.get_task(ids[0]).mark_completed()
+        assert [t.id for t in self.manager.get_tasks_by_status(Status.DONE)] == [ids[0]]
+        assert self.manager.delete_task(ids[1]) is True
+        assert len(self.manager.tasks) == 1
+
+    def test_bulk_ids_are_uuid4(self):
+        import uuid
+        ids, _ = self.manager.add_tasks([{"title": "T"}] * 10)
+        assert len(set(ids)) == 10
+        assert all(uuid.UUID(task_id).version == 4 for task_id in ids)
+
+class TestTaskManagerStatistics:
+    """Compteurs de statistiques maintenus incrémentalement"""
+
+    def setup_method(self):
+        self.manager = TaskManager("test_tasks.json", verify_statistics=True)
+
+    def test_counters_follow_every_mutation(self):
+        ids = [self.manager.add_task(f"T{i}", priority=Priority.LOW) for i in range(4)]
+        self.manager.add_tasks([{"title": "B1", "priority": "URGENT"}, {"title": "B2"}])
+        self.manager.get_task(ids[0]).mark_completed()
+        self.manager.get_task(ids[1]).update_priority(Priority.HIGH)
+        self.manager.get_task(ids[2]).status = Status.IN_PROGRESS
+        self.manager.delete_task(ids[3])
+        stats = self.manager.get_statistics()
+        assert stats["total_tasks"] == 5
+        assert stats["completed_tasks"] == 1
+        assert stats["tasks_by_priority"] == {"LOW": 2, "MEDIUM": 1, "HIGH": 1, "URGENT": 1}
+        assert stats["tasks_by_status"] == {"TODO": 3, "IN_PROGRESS": 1, "DONE": 1, "CANCELLED": 0}
+
+    def test_counters_after_load(self, tmp_path):
+        source = TaskManager(str(tmp_path / "tasks.json"))
+        task_id = source.add_task("T2", priority=Priority.URGENT)
+        source.get_task(task_id).mark_completed()
+        source.save_to_file()
+        self.manager.load_from_file(source.storage_file)
+        stats = self.manager.get_statistics()
+        assert stats["total_tasks"] == 1
+        assert stats["completed_tasks"] == 1
+        assert stats["tasks_by_priority"]["URGENT"] == 1
+
+    def test_debug_mode_detects_drift(self):
+        task_id = self.manager.add_task("T1")
+        # Modification qui contourne les index
+        del self.manager._indexes["status"][Status.TODO][self.manager.get_task(task_id)._key]
+        with pytest.raises(RuntimeError):
+            self.manager.get_statistics()
+
+    def test_statistics_do_not_scan_tasks(self):
+        manager = TaskManager("test_tasks.json")
+        manager.add_tasks([{"title": f"T{i}"} for i in range(10)])
+        with patch.object(TaskManager, "_scan_statistics", side_effect=AssertionError("parcours")):
+            assert manager.get_statistics()["total_tasks"] == 10
+
+class TestTaskManagerListeners:
+    """Abonnements aux changements du gestionnaire"""
+
+    def test_listener_receives_changes(self, tmp_path):
+        manager = TaskManager(str(tmp_path / "tasks.json"))
+        events = []
+        listener = lambda op, task, field, old, new: events.append((op, task and task.title, field, new))
+        manager.add_listener(listener)
+        task_id = manager.add_task("T1")
+        manager.get_task(task_id).update_priority(Priority.HIGH)
+        manager.save_to_file()
+        manager.load_from_file()
+        manager.delete_task(task_id)
+        manager.remove_listener(listener)
+        manager.add_task("T2")
+        assert events == [
+            ("add", "T1", None, None),
+            ("update", "T1", "priority", Priority.HIGH),
+            ("reset", None, None, None),
+            ("delete", "T1", None, None),
+        ]
@@ -0,0 +1,51 @@
+import pytest
+from src.task_manager.manager import TaskManager
+from src.task_manager.project import Project
+from src.task_manager.task import Priority, Status
+
+class TestProject:
+    """Tests de l'entité Project"""
+
+    def test_round_trip(self):
+        project = Project("Site web", "Refonte")
+        restored = Project.from_dict(project.to_dict())
+        assert restored.to_dict() == project.to_dict()
+
+    def test_empty_name(self):
+        with pytest.raises(ValueError):
+            Project("")
+
+class TestManagerProjects:
+    """Tests des projets dans le gestionnaire"""
+
+    def setup_method(self):
+        self.manager = TaskManager("test_tasks.json")
+        self.web = self.manager.add_project("Site web", project_id="web")
+        self.ids = [self.manager.add_task(f"T{i}", priority=Priority.HIGH if i % 2 else Priority.LOW) for i in range(4)]
+        for task_id in self.ids[:3]:
+            self.manager.get_task(task_id).assign_to_project(self.web)
+
+    def test_project_registry(self):
+        assert self.manager.get_project("web").name == "Site web"
+        assert [p.id for p in self.manager.get_projects()] == ["web"]
+        with pytest.raises(ValueError):
+            self.manager.add_project("Doublon", project_id="web")
+
+    def test_project_statistics(self):
+        self.manager.get_task(self.ids[0]).mark_completed()
+        stats = self.manager.get_project_statistics("web")
+        assert stats["total_tasks"] == 3
+        assert stats["completed_tasks"] == 1
+        assert stats["tasks_by_priority"]["HIGH"] == 1
+        assert stats["tasks_by_status"][Status.TODO.name] == 2
+        assert self.manager.get_project_statistics(None)["total_tasks"] == 1
+
+    def test_delete_project_unassigns_tasks(self):
+        assert self.manager.delete_project("web") is True
+        assert self.manager.get_tasks_by_project("web") == []
+        assert len(self.manager.get_tasks_by_project(None)) == 4
+        assert self.manager.delete_project("web") is False
+
+    def test_project_operations_require_sharded_storage(self):
+        with pytest.raises(ValueError):
+            self.manager.save_project("web")
@@ -0,0 +1,141 @@
+import pytest
+from datetime import datetime, timedelta
+from src.task_manager.manager import TaskManager
+from src.task_manager.query import Query
+from src.task_manager.storage import SQLiteStorage
+from src.task_manager.task import Priority, Status
+from src.task_manager.threadsafe import ConcurrentTaskManager
+
+BASE = datetime(2024, 1, 1)
+
+def populate(manager):
+    """20 tâches : priorités et statuts tournants, projet p1 une fois sur deux, une par jour"""
+    priorities = list(Priority)
+    statuses = [Status.TODO, Status.IN_PROGRESS, Status.DONE]
+    ids = []
+    for i in range(20):
+        task_id = manager.add_task(f"Tâche {i}", f"description {i}", priorities[i % 4])
+        task = manager.get_task(task_id)
+        task.created_at = BASE + timedelta(days=i)
+        if i % 2 == 0:
+            task.assign_to_project("p1")
+        status = statuses[i % 3]
+        if status == Status.DONE:
+            task.mark_completed()
+        elif status != Status.TODO:
+            task.status = status
+        ids.append(task_id)
+    return ids
+
+class TestQuery:
+    """Tests du moteur de requêtes"""
+
+    def setup_method(self):
+        self.manager = TaskManager("test_tasks.json")
+        self.ids = populate(self.manager)
+
+    def titles(self, tasks):
+        return [task.title for task in tasks]
+
+    def test_combined_predicates_sorting_and_limit(self):
+        tasks = (self.manager.query(priority__in=[Priority.HIGH, Priority.URGENT], status__ne=Status.DONE,
+                                    project_id="p1", created_at__gte=BASE + timedelta(days=3))
+                 .order_by("created_at").limit(2).all())
+        expected = [f"Tâche {i}" for i in range(3, 20)
+                    if i % 4 in (2, 3) and i % 3 != 2 and i % 2 == 0][:2]
+        assert self.titles(tasks) == expected
+
+    def test_equality_and_names(self):
+        assert self.manager.query(priority="HIGH").count() == 5
+        assert self.manager.query(status=Status.DONE).count() == len([i for i in range(20) if i % 3 == 2])
+        assert self.titles(self.manager.query(id=self.ids[4]).all()) == ["Tâche 4"]
+        with pytest.raises(ValueError):
+            self.manager.query(priority="ENORME")
+
+    def test_operators(self):
+        query = self.manager.query
+        assert query(priority__gte=Priority.HIGH).count() == 10
+        assert query(priority__lt=Priority.MEDIUM).count() == 5
+        assert query(project_id__isnull=True).count() == 10
+        assert query(completed_at__isnull=False).count() == query(status=Status.DONE).count()
+        assert self.titles(query(title__contains="TÂCHE 1").order_by("created_at").limit(3)) == [
+            "Tâche 1", "Tâche 10", "Tâche 11"]
+        assert query(status__not_in=[Status.DONE, Status.TODO]).count() == query(status="IN_PROGRESS").count()
+        assert query(due_date__lt=BASE).count() == 0
+
+    def test_ordering(self):
+        newest = self.manager.query().order_by("-created_at").limit(3).all()
+        assert self.titles(newest) == ["Tâche 19", "Tâche 18", "Tâche 17"]
+        by_priority = self.manager.query(project_id="p1").order_by("-priority", "created_at").all()
+        assert [t.priority for t in by_priority] == sorted((t.priority for t in by_priority),
+                                                          key=lambda p: -p.value)
+        mixed = self.manager.query(priority=Priority.LOW).order_by("status", "-created_at").all()
+        assert [(t.status.value, -t.created_at.timestamp()) for t in mixed] == sorted(
+            (t.status.value, -t.created_at.timestamp()) for t in mixed)
+
+    def test_none_values_sort_last(self):
+        tasks = self.manager.query().order_by("completed_at").all()
+        assert tasks[-1].completed_at is None
+        assert tasks[0].completed_at is not None
+        tasks = self.manager.query().order_by("-completed_at").all()
+        assert tasks[-1].completed_at is None
+
+    def test_offset_limit_and_count(self):
+        page = self.manager.query().order_by("created_at").offset(5).limit(5).all()
+        assert self.titles(page) == [f"Tâche {i}" for i in range(5, 10)]
+        assert self.manager.query().offset(18).limit(5).count() == 2
+        assert self.manager.query(title__contains="1").count() == 11
+        assert self.manager.query(status=Status.TODO).first().title == "Tâche 0"
+        assert self.manager.query(title="Absente").first() is None
+
+    def test_planner_picks_most_selective_index(self):
+        plan = self.manager.query(project_id="p1", priority=Priority.URGENT, title__contains="x").explain()
+        assert plan["index"] == "priority"
+        assert plan["estimated"] == 5
+        assert [p.field for p in plan["filters"]] == ["project_id", "title"]
+        assert self.manager.query(title__contains="x").explain()["index"] is None
+        assert self.manager.query(id__in=self.ids[:2], status=Status.TODO).explain()["index"] == "id"
+        self.manager.get_task(self.ids[0]).mark_completed()
+        for task_id in self.ids[1:15]:
+            self.manager.get_task(task_id).mark_completed()
+        assert self.manager.query(status__ne=Status.DONE, priority=Priority.LOW).explain()["index"] == "status"
+
+    def test_paginated_query_stops_early(self):
+        checked = []
+        predicate = Query(self.manager).where(title__contains="Tâche")
+        test = predicate.predicates[0].test
+        predicate.predicates[0].test = lambda task: checked.append(task) or test(task)
+        assert len(predicate.limit(3).all()) == 3
+        assert len(checked) == 3
+
+    def test_invalid_queries(self):
+        with pytest.raises(ValueError):
+            self.manager.query(owner="moi")
+        with pytest.raises(ValueError):
+            self.manager.query(title__like="x")
+        with pytest.raises(ValueError):
+            self.manager.query(status__gt=Status.TODO)
+        with pytest.raises(ValueError):
+            self.manager.query().order_by("owner")
+        with pytest.raises(ValueError):
+            self.manager.query().limit(-1)
+
+class TestQueryBackends:
+    """Requêtes sur les autres gestionnaires"""
+
+    def test_sqlite_backend(self):
+        storage = SQLiteStorage(":memory:")
+        manager = TaskManager(storage=storage)
+        ids = populate(manager)
+        tasks = manager.query(project_id="p1", priority=Priority.LOW).order_by("created_at").all()
+        assert [t.id for t in tasks] == [ids[i] for i in range(0, 20, 4)]
+        assert manager.query(id=ids[3]).first().id == ids[3]
+        assert manager.query(title__contains="19").count() == 1
+        storage.close()
+
+    def test_concurrent_manager(self):
+        manager = ConcurrentTaskManager("test_tasks.json")
+        populate(manager)
+        assert manager.query(status=Status.TODO, project_id="p1").count() == len(
+            [i for i in range(20) if i % 3 == 0 and i % 2 == 0])
+        assert len(list(manager.query().limit(4))) == 4
@@ -0,0 +1,157 @@
+import pytest
+from datetime import datetime, timedelta
+from src.task_manager.manager import TaskManager
+from src.task_manager.reminders import DueIndex, ReminderDispatcher
+from src.task_manager.storage import SQLiteStorage
+from src.task_manager.task import Task, Status
+from src.task_manager.threadsafe import ConcurrentTaskManager
+
+NOW = datetime(2024, 1, 1, 8, 0)
+
+class FakeEmailService:
+    def __init__(self):
+        self.batches = []
+
+    def send_reminders(self, batch):
+        self.batches.append(list(batch))
+        errors = [(i, "Email invalide") for i, (email, _, _) in enumerate(batch) if email.startswith("x")]
+        return len(batch) - len(errors), errors
+
+class TestDueIndex:
+    """Tests de l'index des échéances"""
+
+    def test_pop_due_in_order(self):
+        index = DueIndex()
+        tasks = [Task(f"T{h}", due_date=NOW + timedelta(hours=h)) for h in (3, 1, 2, 10)]
+        for task in tasks:
+            index.add(task)
+        assert index.next_due() == NOW + timedelta(hours=1)
+        assert [t.title for t in index.pop_due(NOW + timedelta(hours=3))] == ["T1", "T2", "T3"]
+        assert [t.title for t in index.pop_due(NOW + timedelta(hours=3))] == []
+        assert len(index) == 1
+
+    def test_ignores_tasks_without_due_date_or_done(self):
+        index = DueIndex()
+        done = Task("Fini", due_date=NOW)
+        done.mark_completed()
+        index.add(done)
+        index.add(Task("Sans échéance"))
+        assert len(index) == 0
+        assert index.next_due() is None
+
+    def test_limit_and_remove(self):
+        index = DueIndex()
+        tasks = [Task(f"T{h}", due_date=NOW + timedelta(hours=h)) for h in range(5)]
+        for task in tasks:
+            index.add(task)
+        index.remove(tasks[0])
+        assert [t.title for t in index.pop_due(NOW + timedelta(days=1), limit=2)] == ["T1", "T2"]
+
+class TestManagerDueIndex:
+    """Tests de l'index des échéances tenu par le gestionnaire"""
+
+    def setup_method(self):
+        self.manager = TaskManager("test_tasks.json")
+
+    def test_tracks_add_update_and_delete(self):
+        soon = self.manager.add_task("Bientôt", due_date=NOW + timedelta(hours=1))
+        later = self.manager.add_task("Plus tard", due_date=NOW + timedelta(days=3))
+        gone = self.manager.add_task("Supprimée", due_date=NOW)
+        self.manager.add_task("Sans échéance")
+        self.manager.delete_task(gone)
+        self.manager.get_task(later).set_due_date(NOW + timedelta(hours=2))
+        assert [t.id for t in self.manager.pop_due(NOW + timedelta(hours=6))] == [soon, later]
+
+    def test_completed_tasks_are_not_due_until_reopened(self):
+        task_id = self.manager.add_task("A", due_date=NOW)
+        task = self.manager.get_task(task_id)
+        task.mark_completed()
+        assert self.manager.pop_due(NOW) == []
+        task.status = Status.TODO
+        assert self.manager.pop_due(NOW) == [task]
+
+    def test_popped_task_is_not_requeued_by_status_progress(self):
+        task_id = self.manager.add_task("A", due_date=NOW)
+        assert len(self.manager.pop_due(NOW)) == 1
+        self.manager.get_task(task_id).status = Status.IN_PROGRESS
+        assert self.manager.pop_due(NOW) == []
+
+    def test_rebuilt_on_load_and_bulk_add(self):
+        ids, errors = self.manager.add_tasks([
+            {"title": "A", "due_date": NOW, "assignee_email": "a@example.com"},
+            {"title": "B", "due_date": "demain"},
+            {"title": "C", "assignee_email": "invalide"},
+        ])
+        assert [index for index, _ in errors] == [1, 2]
+        assert [t.id for t in self.manager.pop_due(NOW)] == ids
+        self.manager.tasks = [Task("D", due_date=NOW)]
+        assert [t.title for t in self.manager.pop_due(NOW)] == ["D"]
+
+    def test_requires_resident_backend(self):
+        storage = SQLiteStorage(":memory:")
+        with pytest.raises(ValueError):
+            TaskManager(storage=storage).pop_due(NOW)
+        storage.close()
+
+    def test_concurrent_manager(self):
+        manager = ConcurrentTaskManager("test_tasks.json")
+        task_id = manager.add_task("A", due_date=NOW, assignee_email="a@example.com")
+        assert [t.id for t in manager.pop_due(NOW)] == [task_id]
+
+class TestReminderDispatcher:
+    """Tests de l'envoi des rappels par lots"""
+
+    def setup_method(self):
+        self.manager = TaskManager("test_tasks.json")
+        self.email = FakeEmailService()
+
+    def test_sends_only_due_tasks_in_batches(self):
+        for i in range(5):
+            self.manager.add_task(f"T{i}", due_date=NOW + timedelta(hours=i), assignee_email=f"u{i}@example.com")
+        self.manager.add_task("Lointaine", due_date=NOW + timedelta(days=7), assignee_email="l@example.com")
+        self.manager.add_task("Sans destinataire", due_date=NOW)
+        dispatcher = ReminderDispatcher(self.manager, self.email, window=timedelta(hours=3), batch_size=2)
+        assert dispatcher.run(NOW) == (4, [])
+        assert [[row[1] for row in batch] for batch in self.email.batches] == [["T0", "T1"], ["T2", "T3"]]
+        assert self.email.batches[0][0] == ("u0@example.com", "T0", NOW)
+        assert dispatcher.run(NOW) == (0, [])
+
+    def test_errors_are_reported_by_task_id(self):
+        bad = self.manager.add_task("Mauvais", due_date=NOW, assignee_email="x@example.com")
+        self.manager.add_task("Bon", due_date=NOW, assignee_email="b@example.com")
+        dispatcher = ReminderDispatcher(self.manager, self.email, clock=lambda: NOW)
+        assert dispatcher.run() == (1, [(bad, "Email invalide")])
+
+    def test_failed_reminders_are_retried_with_backoff(self):
+        bad = self.manager.add_task("Mauvais", due_date=NOW, assignee_email="x@example.com")
+        dispatcher = ReminderDispatcher(self.manager, self.email, retry_delay=timedelta(minutes=10), max_retries=2)
+        assert dispatcher.run(NOW) == (0, [(bad, "Email invalide")])
+        assert dispatcher.run(NOW + timedelta(minutes=5)) == (0, [])
+        assert dispatcher.run(NOW + timedelta(minutes=10)) == (0, [(bad, "Email invalide")])
+        # Deuxième échec : attente doublée
+        assert dispatcher.run(NOW + timedelta(minutes=25)) == (0, [])
+        assert dispatcher.run(NOW + timedelta(minutes=30)) == (0, [(bad, "Email invalide")])
+        # max_retries atteint : abandonné
+        assert dispatcher.run(NOW + timedelta(days=1)) == (0, [])
+        assert len(self.email.batches) == 3
+
+    def test_retry_succeeds_and_respects_task_changes(self):
+        task = self.manager.get_task(self.manager.add_task("A", due_date=NOW, assignee_email="x@example.com"))
+        done = self.manager.get_task(self.manager.add_task("B", due_date=NOW, assignee_email="xb@example.com"))
+        dispatcher = ReminderDispatcher(self.manager, self.email, retry_delay=timedelta(minutes=10))
+        assert dispatcher.run(NOW)[0] == 0
+        done.mark_completed()
+        task.assignee_email = "a@example.com"
+        assert dispatcher.run(NOW + timedelta(minutes=10)) == (1, [])
+        assert self.email.batches[-1] == [("a@example.com", "A", NOW)]
+        assert dispatcher.run(NOW + timedelta(days=1)) == (0, [])
+        assert len(self.manager.due_index) == 0
+
+    def test_task_assigned_after_a_run_is_reminded(self):
+        task = self.manager.get_task(self.manager.add_task("A", due_date=NOW))
+        dispatcher = ReminderDispatcher(self.manager, self.email)
+        assert dispatcher.run(NOW) == (0, [])
+        task.assign_to("a@example.com")
+        assert len(self.manager.due_index) == 1
+        assert dispatcher.run(NOW) == (1, [])
+        assert self.email.batches[-1] == [("a@example.com", "A", NOW)]
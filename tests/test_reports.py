@@ -0,0 +1,91 @@
+import pytest
+from datetime import datetime, date
+from src.task_manager.reports import ReportCache, bucket_tasks, percentile, period_start
+from src.task_manager.services import ReportService
+from src.task_manager.task import Task, Priority, Status
+
+def make_task(created, completed=None, priority=Priority.MEDIUM):
+    task = Task("T", priority=priority)
+    task.created_at = created
+    if completed is not None:
+        task.status = Status.DONE
+        task.completed_at = completed
+    return task
+
+class TestPeriodHelpers:
+    """Tests des bornes de période et des percentiles"""
+
+    def test_period_start(self):
+        day = date(2024, 3, 14)  # jeudi
+        assert period_start(day, "day") == day
+        assert period_start(day, "week") == date(2024, 3, 11)
+        assert period_start(day, "month") == date(2024, 3, 1)
+        with pytest.raises(ValueError):
+            period_start(day, "year")
+
+    def test_percentile_nearest_rank(self):
+        values = list(range(1, 101))
+        assert percentile(values, 50) == 50
+        assert percentile(values, 99) == 99
+        assert percentile([7], 90) == 7
+        assert percentile([], 50) is None
+
+class TestPeriodReports:
+    """Tests des rapports par période"""
+
+    def setup_method(self):
+        self.service = ReportService()
+        self.tasks = [
+            make_task(datetime(2024, 1, 1, 9), datetime(2024, 1, 1, 10), Priority.HIGH),
+            make_task(datetime(2024, 1, 1, 12), datetime(2024, 1, 3, 12)),
+            make_task(datetime(2024, 1, 3, 8), priority=Priority.HIGH),
+            make_task(datetime(2024, 1, 8, 8), datetime(2024, 1, 8, 20)),
+        ]
+
+    def test_daily_series_is_continuous(self):
+        reports = self.service.generate_period_reports(self.tasks)
+        assert [r["period"] for r in reports][:3] == ["2024-01-01", "2024-01-02", "2024-01-03"]
+        assert len(reports) == 8
+        first, second, third = reports[:3]
+        assert (first["created"], first["completed"]) == (2, 1)
+        assert first["by_priority"] == {"HIGH": 1, "MEDIUM": 1}
+        assert first["lead_time"]["p50"] == 3600
+        assert second["created"] == second["completed"] == 0
+        assert second["lead_time"]["p50"] is None
+        assert (third["created"], third["completed"]) == (1, 1)
+        assert third["lead_time"]["p99"] == 2 * 86400
+
+    def test_weekly_and_monthly(self):
+        weekly = self.service.generate_period_reports(self.tasks, period="week")
+        assert [(r["period"], r["created"], r["completed"]) for r in weekly] == [
+            ("2024-01-01", 3, 2), ("2024-01-08", 1, 1)]
+        assert weekly[0]["throughput"] == 2 / 7
+        monthly = self.service.generate_period_reports(self.tasks, period="month")
+        assert len(monthly) == 1
+        assert monthly[0]["completed"] == 3
+        assert monthly[0]["throughput"] == 3 / 31
+
+    def test_explicit_range(self):
+        reports = self.service.generate_period_reports(
+            self.tasks, start=datetime(2023, 12, 31), end=date(2024, 1, 1))
+        assert [r["created"] for r in reports] == [0, 2]
+
+    def test_cache_recomputes_only_open_periods(self):
+        cache = ReportCache("day")
+        self.service.generate_period_reports(self.tasks, cache=cache)
+        closed = cache.buckets[date(2024, 1, 1)]
+        later = make_task(datetime(2024, 1, 8, 9), datetime(2024, 1, 9, 9))
+        reports = self.service.generate_period_reports(self.tasks + [later], cache=cache)
+        assert cache.buckets[date(2024, 1, 1)] is closed
+        assert reports[-2]["created"] == 2
+        assert reports[-1]["period"] == "2024-01-09"
+        assert reports[-1]["completed"] == 1
+        assert reports == self.service.generate_period_reports(self.tasks + [later])
+
+    def test_cache_period_mismatch(self):
+        with pytest.raises(ValueError):
+            self.service.generate_period_reports(self.tasks, period="week", cache=ReportCache("day"))
+
+    def test_single_pass_over_generator(self):
+        buckets = bucket_tasks(iter(self.tasks), "day")
+        assert sum(b.created for b in buckets.values()) == 4
@@ -0,0 +1,138 @@
+import pytest
+from datetime import datetime, timedelta
+from src.task_manager.manager import TaskManager
+from src.task_manager.scheduler import TaskScheduler
+from src.task_manager.task import Priority, Status
+from src.task_manager.threadsafe import ConcurrentTaskManager
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+class TestTaskScheduler:
+    """Tests de la file de travail"""
+
+    def setup_method(self):
+        self.manager = TaskManager("test_tasks.json")
+        self.clock = FakeClock()
+        base = datetime(2024, 1, 1)
+        self.ids = {}
+        for hours, (name, priority) in enumerate([("low", Priority.LOW), ("high", Priority.HIGH),
+                                                  ("medium", Priority.MEDIUM), ("high2", Priority.HIGH)]):
+            task_id = self.manager.add_task(name, priority=priority)
+            self.manager.get_task(task_id).created_at = base + timedelta(hours=hours)
+            self.ids[name] = task_id
+        self.scheduler = TaskScheduler(self.manager, lease=60, clock=self.clock)
+
+    def titles(self, tasks):
+        return [task.title for task in tasks]
+
+    def test_orders_by_priority_then_age(self):
+        assert self.scheduler.next_task().title == "high"
+        assert self.titles(self.scheduler.claim(4)) == ["high", "high2", "medium", "low"]
+        assert self.scheduler.claim() == []
+
+    def test_claim_marks_in_progress_and_complete(self):
+        task, = self.scheduler.claim()
+        assert task.status == Status.IN_PROGRESS
+        assert self.scheduler.leased() == [task]
+        self.scheduler.complete(task.id)
+        assert task.status == Status.DONE
+        assert self.scheduler.leased() == []
+        with pytest.raises(ValueError):
+            self.scheduler.complete(task.id)
+
+    def test_release_requeues(self):
+        task, = self.scheduler.claim()
+        self.scheduler.release(task.id)
+        assert task.status == Status.TODO
+        assert self.scheduler.next_task() is task
+
+    def test_expired_lease_requeues(self):
+        task, = self.scheduler.claim()
+        self.clock.now += 61
+        assert self.scheduler.next_task() is task
+        assert task.status == Status.TODO
+        with pytest.raises(ValueError):
+            self.scheduler.release(task.id)
+
+    def test_follows_task_mutations(self):
+        self.manager.get_task(self.ids["low"]).update_priority(Priority.URGENT)
+        assert self.scheduler.next_task().title == "low"
+        self.manager.get_task(self.ids["low"]).mark_completed()
+        self.manager.delete_task(self.ids["high"])
+        assert self.titles(self.scheduler.claim(5)) == ["high2", "medium"]
+
+    def test_follows_add_and_load(self, tmp_path):
+        urgent = self.manager.add_task("urgent", priority=Priority.URGENT)
+        self.manager.add_tasks([{"title": "bulk", "priority": "URGENT"}])
+        assert self.titles(self.scheduler.claim(2)) == ["urgent", "bulk"]
+        path = str(tmp_path / "tasks.json")
+        self.manager.save_to_file(path)
+        self.manager.load_from_file(path)
+        assert len(self.scheduler) == 4
+        assert self.titles(self.scheduler.leased()) == ["urgent", "bulk"]
+        assert self.manager.get_task(urgent).status == Status.IN_PROGRESS
+
+    def test_in_progress_tasks_are_requeued_after_reload(self, tmp_path):
+        claimed, = self.scheduler.claim()
+        path = str(tmp_path / "tasks.json")
+        self.manager.save_to_file(path)
+        # Redémarrage : le travailleur qui avait réservé la tâche a disparu
+        self.manager.load_from_file(path)
+        task = self.manager.get_task(claimed.id)
+        assert task.status == Status.IN_PROGRESS
+        assert self.scheduler.next_task().title == "high2"
+        self.clock.now += 61
+        assert self.scheduler.next_task() is task
+        assert task.status == Status.TODO
+
+    def test_new_scheduler_leases_in_progress_tasks(self):
+        self.scheduler.claim(2)
+        scheduler = TaskScheduler(self.manager, lease=60, clock=self.clock)
+        assert self.titles(scheduler.leased()) == ["high", "high2"]
+        self.clock.now += 61
+        assert self.titles(scheduler.claim(4)) == ["high", "high2", "medium", "low"]
+
+    def test_aging_prevents_starvation(self):
+        manager = TaskManager("test_tasks.json")
+        low = manager.get_task(manager.add_task("low", priority=Priority.LOW))
+        high = manager.get_task(manager.add_task("high", priority=Priority.HIGH))
+        low.created_at = datetime(2024, 1, 1, 0)
+        high.created_at = datetime(2024, 1, 1, 3)
+        assert TaskScheduler(manager).next_task() is high
+        # Deux niveaux d'écart = 2h d'ancienneté ; LOW attend depuis 3h de plus
+        assert TaskScheduler(manager, aging=3600).next_task() is low
+
+    def test_close_unsubscribes(self):
+        self.scheduler.close()
+        self.manager.add_task("urgent", priority=Priority.URGENT)
+        assert self.scheduler.next_task().title == "high"
+
+class TestSchedulerConcurrency:
+    def test_workers_never_claim_the_same_task(self):
+        import threading
+        manager = ConcurrentTaskManager("test_tasks.json")
+        manager.add_tasks([{"title": f"T{i}"} for i in range(400)])
+        scheduler = TaskScheduler(manager)
+        claimed = []
+
+        def worker():
+            while True:
+                tasks = scheduler.claim(3)
+                if not tasks:
+                    return
+                for task in tasks:
+                    claimed.append(task.id)
+                    scheduler.complete(task.id)
+
+        threads = [threading.Thread(target=worker) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert len(claimed) == len(set(claimed)) == 400
+        assert manager.get_statistics()["completed_tasks"] == 400
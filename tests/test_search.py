@@ -0,0 +1,122 @@
+import pytest
+from src.task_manager.manager import TaskManager
+from src.task_manager.search import SearchIndex, fold, tokenize
+from src.task_manager.task import Task, Priority, Status
+
+class TestTokenize:
+    """Tests de la normalisation des termes"""
+
+    def test_fold_removes_accents_and_case(self):
+        assert fold("Tâche Élevée") == "tache elevee"
+        assert fold("ASCII") == "ascii"
+
+    def test_tokenize(self):
+        assert tokenize("Préparer l'été, vite!") == ["preparer", "l", "ete", "vite"]
+        assert tokenize("") == []
+        assert tokenize(None) == []
+
+class TestSearchIndex:
+    """Tests de l'index inversé"""
+
+    def setup_method(self):
+        self.index = SearchIndex()
+        self.tasks = [
+            Task("Rédiger le rapport", "rapport mensuel"),
+            Task("Relire", "le rapport de Paul"),
+            Task("Rappeler le client"),
+        ]
+        for task in self.tasks:
+            self.index.add(task)
+
+    def keys(self, *tasks):
+        return [task._key for task in tasks]
+
+    def test_title_matches_rank_first(self):
+        assert self.index.search("rapport") == self.keys(self.tasks[0], self.tasks[1])
+
+    def test_prefix_on_last_term(self):
+        assert set(self.index.search("rap")) == set(self.keys(*self.tasks))
+        assert set(self.index.search("le rapp")) == set(self.keys(*self.tasks))
+        assert self.index.search("rapporte") == []
+
+    def test_terms_are_intersected(self):
+        assert self.index.search("client rap") == self.keys(self.tasks[2])
+        assert self.index.search("inconnu rap") == []
+
+    def test_accent_insensitive(self):
+        assert self.index.search("REDIGER") == self.keys(self.tasks[0])
+        assert self.index.search("rédi") == self.keys(self.tasks[0])
+
+    def test_remove_and_update(self):
+        self.index.remove(self.tasks[0])
+        assert self.index.search("rediger") == []
+        assert "rediger" not in self.index.postings
+        self.tasks[1].title = "Rédiger"
+        self.index.update(self.tasks[1])
+        assert self.index.search("redi") == self.keys(self.tasks[1])
+        assert self.index.search("relire") == []
+
+    def test_within_and_limit(self):
+        within = {self.tasks[1]._key: self.tasks[1]}
+        assert self.index.search("rapport", within=within) == self.keys(self.tasks[1])
+        assert self.index.search("rap", limit=2) == self.index.search("rap")[:2]
+
+    def test_vocabulary_stays_sorted(self):
+        self.index.add(Task("Zèbre", "abricot"))
+        self.index.add_many([Task("Mangue"), Task("Banane rapide")])
+        assert self.index._vocabulary == sorted(self.index._vocabulary)
+        assert set(self.index._vocabulary) == set(self.index.postings)
+        assert len(self.index.search("rap")) == 4
+
+    def test_empty_tokens_are_skipped_then_dropped(self):
+        self.index.remove(self.tasks[2])
+        assert "rappeler" in self.index._vocabulary
+        assert self.index._expand("rap") == ["rapport"]
+        self.index.add(Task("Rappeler Paul"))
+        assert self.index._vocabulary.count("rappeler") == 1
+        tasks = [Task(f"Terme{i}") for i in range(200)]
+        self.index.add_many(tasks)
+        for task in tasks:
+            self.index.remove(task)
+        # Compacté quand les termes vides dominent
+        assert len(self.index._vocabulary) < len(self.index.postings) + 64
+        assert self.index._expand("terme") == []
+        assert set(self.index.postings) <= set(self.index._vocabulary)
+
+class TestManagerSearch:
+    """Tests de la recherche du gestionnaire"""
+
+    def setup_method(self):
+        self.manager = TaskManager("test_tasks.json", searchable=True)
+        self.id1 = self.manager.add_task("Tâche urgente", priority=Priority.URGENT)
+        self.id2 = self.manager.add_task("Autre tâche", "description")
+        self.manager.add_tasks([{"title": "Tâche importée", "priority": "LOW"}])
+
+    def test_search_follows_add_and_delete(self):
+        assert len(self.manager.search("tache")) == 3
+        self.manager.delete_task(self.id1)
+        assert [t.id for t in self.manager.search("urg")] == []
+        assert len(self.manager.search("tache")) == 2
+
+    def test_search_combined_with_filters(self):
+        self.manager.get_task(self.id2).mark_completed()
+        assert [t.id for t in self.manager.search("tache", status=Status.DONE)] == [self.id2]
+        assert [t.id for t in self.manager.search("tache", priority=Priority.URGENT)] == [self.id1]
+        assert self.manager.search("tache", status=Status.DONE, priority=Priority.URGENT) == []
+
+    def test_title_change_reindexes(self):
+        self.manager.get_task(self.id1).title = "Réunion"
+        assert [t.id for t in self.manager.search("reu")] == [self.id1]
+
+    def test_search_after_load(self, tmp_path):
+        path = str(tmp_path / "tasks.json")
+        self.manager.save_to_file(path)
+        manager = TaskManager(path, searchable=True)
+        manager.add_task("Oubliée")
+        manager.load_from_file()
+        assert len(manager.search("tache")) == 3
+        assert manager.search("oubliee") == []
+
+    def test_search_requires_index(self):
+        with pytest.raises(ValueError):
+            TaskManager().search("tache")
@@ -1,6 +1,13 @@
+import csv
+import gzip
+import socketserver
+import threading
+import time
 import pytest
 from unittest.mock import patch, Mock, mock_open
+from src.task_manager.manager import TaskManager
 from src.task_manager.services import EmailService, ReportService
+from src.task_manager.storage import SQLiteStorage
 from src.task_manager.task import Task, Priority
 from datetime import datetime
 
@@ -109,4 +116,249 @@ def test_generate_daily_report_task_without_priority_status():
 def test_export_tasks_csv_empty(tmp_path):
     file_path = tmp_path / "empty.csv"
     ReportService().export_tasks_csv([], str(file_path))
-    assert file_path.exists() 
\ No newline at end of file
+    assert file_path.exists()
+
+class TestStreamingCsvExport:
+    """Export CSV en flux"""
+
+    def make_tasks(self, count):
+        for i in range(count):
+            task = Task(f"Tâche {i}", "Desc", Priority.HIGH if i % 2 else Priority.LOW)
+            if i % 3 == 0:
+                task.mark_completed()
+            yield task
+
+    def test_rows_match_to_dict(self, tmp_path):
+        tasks = list(self.make_tasks(5))
+        path = tmp_path / "export.csv"
+        assert ReportService().export_tasks_csv(tasks, str(path)) == 5
+        with open(path, newline="") as f:
+            rows = list(csv.DictReader(f))
+        for row, task in zip(rows, tasks):
+            expected = {k: "" if v is None else v for k, v in task.to_dict().items()}
+            assert row == expected
+
+    def test_generator_with_progress_and_columns(self, tmp_path):
+        path = tmp_path / "export.csv"
+        progress = []
+        written = ReportService().export_tasks_csv(
+            self.make_tasks(25), str(path), columns=["title", "status"], progress=progress.append, chunk_size=10)
+        assert written == 25
+        assert progress == [10, 20, 25]
+        with open(path, newline="") as f:
+            rows = list(csv.reader(f))
+        assert rows[0] == ["title", "status"]
+        assert rows[1] == ["Tâche 0", "DONE"]
+        assert len(rows) == 26
+
+    def test_gzip_output(self, tmp_path):
+        path = tmp_path / "export.csv.gz"
+        ReportService().export_tasks_csv(self.make_tasks(3), str(path), columns=["id"], compress=True)
+        with gzip.open(path, "rt", newline="") as f:
+            rows = list(csv.reader(f))
+        assert len(rows) == 4
+
+    def test_unknown_column(self, tmp_path):
+        with pytest.raises(ValueError):
+            ReportService().export_tasks_csv([], str(tmp_path / "x.csv"), columns=["title", "owner"])
+
+    def test_export_from_storage_stream(self, tmp_path):
+        manager = TaskManager(storage=SQLiteStorage(str(tmp_path / "tasks.db")))
+        manager.add_tasks({"title": f"T{i}"} for i in range(30))
+        path = tmp_path / "export.csv"
+        assert ReportService().export_tasks_csv(manager.iter_tasks(), str(path), columns=["title"]) == 30
+
+
+class FakeSMTPServer(socketserver.ThreadingTCPServer):
+    """Serveur SMTP minimal en local : compte connexions et messages reçus"""
+
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, failures=0, refused=(), deferred=None):
+        super().__init__(("127.0.0.1", 0), FakeSMTPHandler)
+        self.connections = 0
+        self.messages = []
+        self.failures = failures
+        self.refused = set(refused)
+        # Codes temporaires renvoyés (dans l'ordre) avant d'accepter un destinataire
+        self.deferred = {address: list(codes) for address, codes in (deferred or {}).items()}
+        self.lock = threading.Lock()
+
+class FakeSMTPHandler(socketserver.StreamRequestHandler):
+    def reply(self, line):
+        self.wfile.write(line.encode() + b"\r\n")
+
+    def handle(self):
+        server = self.server
+        with server.lock:
+            server.connections += 1
+        self.reply("220 fake ESMTP")
+        recipients = []
+        while True:
+            line = self.rfile.readline()
+            if not line:
+                return
+            command = line.decode().strip()
+            verb = command[:4].upper()
+            if verb in ("EHLO", "HELO"):
+                self.reply("250 fake")
+            elif verb == "MAIL":
+                recipients = []
+                self.reply("250 OK")
+            elif verb == "RCPT":
+                address = command.split(":", 1)[1].strip("<> ")
+                with server.lock:
+                    codes = server.deferred.get(address)
+                    code = codes.pop(0) if codes else None
+                if address in server.refused:
+                    self.reply("550 Utilisateur inconnu")
+                elif code is not None:
+                    self.reply(f"{code} Réessayez plus tard")
+                    if code == 421:
+                        return
+                else:
+                    recipients.append(address)
+                    self.reply("250 OK")
+            elif verb == "DATA":
+                self.reply("354 Fin par <CRLF>.<CRLF>")
+                data = []
+                for line in self.rfile:
+                    if line == b".\r\n":
+                        break
+                    data.append(line)
+                with server.lock:
+                    fail = server.failures > 0
+                    if fail:
+                        server.failures -= 1
+                    else:
+                        server.messages.append((recipients, b"".join(data)))
+                self.reply("451 Réessayez plus tard" if fail else "250 OK")
+            elif verb == "RSET" or verb == "NOOP":
+                self.reply("250 OK")
+            elif verb == "QUIT":
+                self.reply("221 Bye")
+                return
+            else:
+                self.reply("502 Commande inconnue")
+
+@pytest.fixture
+def smtp_server():
+    servers = []
+
+    def start(**options):
+        server = FakeSMTPServer(**options)
+        threading.Thread(target=server.serve_forever, args=(0.05,), daemon=True).start()
+        servers.append(server)
+        return server
+
+    yield start
+    for server in servers:
+        server.shutdown()
+        server.server_close()
+
+class TestEmailServiceBatch:
+    """Envoi en lot contre un serveur SMTP local"""
+
+    def make_service(self, server, **options):
+        host, port = server.server_address
+        options.setdefault("backoff", 0.01)
+        return EmailService(host, port, **options)
+
+    def test_send_reminders_reuses_pooled_connections(self, smtp_server):
+        server = smtp_server()
+        service = self.make_service(server, pool_size=3)
+        batch = [(f"user{i}@example.com", f"Tâche {i}", datetime(2024, 1, 2, 9, 0)) for i in range(50)]
+        sent, errors = service.send_reminders(batch)
+        service.close()
+        assert sent == 50
+        assert errors == []
+        assert len(server.messages) == 50
+        assert server.connections <= 3
+        recipients = sorted(r[0] for r, _ in server.messages)
+        assert recipients == sorted(email for email, _, _ in batch)
+        assert b"Subject: Rappel" in server.messages[0][1]
+        assert b"02/01/2024 09:00" in server.messages[0][1]
+
+    def test_invalid_rows_are_reported(self, smtp_server):
+        server = smtp_server()
+        service = self.make_service(server)
+        sent, errors = service.send_reminders([
+            ("ok@example.com", "A", datetime.now()),
+            ("bademail", "B", datetime.now()),
+            ("incomplet",),
+        ])
+        service.close()
+        assert sent == 1
+        assert [index for index, _ in errors] == [1, 2]
+
+    def test_send_completion_notifications(self, smtp_server):
+        server = smtp_server()
+        service = self.make_service(server)
+        sent, errors = service.send_completion_notifications([
+            ("a@example.com", "Rapport"),
+            ("bademail", "B"),
+            ("b@example.com", "Budget"),
+        ])
+        service.close()
+        assert sent == 2
+        assert [index for index, _ in errors] == [1]
+        assert sorted(r[0] for r, _ in server.messages) == ["a@example.com", "b@example.com"]
+
+    def test_temporary_failures_are_retried(self, smtp_server):
+        server = smtp_server(failures=2)
+        service = self.make_service(server, pool_size=1)
+        sent, errors = service.send_reminders([("a@example.com", "A", datetime.now())])
+        service.close()
+        assert (sent, errors) == (1, [])
+        assert len(server.messages) == 1
+
+    def test_retries_are_bounded(self, smtp_server):
+        server = smtp_server(failures=10)
+        service = self.make_service(server, pool_size=1, max_retries=2)
+        sent, errors = service.send_reminders([("a@example.com", "A", datetime.now())])
+        service.close()
+        assert sent == 0
+        assert errors[0][0] == 0
+        assert server.failures == 7
+
+    def test_refused_recipient_is_not_retried(self, smtp_server):
+        server = smtp_server(refused={"inconnu@example.com"})
+        service = self.make_service(server, pool_size=1)
+        sent, errors = service.send_reminders([
+            ("inconnu@example.com", "A", datetime.now()),
+            ("b@example.com", "B", datetime.now()),
+        ])
+        service.close()
+        assert sent == 1
+        assert [index for index, _ in errors] == [0]
+        # Le refus ne concerne que le message : la connexion est réutilisée
+        assert server.connections == 1
+
+    def test_temporary_recipient_refusal_is_retried(self, smtp_server):
+        server = smtp_server(deferred={"a@example.com": [450]})
+        service = self.make_service(server, pool_size=1)
+        sent, errors = service.send_reminders([("a@example.com", "A", datetime.now())])
+        service.close()
+        assert (sent, errors) == (1, [])
+        assert server.connections == 1
+
+    def test_closed_connection_is_not_returned_to_the_pool(self, smtp_server):
+        server = smtp_server(deferred={"a@example.com": [421]})
+        service = self.make_service(server, pool_size=1)
+        sent, errors = service.send_reminders([("a@example.com", "A", datetime.now())])
+        assert (sent, errors) == (1, [])
+        assert server.connections == 2
+        assert all(connection.sock is not None for connection in service.pool._idle)
+        service.close()
+
+    def test_rate_limit_spaces_sends(self, smtp_server):
+        server = smtp_server()
+        service = self.make_service(server, rate_limit=50)
+        start = time.monotonic()
+        sent, _ = service.send_reminders([(f"u{i}@example.com", "A", datetime.now()) for i in range(60)])
+        elapsed = time.monotonic() - start
+        service.close()
+        assert sent == 60
+        # 50 jetons d'emblée puis 10 envois à 50/s
+        assert elapsed >= 0.15
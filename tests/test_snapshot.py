@@ -0,0 +1,144 @@
+import csv
+import json
+import threading
+import pytest
+from datetime import datetime
+from src.task_manager.manager import TaskManager
+from src.task_manager.services import ReportService
+from src.task_manager.snapshot import VersionedStore, WIDTH
+from src.task_manager.storage import JournalStorage, SQLiteStorage
+from src.task_manager.task import Task, Priority, Status
+from src.task_manager.threadsafe import ConcurrentTaskManager
+
+class TestVersionedStore:
+    """Tests du vecteur persistant"""
+
+    def test_snapshots_share_unchanged_records(self):
+        tasks = [Task(f"T{i}") for i in range(WIDTH * WIDTH + 5)]
+        store = VersionedStore(tasks)
+        first = store.snapshot()
+        tasks[7].title = "modifiée"
+        store.update(tasks[7])
+        store.remove(tasks[8])
+        store.add(Task("nouvelle"))
+        second = store.snapshot()
+        assert len(first) == len(tasks)
+        assert len(second) == len(tasks)
+        assert first.get(tasks[7].id).title == "T7"
+        assert second.get(tasks[7].id).title == "modifiée"
+        assert tasks[8].id in first and tasks[8].id not in second
+        assert list(second)[-1].title == "nouvelle"
+        # Les feuilles non touchées sont les mêmes objets dans les deux versions
+        assert first.get(tasks[-1].id) is second.get(tasks[-1].id)
+
+    def test_iteration_keeps_insertion_order(self):
+        tasks = [Task(f"T{i}") for i in range(100)]
+        store = VersionedStore(tasks)
+        store.remove(tasks[50])
+        store.add(tasks[50])
+        assert [record.title for record in store.snapshot()] == [f"T{i}" for i in range(100)]
+
+    def test_compaction_keeps_old_snapshots_valid(self):
+        tasks = [Task(f"T{i}") for i in range(3 * WIDTH * WIDTH)]
+        store = VersionedStore(tasks)
+        before = store.snapshot()
+        for task in tasks[:-10]:
+            store.remove(task)
+        after = store.snapshot()
+        assert [record.title for record in after] == [task.title for task in tasks[-10:]]
+        assert len(before) == len(tasks)
+        assert before.get(tasks[0].id).title == "T0"
+        assert after.get(tasks[0].id) is None
+        with pytest.raises(KeyError):
+            after[tasks[0].id]
+
+class TestManagerSnapshot:
+    """Tests de TaskManager.snapshot"""
+
+    def setup_method(self):
+        self.manager = TaskManager("test_tasks.json")
+        self.ids = [self.manager.add_task(f"T{i}", priority=Priority.LOW) for i in range(10)]
+
+    def test_snapshot_is_isolated_from_writes(self):
+        snapshot = self.manager.snapshot()
+        self.manager.get_task(self.ids[0]).mark_completed()
+        self.manager.get_task(self.ids[1]).created_at = datetime(2020, 1, 1)
+        self.manager.delete_task(self.ids[2])
+        self.manager.add_task("Nouvelle")
+        assert len(snapshot) == 10
+        assert snapshot[self.ids[0]].status == Status.TODO
+        assert snapshot[self.ids[1]].created_at != datetime(2020, 1, 1)
+        assert [record.id for record in snapshot] == self.ids
+        current = self.manager.snapshot()
+        assert current[self.ids[0]].status == Status.DONE
+        assert current[self.ids[0]].completed_at is not None
+        assert current[self.ids[1]].created_at == datetime(2020, 1, 1)
+        assert self.ids[2] not in current
+        assert [record.title for record in current][-1] == "Nouvelle"
+
+    def test_snapshot_follows_reset_and_bulk_add(self):
+        self.manager.snapshot()
+        self.manager.tasks = [Task("A"), Task("B")]
+        self.manager.add_tasks([{"title": "C"}])
+        assert [record.title for record in self.manager.snapshot()] == ["A", "B", "C"]
+
+    def test_reports_and_csv_export_read_the_snapshot(self, tmp_path):
+        snapshot = self.manager.snapshot()
+        for task_id in self.ids:
+            self.manager.get_task(task_id).mark_completed()
+        report = ReportService().generate_daily_report(snapshot)
+        assert report["total"] == 10
+        assert report["completed"] == 0
+        path = tmp_path / "export.csv"
+        assert ReportService().export_tasks_csv(snapshot, str(path), columns=["id", "status"]) == 10
+        with open(path, newline="") as f:
+            assert {row["status"] for row in csv.DictReader(f)} == {"TODO"}
+
+    def test_backends_save_a_snapshot(self, tmp_path):
+        manager = TaskManager(storage=JournalStorage(str(tmp_path / "tasks.jsonl")))
+        task_id = manager.add_task("Journal")
+        manager.storage.save(manager.snapshot(), {manager.get_task(task_id)._key: "add"})
+        reloaded = TaskManager(storage=JournalStorage(str(tmp_path / "tasks.jsonl")))
+        reloaded.load_from_file()
+        assert [task.title for task in reloaded.tasks] == ["Journal"]
+
+    def test_requires_resident_backend(self):
+        storage = SQLiteStorage(":memory:")
+        with pytest.raises(ValueError):
+            TaskManager(storage=storage).snapshot()
+        storage.close()
+
+class TestConcurrentSnapshot:
+    """Snapshots pendant des écritures concurrentes"""
+
+    def test_save_runs_against_a_snapshot(self, tmp_path):
+        path = str(tmp_path / "tasks.json")
+        manager = ConcurrentTaskManager(path)
+        for i in range(2000):
+            manager.add_task(f"T{i}")
+        stop = threading.Event()
+
+        def writer():
+            i = 0
+            while not stop.is_set():
+                task_id = manager.add_task(f"W{i}")
+                with manager.editing(task_id) as task:
+                    task.mark_completed()
+                i += 1
+
+        thread = threading.Thread(target=writer)
+        thread.start()
+        try:
+            for _ in range(5):
+                snapshot = manager.snapshot()
+                manager.save_to_file()
+                titles = [record.title for record in snapshot]
+                assert len(titles) == len(snapshot)
+                # Chaque tâche terminée l'est entièrement (statut et date)
+                assert all(record.completed_at is not None for record in snapshot if record.status == Status.DONE)
+        finally:
+            stop.set()
+            thread.join()
+        with open(path) as f:
+            saved = json.load(f)
+        assert [record["title"] for record in saved[:2000]] == [f"T{i}" for i in range(2000)]
@@ -0,0 +1,443 @@
+import json
+from datetime import datetime
+import sqlite3
+import pytest
+from src.task_manager.manager import TaskManager
+from src.task_manager.storage import JournalStorage, LazyFileStorage, SQLiteStorage, ShardedStorage
+from src.task_manager.task import Task, Priority, Status
+
+class TestJournalStorage:
+    """Tests du stockage snapshot + journal"""
+
+    def make_manager(self, tmp_path, compact_every=1000):
+        self.path = str(tmp_path / "tasks.jsonl")
+        return TaskManager(self.path, storage=JournalStorage(self.path, compact_every))
+
+    def reload(self, compact_every=1000):
+        manager = TaskManager(self.path, storage=JournalStorage(self.path, compact_every))
+        manager.load_from_file()
+        return manager
+
+    def journal_lines(self):
+        with open(self.path + ".journal") as f:
+            return [json.loads(line) for line in f]
+
+    def test_save_appends_only_changes(self, tmp_path):
+        manager = self.make_manager(tmp_path)
+        id1 = manager.add_task("T1")
+        manager.add_task("T2")
+        manager.save_to_file()
+        manager.get_task(id1).mark_completed()
+        manager.save_to_file()
+        records = self.journal_lines()
+        assert [r["op"] for r in records] == ["add", "add", "update"]
+        assert records[2]["task"]["status"] == "DONE"
+
+    def test_add_then_delete_before_save_writes_nothing(self, tmp_path):
+        manager = self.make_manager(tmp_path)
+        task_id = manager.add_task("T1")
+        manager.delete_task(task_id)
+        manager.save_to_file()
+        assert self.reload().tasks == []
+
+    def test_reload_replays_journal(self, tmp_path):
+        manager = self.make_manager(tmp_path)
+        id1 = manager.add_task("T1")
+        id2 = manager.add_task("T2", priority=Priority.HIGH)
+        manager.save_to_file()
+        manager.delete_task(id1)
+        manager.get_task(id2).mark_completed()
+        manager.save_to_file()
+        loaded = self.reload()
+        assert [t.id for t in loaded.tasks] == [id2]
+        assert loaded.get_task(id2).status == Status.DONE
+
+    def test_compaction_writes_snapshot_and_truncates_journal(self, tmp_path):
+        manager = self.make_manager(tmp_path, compact_every=3)
+        for i in range(4):
+            manager.add_task(f"T{i}")
+        manager.save_to_file()
+        assert self.journal_lines() == []
+        with open(self.path) as f:
+            # En-tête de génération puis une ligne par tâche
+            assert len(f.readlines()) == 5
+        assert len(self.reload().tasks) == 4
+
+    def test_truncated_last_record_is_ignored(self, tmp_path):
+        manager = self.make_manager(tmp_path)
+        task_id = manager.add_task("T1")
+        manager.save_to_file()
+        with open(self.path + ".journal", "a") as f:
+            f.write('{"op": "delete", "id"')
+        assert [t.id for t in self.reload().tasks] == [task_id]
+
+    def test_torn_tail_then_save_then_reload(self, tmp_path):
+        manager = self.make_manager(tmp_path)
+        id1 = manager.add_task("T1")
+        manager.save_to_file()
+        with open(self.path + ".journal", "a") as f:
+            f.write('{"op": "delete", "id"')
+        manager = self.reload()
+        id2 = manager.add_task("T2")
+        manager.save_to_file()
+        assert [t.id for t in self.reload().tasks] == [id1, id2]
+        assert [r["op"] for r in self.journal_lines()] == ["add", "add"]
+
+    def test_crash_between_snapshot_and_journal_truncation(self, tmp_path):
+        manager = self.make_manager(tmp_path, compact_every=2)
+        task_id = manager.add_task("T1", priority=Priority.HIGH)
+        manager.save_to_file()
+        with open(self.path + ".journal") as f:
+            stale_journal = f.read()
+        manager.get_task(task_id).update_priority(Priority.LOW)
+        manager.save_to_file()
+        # Crash simulé : snapshot remplacé mais journal non vidé
+        with open(self.path + ".journal", "w") as f:
+            f.write(stale_journal)
+        loaded = self.reload(compact_every=2)
+        assert loaded.get_task(task_id).priority == Priority.LOW
+        assert loaded.storage.journal_records == 0
+
+    def test_save_without_load_keeps_existing_tasks(self, tmp_path):
+        manager = self.make_manager(tmp_path)
+        existing = [manager.add_task(f"T{i}") for i in range(5)]
+        manager.save_to_file()
+        manager = TaskManager(self.path, storage=JournalStorage(self.path, compact_every=2))
+        added = [manager.add_task("N1"), manager.add_task("N2")]
+        manager.save_to_file()
+        assert self.journal_lines() == []
+        assert [t.id for t in self.reload().tasks] == existing + added
+        manager.get_task(added[0]).title = "N1 modifiée"
+        manager.add_task("N3")
+        manager.save_to_file()
+        assert sorted(t.title for t in self.reload().tasks) == ["N1 modifiée", "N2", "N3", "T0", "T1", "T2", "T3", "T4"]
+
+    def test_corrupted_journal_raises_ioerror(self, tmp_path):
+        manager = self.make_manager(tmp_path)
+        manager.add_task("T1")
+        manager.save_to_file()
+        with open(self.path + ".journal", "a") as f:
+            f.write("notjson\n")
+        with pytest.raises(IOError):
+            self.reload()
+
+    def test_loads_legacy_json_array_snapshot(self, tmp_path):
+        legacy = TaskManager(str(tmp_path / "tasks.jsonl"))
+        task_id = legacy.add_task("T1")
+        legacy.save_to_file()
+        self.path = legacy.storage_file
+        assert [t.id for t in self.reload().tasks] == [task_id]
+
+    def test_save_with_filename_exports_full_json(self, tmp_path):
+        manager = self.make_manager(tmp_path)
+        manager.add_task("T1")
+        export = tmp_path / "export.json"
+        manager.save_to_file(str(export))
+        with open(export) as f:
+            assert len(json.load(f)) == 1
+
+
+class TestSQLiteStorage:
+    """Tests du backend SQLite non résident"""
+
+    def setup_method(self):
+        self.storage = SQLiteStorage(":memory:")
+        self.manager = TaskManager(storage=self.storage)
+        self.id1 = self.manager.add_task("T1", priority=Priority.LOW)
+        self.id2 = self.manager.add_task("T2", priority=Priority.HIGH)
+
+    def teardown_method(self):
+        self.storage.close()
+
+    def test_creates_indexes(self):
+        rows = self.storage.connection.execute("SELECT name FROM sqlite_master WHERE type = 'index'")
+        names = {row[0] for row in rows}
+        assert {"idx_tasks_status", "idx_tasks_priority", "idx_tasks_project_id", "idx_tasks_created_at",
+                "idx_tasks_due_date"} <= names
+
+    def test_adds_due_date_columns_to_older_databases(self, tmp_path):
+        path = str(tmp_path / "old.db")
+        connection = sqlite3.connect(path)
+        connection.execute("CREATE TABLE tasks (id TEXT PRIMARY KEY, title TEXT NOT NULL, description TEXT, "
+                           "priority TEXT NOT NULL, created_at TEXT NOT NULL, status TEXT NOT NULL, "
+                           "project_id TEXT, completed_at TEXT)")
+        connection.commit()
+        connection.close()
+        storage = SQLiteStorage(path)
+        manager = TaskManager(storage=storage)
+        task_id = manager.add_task("T", due_date=datetime(2024, 1, 2), assignee_email="a@example.com")
+        assert manager.get_task(task_id).due_date == datetime(2024, 1, 2)
+        storage.close()
+
+    def test_get_task_reads_from_database(self):
+        assert self.manager.get_task(self.id1).title == "T1"
+        assert self.manager.get_task("fakeid") is None
+
+    def test_mutations_are_written_through(self):
+        self.manager.get_task(self.id2).mark_completed()
+        done = list(self.storage.find("status", Status.DONE))
+        assert [t.id for t in done] == [self.id2]
+        assert done[0].completed_at is not None
+
+    def test_filters_and_statistics_run_in_sql(self):
+        self.manager.get_task(self.id1).assign_to_project("p1")
+        assert [t.id for t in self.manager.get_tasks_by_priority(Priority.HIGH)] == [self.id2]
+        assert [t.id for t in self.manager.get_tasks_by_project("p1")] == [self.id1]
+        assert [t.id for t in self.manager.get_tasks_by_status(Status.TODO)] == [self.id1, self.id2]
+        stats = self.manager.get_statistics()
+        assert stats["total_tasks"] == 2
+        assert stats["tasks_by_priority"]["HIGH"] == 1
+        assert stats["tasks_by_status"]["TODO"] == 2
+
+    def test_same_instance_is_returned_while_in_use(self):
+        task = self.manager.get_task(self.id1)
+        assert self.manager.get_tasks_by_priority(Priority.LOW)[0] is task
+
+    def test_delete_task(self):
+        assert self.manager.delete_task(self.id1) is True
+        assert self.manager.delete_task(self.id1) is False
+        assert self.storage.count() == 1
+
+    def test_load_discards_unsaved_changes(self):
+        self.manager.save_to_file()
+        self.manager.add_task("T3")
+        self.manager.load_from_file()
+        assert len(self.manager.tasks) == 2
+
+    def test_bulk_insert_is_atomic(self):
+        tasks = [Task("A"), Task("B")]
+        tasks[1].id = tasks[0].id
+        with pytest.raises(sqlite3.IntegrityError):
+            self.storage.insert(tasks)
+        assert self.storage.count() == 2
+
+    def test_import_json_file(self, tmp_path):
+        source = TaskManager(str(tmp_path / "tasks.json"))
+        source.add_task("Importée")
+        source.save_to_file()
+        self.manager.load_from_file(source.storage_file)
+        assert [t.title for t in self.manager.tasks] == ["Importée"]
+
+    def test_persists_between_connections(self, tmp_path):
+        path = str(tmp_path / "tasks.db")
+        storage = SQLiteStorage(path)
+        manager = TaskManager(storage=storage)
+        task_id = manager.add_task("T1")
+        manager.save_to_file()
+        storage.close()
+        reopened = SQLiteStorage(path)
+        assert TaskManager(storage=reopened).get_task(task_id).title == "T1"
+        reopened.close()
+
+
+class TestLazyFileStorage:
+    """Tests du chargement paresseux par mmap"""
+
+    def setup_method(self):
+        self.tasks = [Task("T1", priority=Priority.LOW), Task("T2 \"quoted\" {}", priority=Priority.HIGH), Task("T3")]
+        self.tasks[1].mark_completed()
+        self.tasks[2].assign_to_project("p1")
+
+    def make_manager(self, tmp_path, codec="readable"):
+        path = str(tmp_path / "tasks.json")
+        source = TaskManager(path, codec=codec)
+        source.tasks = self.tasks
+        source.save_to_file()
+        self.storage = LazyFileStorage(path)
+        manager = TaskManager(storage=self.storage)
+        manager.load_from_file()
+        return manager
+
+    def teardown_method(self):
+        if getattr(self, "storage", None) is not None:
+            self.storage.close()
+
+    @pytest.mark.parametrize("codec", ["readable", "json", "orjson"])
+    def test_get_task_materializes_only_requested_record(self, tmp_path, codec, monkeypatch):
+        if codec == "orjson":
+            pytest.importorskip("orjson")
+        manager = self.make_manager(tmp_path, codec)
+        built = []
+        original = Task.from_dict.__func__
+        monkeypatch.setattr(Task, "from_dict", classmethod(lambda cls, d: built.append(d) or original(cls, d)))
+        task = manager.get_task(self.tasks[1].id)
+        assert task.title == self.tasks[1].title
+        assert task.status == Status.DONE
+        assert len(built) == 1
+
+    def test_statistics_without_materialization(self, tmp_path, monkeypatch):
+        manager = self.make_manager(tmp_path)
+        monkeypatch.setattr(Task, "from_dict", classmethod(lambda cls, d: pytest.fail("tâche construite")))
+        stats = manager.get_statistics()
+        assert stats["total_tasks"] == 3
+        assert stats["completed_tasks"] == 1
+        assert stats["tasks_by_priority"]["MEDIUM"] == 1
+
+    def test_filters(self, tmp_path):
+        manager = self.make_manager(tmp_path)
+        assert [t.id for t in manager.get_tasks_by_status(Status.TODO)] == [self.tasks[0].id, self.tasks[2].id]
+        assert [t.id for t in manager.get_tasks_by_priority(Priority.HIGH)] == [self.tasks[1].id]
+        assert [t.id for t in manager.get_tasks_by_project("p1")] == [self.tasks[2].id]
+
+    def test_changes_are_kept_until_save(self, tmp_path):
+        manager = self.make_manager(tmp_path)
+        manager.get_task(self.tasks[0].id).mark_completed()
+        manager.delete_task(self.tasks[2].id)
+        new_id = manager.add_task("T4", priority=Priority.URGENT)
+        assert manager.get_statistics()["completed_tasks"] == 2
+        manager.save_to_file()
+        reloaded = TaskManager(storage=LazyFileStorage(self.storage.path))
+        assert [t.id for t in reloaded.tasks] == [self.tasks[0].id, self.tasks[1].id, new_id]
+        assert reloaded.get_task(self.tasks[0].id).status == Status.DONE
+        assert reloaded.get_task(self.tasks[1].id).title == self.tasks[1].title
+        reloaded.storage.close()
+
+    def test_load_discards_unsaved_changes(self, tmp_path):
+        manager = self.make_manager(tmp_path)
+        manager.add_task("T4")
+        manager.load_from_file()
+        assert manager.get_statistics()["total_tasks"] == 3
+
+    def test_other_key_order_uses_generic_index(self, tmp_path):
+        path = tmp_path / "tasks.json"
+        # "id" en tête, puis les autres champs en ordre inverse
+        records = []
+        for task in self.tasks:
+            data = task.to_dict()
+            records.append({"id": data.pop("id"), **dict(reversed(list(data.items())))})
+        path.write_text(json.dumps(records, indent=2))
+        self.storage = LazyFileStorage(str(path))
+        manager = TaskManager(storage=self.storage)
+        assert manager.get_statistics()["completed_tasks"] == 1
+        assert manager.get_task(self.tasks[2].id).project_id == "p1"
+
+    def test_missing_file_is_empty(self, tmp_path):
+        self.storage = LazyFileStorage(str(tmp_path / "absent.json"))
+        manager = TaskManager(storage=self.storage)
+        assert manager.tasks == []
+        assert manager.get_statistics()["total_tasks"] == 0
+
+class TestShardedStorage:
+    """Tests du stockage partitionné par projet"""
+
+    def make_manager(self, directory, **options):
+        return TaskManager(storage=ShardedStorage(str(directory), **options))
+
+    def populate(self, manager):
+        manager.add_project("Alpha", project_id="alpha")
+        manager.add_project("Bêta/2", project_id="beta/2")
+        ids = {}
+        for name, project in [("a1", "alpha"), ("a2", "alpha"), ("b1", "beta/2"), ("n1", None)]:
+            ids[name] = manager.add_task(name)
+            manager.get_task(ids[name]).assign_to_project(project)
+        return ids
+
+    def titles(self, tasks):
+        return sorted(task.title for task in tasks)
+
+    def test_round_trip_one_file_per_project(self, tmp_path):
+        manager = self.make_manager(tmp_path)
+        self.populate(manager)
+        manager.save_to_file()
+        assert sorted(p.name for p in tmp_path.iterdir()) == [
+            "project-alpha.json", "project-beta%2F2.json", "projects.json", "unassigned.json"]
+        loaded = self.make_manager(tmp_path)
+        loaded.load_from_file()
+        assert self.titles(loaded.get_tasks_by_project("alpha")) == ["a1", "a2"]
+        assert self.titles(loaded.get_tasks_by_project("beta/2")) == ["b1"]
+        assert loaded.get_project("beta/2").name == "Bêta/2"
+        assert loaded.get_statistics()["total_tasks"] == 4
+
+    def test_save_rewrites_only_touched_shards(self, tmp_path):
+        manager = self.make_manager(tmp_path)
+        ids = self.populate(manager)
+        manager.save_to_file()
+        (tmp_path / "project-beta%2F2.json").write_text("corrompu")
+        manager.get_task(ids["a1"]).mark_completed()
+        manager.save_to_file()
+        assert (tmp_path / "project-beta%2F2.json").read_text() == "corrompu"
+        assert '"status": "DONE"' in (tmp_path / "project-alpha.json").read_text()
+
+    def test_moved_and_deleted_tasks_leave_old_shards(self, tmp_path):
+        manager = self.make_manager(tmp_path)
+        ids = self.populate(manager)
+        manager.save_to_file()
+        manager.get_task(ids["a1"]).assign_to_project("beta/2")
+        manager.delete_task(ids["n1"])
+        manager.save_to_file()
+        assert not (tmp_path / "unassigned.json").exists()
+        loaded = self.make_manager(tmp_path)
+        loaded.load_from_file()
+        assert self.titles(loaded.get_tasks_by_project("alpha")) == ["a2"]
+        assert self.titles(loaded.get_tasks_by_project("beta/2")) == ["a1", "b1"]
+        assert loaded.get_statistics()["total_tasks"] == 3
+
+    def test_load_and_save_single_project(self, tmp_path):
+        manager = self.make_manager(tmp_path)
+        ids = self.populate(manager)
+        manager.save_to_file()
+        manager.get_task(ids["a1"]).title = "modifiée"
+        manager.get_task(ids["b1"]).title = "non sauvegardée"
+        manager.save_project("alpha")
+        manager.load_project("beta/2")
+        assert self.titles(manager.get_tasks_by_project("beta/2")) == ["b1"]
+        loaded = self.make_manager(tmp_path)
+        loaded.load_from_file()
+        assert self.titles(loaded.tasks) == ["a2", "b1", "modifiée", "n1"]
+
+    def test_save_project_removes_moved_task_from_old_shard(self, tmp_path):
+        manager = self.make_manager(tmp_path)
+        ids = self.populate(manager)
+        manager.add_project("Zêta", project_id="zeta")
+        z1 = manager.add_task("z1")
+        manager.get_task(z1).assign_to_project("zeta")
+        manager.save_to_file()
+        manager.get_task(z1).assign_to_project("alpha")
+        manager.get_task(z1).title = "z1 déplacée"
+        manager.get_task(ids["b1"]).assign_to_project("alpha")
+        manager.save_project("alpha")
+        assert not (tmp_path / "project-zeta.json").exists()
+        loaded = self.make_manager(tmp_path)
+        loaded.load_from_file()
+        assert self.titles(loaded.get_tasks_by_project("alpha")) == ["a1", "a2", "b1", "z1 déplacée"]
+        assert loaded.get_tasks_by_project("beta/2") == []
+        assert loaded.get_statistics()["total_tasks"] == 5
+
+    def test_non_string_project_id(self, tmp_path):
+        manager = self.make_manager(tmp_path)
+        ids = self.populate(manager)
+        manager.get_task(ids["a1"]).assign_to_project(42)
+        manager.save_project(42)
+        manager.save_to_file()
+        assert (tmp_path / "project-42.json").exists()
+        loaded = self.make_manager(tmp_path)
+        loaded.load_from_file()
+        assert self.titles(loaded.get_tasks_by_project(42)) == ["a1"]
+        loaded.load_project(42)
+        assert self.titles(loaded.get_tasks_by_project(42)) == ["a1"]
+        assert loaded.get_statistics()["total_tasks"] == 4
+
+    def test_mixed_project_id_types_share_a_shard(self, tmp_path):
+        manager = self.make_manager(tmp_path)
+        a = manager.get_task(manager.add_task("A"))
+        b = manager.get_task(manager.add_task("B"))
+        a.assign_to_project(42)
+        b.assign_to_project("42")
+        manager.save_to_file()
+        manager.save_project(42)
+        loaded = self.make_manager(tmp_path)
+        loaded.load_from_file()
+        assert self.titles(loaded.tasks) == ["A", "B"]
+        b.title = "B modifiée"
+        manager.save_project(42)
+        manager.load_project("42")
+        assert self.titles(manager.tasks) == ["A", "B modifiée"]
+        assert manager.get_statistics()["total_tasks"] == 2
+
+    def test_parallel_load(self, tmp_path):
+        manager = self.make_manager(tmp_path)
+        self.populate(manager)
+        manager.save_to_file()
+        loaded = self.make_manager(tmp_path, workers=2)
+        loaded.load_from_file()
+        assert self.titles(loaded.tasks) == ["a1", "a2", "b1", "n1"]
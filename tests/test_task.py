@@ -1,6 +1,9 @@
+import copy
+import pickle
 import pytest
 from datetime import datetime
-from src.task_manager.task import Task, Priority, Status
+from src.task_manager.manager import TaskManager
+from src.task_manager.task import Task, Priority, Status, format_id, id_key
 
 class TestTaskCreation:
     """Tests de création de tâches"""
@@ -62,6 +65,16 @@ class TestTaskOperations:
         self.task.assign_to_project(None)
         assert self.task.project_id is None
 
+    def test_set_due_date_and_assignee(self):
+        self.task.set_due_date(datetime(2024, 1, 2))
+        self.task.assign_to("a@example.com")
+        assert self.task.due_date == datetime(2024, 1, 2)
+        assert self.task.assignee_email == "a@example.com"
+        with pytest.raises(ValueError):
+            self.task.set_due_date("2024-01-02")
+        with pytest.raises(ValueError):
+            self.task.assign_to("invalide")
+
 class TestTaskSerialization:
     """Tests de sérialisation JSON"""
 
@@ -72,7 +85,8 @@ class TestTaskSerialization:
 
     def test_to_dict_contains_all_fields(self):
         d = self.task.to_dict()
-        assert set(d.keys()) == {"id", "title", "description", "priority", "created_at", "status", "project_id", "completed_at"}
+        assert set(d.keys()) == {"id", "title", "description", "priority", "created_at", "status", "project_id",
+                                 "completed_at", "due_date", "assignee_email"}
         assert isinstance(d["priority"], str)
         assert isinstance(d["created_at"], str)
         assert isinstance(d["status"], str)
@@ -89,6 +103,123 @@ class TestTaskSerialization:
         assert t2.project_id == self.task.project_id
         assert t2.completed_at == self.task.completed_at 
 
+    def test_due_date_and_assignee_round_trip(self):
+        task = Task("Titre", due_date=datetime(2024, 3, 1, 9, 30), assignee_email="a@example.com")
+        d = task.to_dict()
+        assert d["due_date"] == "2024-03-01T09:30:00"
+        t2 = Task.from_dict(d)
+        assert t2.due_date == datetime(2024, 3, 1, 9, 30)
+        assert t2.assignee_email == "a@example.com"
+        assert t2.snapshot().due_date == t2.due_date
+
+    def test_from_dict_without_due_date(self):
+        d = self.task.to_dict()
+        del d["due_date"], d["assignee_email"]
+        t2 = Task.from_dict(d)
+        assert t2.due_date is None
+        assert t2.assignee_email is None
+
     def test_from_dict_invalid_data(self):
         with pytest.raises(Exception):
-            Task.from_dict({"id": "x", "title": "", "priority": "BAD", "created_at": "bad", "status": "BAD"}) 
\ No newline at end of file
+            Task.from_dict({"id": "x", "title": "", "priority": "BAD", "created_at": "bad", "status": "BAD"}) 
+
+class TestTaskObservers:
+    """Tests des notifications de modification"""
+
+    def test_observer_receives_changes(self):
+        task = Task("Titre")
+        changes = []
+        task.add_observer(lambda t, field, old, new: changes.append((field, old, new)))
+        task.update_priority(Priority.URGENT)
+        task.assign_to_project("p1")
+        assert changes == [("priority", Priority.MEDIUM, Priority.URGENT), ("project_id", None, "p1")]
+
+    def test_removed_observer_is_not_called(self):
+        task = Task("Titre")
+        changes = []
+        callback = lambda *args: changes.append(args)
+        task.add_observer(callback)
+        task.remove_observer(callback)
+        task.mark_completed()
+        assert changes == []
+
+
+class TestTaskCompactRepresentation:
+    """Tests de la représentation compacte (slots, id entier)"""
+
+    def test_task_has_no_instance_dict(self):
+        task = Task("Titre")
+        assert not hasattr(task, "__dict__")
+        with pytest.raises(AttributeError):
+            task.unknown = 1
+
+    def test_uuid_id_is_stored_as_int(self):
+        task = Task("Titre")
+        assert isinstance(task._key, int)
+        assert id_key(task.id) == task._key
+        assert format_id(task._key) == task.id
+
+    def test_non_uuid_id_is_kept_as_is(self):
+        task = Task.from_dict({"id": "x", "title": "T", "priority": "LOW",
+                               "created_at": "2024-01-01T00:00:00", "status": "TODO"})
+        assert task.id == "x"
+        assert id_key("X") == "X"
+
+    def test_integer_id_is_kept_as_is(self):
+        data = {"id": 42, "title": "T", "priority": "LOW", "created_at": "2024-01-01T00:00:00", "status": "TODO"}
+        task = Task.from_dict(data)
+        assert task.id == 42 and type(task.id) is int
+        assert task.to_dict()["id"] == 42
+        assert id_key(42) == id_key(42)
+        assert id_key(42) != id_key("00000000-0000-0000-0000-00000000002a")
+        assert format_id(id_key("00000000-0000-0000-0000-00000000002a")) == "00000000-0000-0000-0000-00000000002a"
+        manager = TaskManager()
+        manager.tasks = [task]
+        assert manager.get_task(42) is task
+        assert manager.get_task("42") is None
+        assert manager.delete_task(42)
+
+    def test_uppercase_uuid_is_not_canonical(self):
+        task_id = Task("Titre").id
+        assert id_key(task_id.upper()) == task_id.upper()
+
+    def test_copy_and_pickle_round_trip(self):
+        task = Task("Titre", "Desc", Priority.HIGH, due_date=datetime(2024, 1, 2), assignee_email="a@example.com")
+        task.assign_to_project("projet")
+        task.add_observer(lambda *args: None)
+        for clone in (copy.copy(task), copy.deepcopy(task), pickle.loads(pickle.dumps(task))):
+            assert clone is not task
+            assert clone.snapshot() == task.snapshot()
+            assert clone._observers is None
+            clone.title = "Copie"
+        assert task.title == "Titre"
+
+    def test_pickle_leaves_the_manager_out(self):
+        manager = TaskManager()
+        task = manager.get_task(manager.add_task("Suivie"))
+        clone = pickle.loads(pickle.dumps(task))
+        assert clone.id == task.id and clone._observers is None
+        clone.mark_completed()
+        assert task.status == Status.TODO
+        assert manager.get_statistics()["completed_tasks"] == 0
+
+    def test_project_id_is_interned(self):
+        t1, t2 = Task("A"), Task("B")
+        t1.assign_to_project("".join(["pro", "jet"]))
+        t2.assign_to_project("".join(["pro", "jet"]))
+        assert t1.project_id is t2.project_id
+
+
+class TestTaskBulkDeserialization:
+    """Tests de la reconstruction en masse"""
+
+    def test_from_dicts_skips_invalid_rows(self):
+        good = Task("Titre", "Desc", Priority.HIGH).to_dict()
+        tasks, errors = Task.from_dicts([good, {"title": "x"}, dict(good, priority="BAD")])
+        assert [t.id for t in tasks] == [good["id"]]
+        assert [index for index, _ in errors] == [1, 2]
+
+    def test_from_dict_does_not_notify_observers(self):
+        task = Task.from_dict(Task("Titre").to_dict())
+        assert task._observers is None
+        assert task.status == Status.TODO
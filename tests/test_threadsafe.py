@@ -0,0 +1,150 @@
+import json
+import random
+import threading
+import time
+import pytest
+from src.task_manager.manager import INDEXED_FIELDS
+from src.task_manager.storage import JournalStorage, ShardedStorage
+from src.task_manager.task import Priority, Status
+from src.task_manager.threadsafe import ConcurrentTaskManager, RWLock
+
+def assert_consistent(manager):
+    """Chaque tâche est présente dans exactement un seau par index, celui de sa valeur"""
+    tasks = {task._key: task for task in manager.tasks}
+    for field in INDEXED_FIELDS:
+        seen = {}
+        for value, bucket in manager._indexes[field].items():
+            assert bucket, f"seau vide conservé pour {field}={value}"
+            for key, task in bucket.items():
+                assert key not in seen
+                seen[key] = value
+                assert getattr(task, field) == value
+        assert seen.keys() == tasks.keys()
+    stats = manager.get_statistics()
+    assert stats["total_tasks"] == len(tasks)
+    assert sum(stats["tasks_by_status"].values()) == len(tasks)
+
+class TestRWLock:
+    """Tests du verrou lecteurs/rédacteur"""
+
+    def test_readers_share_the_lock(self):
+        lock = RWLock()
+        inside = threading.Barrier(2, timeout=2)
+
+        def reader():
+            with lock.read():
+                inside.wait()
+
+        threads = [threading.Thread(target=reader) for _ in range(2)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+    def test_writer_is_reentrant(self):
+        lock = RWLock()
+        with lock.write():
+            with lock.write():
+                with lock.read():
+                    pass
+        with lock.read():
+            pass
+
+def test_rejects_non_resident_storage():
+    class Remote:
+        resident = False
+        incremental = False
+    with pytest.raises(ValueError):
+        ConcurrentTaskManager(storage=Remote())
+
+def test_save_does_not_see_partial_edits(tmp_path):
+    manager = ConcurrentTaskManager(str(tmp_path / "tasks.json"))
+    task_id = manager.add_task("T1")
+    with manager.editing(task_id) as task:
+        task.status = Status.DONE
+        saver = threading.Thread(target=manager.save_to_file)
+        saver.start()
+        saver.join(0.05)
+        assert saver.is_alive()
+        task.mark_completed()
+    saver.join()
+    with open(manager.storage_file) as f:
+        record = json.load(f)[0]
+    assert record["status"] == "DONE" and record["completed_at"] is not None
+
+def test_save_project_with_waiting_writer(tmp_path):
+    manager = ConcurrentTaskManager(storage=ShardedStorage(str(tmp_path / "shards")))
+    manager.add_project("Alpha", project_id="alpha")
+    task_id = manager.add_task("T1")
+    manager.get_task(task_id).assign_to_project("alpha")
+    lookup = manager._lookup
+    writer = threading.Thread(target=manager.add_task, args=("T2",), daemon=True)
+
+    def lookup_with_waiting_writer(field, value):
+        # Un rédacteur se met en attente entre la prise du verrou et la recherche
+        writer.start()
+        while not manager._lock._waiting_writers:
+            time.sleep(0.001)
+        return lookup(field, value)
+
+    manager._lookup = lookup_with_waiting_writer
+    saver = threading.Thread(target=manager.save_project, args=("alpha",), daemon=True)
+    saver.start()
+    saver.join(2)
+    assert not saver.is_alive()
+    writer.join(2)
+    assert not writer.is_alive()
+    assert len(manager.tasks) == 2
+    assert [task.id for task in manager.storage.load_shard("alpha")] == [task_id]
+
+@pytest.mark.parametrize("journal", [False, True])
+def test_stress_mixed_operations(tmp_path, journal):
+    path = str(tmp_path / "tasks.json")
+    manager = ConcurrentTaskManager(path, storage=JournalStorage(path, compact_every=200) if journal else None,
+                                    columnar=True, shards=8)
+    deleted = set()
+    deleted_lock = threading.Lock()
+    errors = []
+
+    def worker(seed):
+        rng = random.Random(seed)
+        own = []
+        try:
+            for _ in range(300):
+                action = rng.random()
+                if action < 0.35 or not own:
+                    own.append(manager.add_task(f"T{seed}", priority=rng.choice(list(Priority))))
+                elif action < 0.55:
+                    with manager.editing(rng.choice(own)) as task:
+                        if task is not None:
+                            task.mark_completed()
+                            task.update_priority(rng.choice(list(Priority)))
+                            task.assign_to_project(rng.choice(["a", "b", None]))
+                elif action < 0.7:
+                    task_id = own.pop(rng.randrange(len(own)))
+                    assert manager.delete_task(task_id) is True
+                    with deleted_lock:
+                        deleted.add(task_id)
+                elif action < 0.85:
+                    assert manager.get_task(rng.choice(own)) is not None
+                    manager.get_tasks_by_status(Status.DONE)
+                    manager.get_statistics()
+                else:
+                    manager.save_to_file()
+        except Exception as e:  # pragma: no cover - remonté par l'assertion finale
+            errors.append(e)
+
+    threads = [threading.Thread(target=worker, args=(seed,)) for seed in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    assert_consistent(manager)
+    assert not deleted & {task.id for task in manager.tasks}
+    manager.save_to_file()
+    reloaded = ConcurrentTaskManager(path, storage=JournalStorage(path) if journal else None)
+    reloaded.load_from_file()
+    assert sorted(t.to_dict()["id"] for t in reloaded.tasks) == sorted(t.id for t in manager.tasks)
+    assert reloaded.get_statistics() == manager.get_statistics()